@@ -326,7 +326,8 @@ def cmd_sensitivity(args, config):
     base_dir = os.path.dirname(os.path.abspath(__file__))
     output_dir = os.path.join(base_dir, "output")
     hdf5_path = _find_hdf5(config)
-    run_sensitivity(config, output_dir, hdf5_path)
+    run_sensitivity(config, output_dir, hdf5_path, use_cache=not args.no_cache,
+                    per_file=not args.combined_results)
 
 
 def cmd_convert_pickle(args, config):
@@ -377,7 +378,16 @@ def main():
     subparsers.add_parser("compare", help="Compare results across approaches")
 
     # sensitivity
-    subparsers.add_parser("sensitivity", help="Run bounds and sensitivity experiments")
+    sp_sens = subparsers.add_parser("sensitivity", help="Run bounds and sensitivity experiments")
+    sp_sens.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-run every voyage simulation instead of reusing cached results",
+    )
+    sp_sens.add_argument(
+        "--combined-results", action="store_true",
+        help="Write one results_*.json per sweep instead of a result_*.json per run "
+             "(compare only reads the per-run files)",
+    )
 
     # convert-pickle
     sp_convert = subparsers.add_parser("convert-pickle", help="Convert legacy pickle to HDF5")
@@ -3,7 +3,7 @@ Comparison framework: load result JSONs, compute cross-approach metrics,
 and orchestrate figure generation and report writing.
 """
 
-import glob
+import hashlib
 import json
 import logging
 import os
@@ -14,15 +14,34 @@ import pandas as pd
 logger = logging.getLogger(__name__)
 
 
-def load_results(output_dir):
+def _list_entries(output_dir):
+    """Return the set of file names in output_dir (empty if it does not exist).
+
+    One directory scan shared by load_results() and load_time_series()
+    instead of a glob plus one stat per approach.
+    """
+    if not os.path.isdir(output_dir):
+        return set()
+    return set(os.listdir(output_dir))
+
+
+def load_results(output_dir, entries=None):
     """Load all result_*.json files from output_dir, keyed by approach name.
 
+    Args:
+        output_dir: Directory holding result_*.json files.
+        entries: Optional set of file names already listed from output_dir.
+
     Returns:
         dict: {approach_name: result_dict}
     """
+    if entries is None:
+        entries = _list_entries(output_dir)
+
     results = {}
-    pattern = os.path.join(output_dir, "result_*.json")
-    for path in sorted(glob.glob(pattern)):
+    names = sorted(e for e in entries if e.startswith("result_") and e.endswith(".json"))
+    for name in names:
+        path = os.path.join(output_dir, name)
         try:
             with open(path) as f:
                 result = json.load(f)
@@ -34,23 +53,44 @@ def load_results(output_dir):
     return results
 
 
-def load_time_series(output_dir, approaches):
+def load_time_series(output_dir, approaches, entries=None):
     """Load timeseries CSVs for the given approaches.
 
+    Args:
+        output_dir: Directory holding timeseries_*.csv files.
+        approaches: Approach names to load.
+        entries: Optional set of file names already listed from output_dir.
+
     Returns:
-        dict: {approach_name: DataFrame}
+        dict: {approach_name: DataFrame}, each sorted by cum_distance_nm.
     """
+    if entries is None:
+        entries = _list_entries(output_dir)
+
     time_series = {}
     for approach in approaches:
-        path = os.path.join(output_dir, f"timeseries_{approach}.csv")
-        if os.path.isfile(path):
-            time_series[approach] = pd.read_csv(path)
+        name = f"timeseries_{approach}.csv"
+        path = os.path.join(output_dir, name)
+        if name in entries:
+            df = pd.read_csv(path)
+            # Sorted once here so every plot can draw the lines as-is
+            if "cum_distance_nm" in df.columns and not df["cum_distance_nm"].is_monotonic_increasing:
+                df = df.sort_values("cum_distance_nm", kind="mergesort").reset_index(drop=True)
+            time_series[approach] = df
             logger.info("Loaded time series: %s (%d rows)", approach, len(time_series[approach]))
         else:
             logger.warning("Time series not found: %s", path)
     return time_series
 
 
+# Column order of the comparison table
+_COMPARISON_COLUMNS = [
+    "approach", "planned_fuel_mt", "simulated_fuel_mt", "fuel_gap_pct",
+    "planned_time_h", "simulated_time_h", "arrival_deviation_h",
+    "speed_changes", "co2_mt", "computation_time_s", "fuel_per_nm", "avg_sog",
+]
+
+
 def build_comparison_table(results):
     """Build a DataFrame with one row per approach and key comparison columns.
 
@@ -60,29 +100,30 @@ def build_comparison_table(results):
     Returns:
         pd.DataFrame with columns for planned/simulated fuel, time, metrics, etc.
     """
-    rows = []
+    cols = {key: [] for key in _COMPARISON_COLUMNS}
     for approach in sorted(results.keys()):
         r = results[approach]
         planned = r.get("planned", {})
         simulated = r.get("simulated", {})
         metrics = r.get("metrics", {})
 
-        rows.append({
-            "approach": approach,
-            "planned_fuel_mt": planned.get("total_fuel_mt"),
-            "simulated_fuel_mt": simulated.get("total_fuel_mt"),
-            "fuel_gap_pct": metrics.get("fuel_gap_percent"),
-            "planned_time_h": planned.get("voyage_time_h"),
-            "simulated_time_h": simulated.get("voyage_time_h"),
-            "arrival_deviation_h": simulated.get("arrival_deviation_h"),
-            "speed_changes": simulated.get("speed_changes"),
-            "co2_mt": simulated.get("co2_emissions_mt"),
-            "computation_time_s": planned.get("computation_time_s"),
-            "fuel_per_nm": metrics.get("fuel_per_nm"),
-            "avg_sog": metrics.get("avg_sog_knots"),
-        })
-
-    return pd.DataFrame(rows)
+        cols["approach"].append(approach)
+        cols["planned_fuel_mt"].append(planned.get("total_fuel_mt"))
+        cols["simulated_fuel_mt"].append(simulated.get("total_fuel_mt"))
+        cols["fuel_gap_pct"].append(metrics.get("fuel_gap_percent"))
+        cols["planned_time_h"].append(planned.get("voyage_time_h"))
+        cols["simulated_time_h"].append(simulated.get("voyage_time_h"))
+        cols["arrival_deviation_h"].append(simulated.get("arrival_deviation_h"))
+        cols["speed_changes"].append(simulated.get("speed_changes"))
+        cols["co2_mt"].append(simulated.get("co2_emissions_mt"))
+        cols["computation_time_s"].append(planned.get("computation_time_s"))
+        cols["fuel_per_nm"].append(metrics.get("fuel_per_nm"))
+        cols["avg_sog"].append(metrics.get("avg_sog_knots"))
+
+    dtypes = {key: "float64" for key in _COMPARISON_COLUMNS
+              if key not in ("approach", "speed_changes")}
+    dtypes["approach"] = "category"
+    return pd.DataFrame(cols).astype(dtypes)
 
 
 def compute_forecast_error(hdf5_path):
@@ -101,13 +142,13 @@ def compute_forecast_error(hdf5_path):
         return None
 
     try:
-        from shared.hdf5_io import read_actual, read_predicted
+        from compare.weather_cache import read_actual_cached, read_predicted_cached
     except ImportError:
         logger.warning("Cannot import hdf5_io, skipping forecast error")
         return None
 
-    actual = read_actual(hdf5_path)
-    predicted = read_predicted(hdf5_path)
+    actual = read_actual_cached(hdf5_path)
+    predicted = read_predicted_cached(hdf5_path)
 
     if actual.empty or predicted.empty:
         logger.warning("No actual/predicted data in HDF5, skipping forecast error")
@@ -151,15 +192,24 @@ def compute_forecast_error(hdf5_path):
         if merged.empty:
             continue
 
-        # Group by lead_time_h
-        for lead_time, group in merged.groupby("lead_time_h"):
-            errors = group[pred_col] - group[actual_col]
+        # Per-lead-time RMSE/MAE in one grouped reduction: integer codes for
+        # lead_time_h, then bincount-weighted sums of err^2 and |err|
+        codes, lead_times = pd.factorize(merged["lead_time_h"], sort=True)
+        errors = (merged[pred_col].to_numpy(dtype=np.float64)
+                  - merged[actual_col].to_numpy(dtype=np.float64))
+        counts = np.bincount(codes)
+        sum_sq = np.bincount(codes, weights=errors * errors)
+        sum_abs = np.bincount(codes, weights=np.abs(errors))
+        rmse = np.sqrt(sum_sq / counts)
+        mae = sum_abs / counts
+
+        for lead_time, r, m, n in zip(lead_times, rmse, mae, counts):
             rows.append({
                 "lead_time_h": int(lead_time),
                 "field": field,
-                "rmse": float(np.sqrt((errors ** 2).mean())),
-                "mae": float(errors.abs().mean()),
-                "n_points": len(group),
+                "rmse": float(r),
+                "mae": float(m),
+                "n_points": int(n),
             })
 
     if not rows:
@@ -168,6 +218,50 @@ def compute_forecast_error(hdf5_path):
     return pd.DataFrame(rows)
 
 
+class _FigureCache:
+    """Manifest of rendered figures keyed by a fingerprint of their inputs.
+
+    Stored as ``.figure_cache.json`` in the comparison directory, mapping
+    figure name -> {"inputs": fingerprint, "path": png_path}. A figure is
+    re-rendered only if its inputs changed or the PNG is missing.
+    """
+
+    FILENAME = ".figure_cache.json"
+
+    def __init__(self, comp_dir):
+        self.path = os.path.join(comp_dir, self.FILENAME)
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    @staticmethod
+    def fingerprint(input_paths):
+        """Hash of (path, mtime, size) for each input file."""
+        h = hashlib.sha1()
+        for p in sorted(input_paths):
+            st = os.stat(p)
+            h.update(f"{p}|{st.st_mtime_ns}|{st.st_size}\n".encode())
+        return h.hexdigest()
+
+    def figure(self, name, input_paths, plot_fn, *args):
+        """Return the cached PNG path for name, or call plot_fn(*args)."""
+        key = self.fingerprint(input_paths)
+        entry = self.entries.get(name)
+        if (entry and entry["inputs"] == key and entry["path"]
+                and os.path.isfile(entry["path"])):
+            logger.info("Figure up to date, skipping: %s", entry["path"])
+            return entry["path"]
+        path = plot_fn(*args)
+        self.entries[name] = {"inputs": key, "path": path}
+        return path
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump(self.entries, f, indent=2)
+
+
 def run_comparison(config, output_dir, hdf5_path):
     """Top-level orchestrator for comparison framework.
 
@@ -193,7 +287,8 @@ def run_comparison(config, output_dir, hdf5_path):
     from compare.report import generate_report
 
     # 1. Load results
-    results = load_results(output_dir)
+    entries = _list_entries(output_dir)
+    results = load_results(output_dir, entries)
     if not results:
         logger.error("No result files found in %s", output_dir)
         print("Error: no result_*.json files found in output/")
@@ -203,7 +298,7 @@ def run_comparison(config, output_dir, hdf5_path):
     if len(approaches) == 1:
         logger.warning("Only one approach found (%s), comparison will be limited", approaches[0])
 
-    time_series = load_time_series(output_dir, approaches)
+    time_series = load_time_series(output_dir, approaches, entries)
 
     # 2. Build comparison table
     comparison_df = build_comparison_table(results)
@@ -220,35 +315,58 @@ def run_comparison(config, output_dir, hdf5_path):
     fig_dir = os.path.join(comp_dir, "figures")
     os.makedirs(fig_dir, exist_ok=True)
 
+    # Figures are skipped when their input files are unchanged since the
+    # last run (see _FigureCache); plots.py itself counts as an input.
+    cache = _FigureCache(comp_dir)
+    plots_src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plots.py")
+    result_inputs = [plots_src] + [
+        os.path.join(output_dir, e) for e in entries
+        if e.startswith("result_") and e.endswith(".json")
+    ]
+    ts_inputs = [plots_src] + [
+        os.path.join(output_dir, f"timeseries_{a}.csv") for a in time_series
+    ]
+
     figure_paths = {}
 
     if time_series:
-        figure_paths["speed_profiles"] = plot_speed_profiles(time_series, fig_dir)
-        figure_paths["fuel_curves"] = plot_fuel_curves(time_series, fig_dir)
+        figure_paths["speed_profiles"] = cache.figure(
+            "speed_profiles", ts_inputs, plot_speed_profiles, time_series, fig_dir)
+        figure_paths["fuel_curves"] = cache.figure(
+            "fuel_curves", ts_inputs, plot_fuel_curves, time_series, fig_dir)
 
     if results:
-        figure_paths["fuel_comparison"] = plot_fuel_comparison(results, fig_dir)
+        figure_paths["fuel_comparison"] = cache.figure(
+            "fuel_comparison", result_inputs, plot_fuel_comparison, results, fig_dir)
 
     if forecast_errors is not None:
-        figure_paths["forecast_error"] = plot_forecast_error(forecast_errors, fig_dir)
+        figure_paths["forecast_error"] = cache.figure(
+            "forecast_error", [plots_src, hdf5_path], plot_forecast_error,
+            forecast_errors, fig_dir)
 
     # Decision points from RH result
     decision_points = None
     if "dynamic_rh" in results:
         decision_points = results["dynamic_rh"].get("decision_points")
     if decision_points:
-        figure_paths["replan_evolution"] = plot_replan_evolution(decision_points, fig_dir)
+        figure_paths["replan_evolution"] = cache.figure(
+            "replan_evolution", result_inputs, plot_replan_evolution,
+            decision_points, fig_dir)
 
     # Replan sensitivity plot (if sweep results exist)
     has_sweep = any(a.startswith("dynamic_rh_replan_") for a in results)
     if has_sweep:
-        figure_paths["replan_sensitivity"] = plot_replan_sensitivity(results, fig_dir)
+        figure_paths["replan_sensitivity"] = cache.figure(
+            "replan_sensitivity", result_inputs, plot_replan_sensitivity, results, fig_dir)
 
     # Horizon sensitivity plot (if horizon sweep results exist)
     has_horizon = any(a.startswith("dynamic_det_horizon_") or a.startswith("dynamic_rh_horizon_")
                       for a in results)
     if has_horizon:
-        figure_paths["horizon_sensitivity"] = plot_horizon_sensitivity(results, fig_dir)
+        figure_paths["horizon_sensitivity"] = cache.figure(
+            "horizon_sensitivity", result_inputs, plot_horizon_sensitivity, results, fig_dir)
+
+    cache.save()
 
     # 5. Generate report
     report_path = generate_report(
@@ -282,27 +400,25 @@ def _print_table(df):
             headers.append(label)
             col_keys.append(key)
 
-    # Compute column widths
-    widths = [len(h) for h in headers]
-    str_rows = []
-    for _, row in df.iterrows():
-        str_row = []
-        for i, key in enumerate(col_keys):
-            val = row[key]
-            if isinstance(val, float):
-                s = f"{val:.4f}"
-            elif val is None:
-                s = "N/A"
-            else:
-                s = str(val)
-            widths[i] = max(widths[i], len(s))
-            str_row.append(s)
-        str_rows.append(str_row)
+    # Format column-at-a-time: each column has a single dtype, so floats go
+    # through one C-level "%.4f" pass and missing values are masked after
+    str_cols = []
+    for key in col_keys:
+        arr = df[key].to_numpy()
+        if pd.api.types.is_float_dtype(df[key]):
+            formatted = np.char.mod("%.4f", arr.astype(np.float64))
+        else:
+            formatted = arr.astype(str)
+        str_cols.append(np.where(pd.isna(arr), "N/A", formatted))
+
+    widths = [max(len(h), int(np.char.str_len(col).max(initial=0)))
+              for h, col in zip(headers, str_cols)]
 
     # Print
-    header_line = "  ".join(h.rjust(w) for h, w in zip(headers, widths))
-    print(header_line)
-    print("  ".join("-" * w for w in widths))
-    for str_row in str_rows:
-        print("  ".join(s.rjust(w) for s, w in zip(str_row, widths)))
+    lines = ["  ".join(h.rjust(w) for h, w in zip(headers, widths)),
+             "  ".join("-" * w for w in widths)]
+    if len(df):
+        padded = [np.char.rjust(col, w) for col, w in zip(str_cols, widths)]
+        lines.extend("  ".join(row) for row in zip(*padded))
+    print("\n".join(lines))
     print()
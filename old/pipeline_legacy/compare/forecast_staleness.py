@@ -20,10 +20,8 @@ import logging
 import math
 import os
 import sys
+from functools import cache
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
@@ -48,6 +46,9 @@ FIELD_LABELS = {
     "ocean_current_direction_deg": ("Current Direction",   "deg",   "#8BC34A"),
 }
 
+# field -> display name, for mapping whole columns at once
+_LABEL0 = {k: v[0] for k, v in FIELD_LABELS.items()}
+
 # Model update cycles (hours) — verified from Open-Meteo API documentation:
 #   Wind:     GFS/ECMWF IFS/ICON Global all run 4x/day at 00/06/12/18z → 6h
 #   Waves:    ECMWF WAM runs 4x/day (6h), but MFWAM only 2x/day (12h).
@@ -63,99 +64,225 @@ MODEL_CYCLES = {
 }
 
 
+# Gap sizes used to size the SOG perturbations in compute_sog_sensitivity
+SOG_GAPS = [1, 3, 6, 12, 24]
+
+
 # =====================================================================
-# 1. Update Intervals (run-length analysis)
+# Shared traversal
 # =====================================================================
 
-def compute_update_intervals(hdf5_path):
-    """For each weather field, measure consecutive sample hours where the
-    predicted value for a fixed (node, forecast_hour) doesn't change.
+def _read_predicted(hdf5_path, predicted=None):
+    """Predicted weather from hdf5_path, unless an already-read frame is given."""
+    if predicted is not None:
+        return predicted
+    sys.path.insert(0, BASE_DIR)
+    from compare.weather_cache import read_predicted_cached
+    return read_predicted_cached(hdf5_path)
 
-    Reports mean/median/mode update interval per field.
+
+def _print_data_shape(predicted):
+    print(f"  Data: {predicted['node_id'].nunique()} nodes, "
+          f"{predicted['sample_hour'].nunique()} sample hours, "
+          f"{predicted['forecast_hour'].nunique()} forecast hours")
+
+
+def _sort_by_group(predicted):
+    """Sort predicted weather into contiguous (node_id, forecast_hour) groups.
 
     Returns:
-        DataFrame with columns: field, mean_interval, median_interval,
-        mode_interval, total_runs, pct_unchanged_hourly.
+        (sorted DataFrame, key_change) where key_change is a bool array
+        marking the first row of each group.
     """
-    sys.path.insert(0, BASE_DIR)
-    from shared.hdf5_io import read_predicted
+    predicted = predicted.sort_values(["node_id", "forecast_hour", "sample_hour"]).reset_index(drop=True)
 
-    predicted = read_predicted(hdf5_path)
-    if predicted.empty:
-        print("  No predicted weather data found.")
-        return pd.DataFrame()
+    # Group starts (new node_id + forecast_hour): after the sort, rows of a
+    # group are contiguous, so a key change vs the previous row marks a start
+    node_ids_arr = predicted["node_id"].to_numpy()
+    fh_arr = predicted["forecast_hour"].to_numpy()
+    key_change = np.empty(len(predicted), dtype=bool)
+    key_change[:1] = True
+    key_change[1:] = (node_ids_arr[1:] != node_ids_arr[:-1]) | (fh_arr[1:] != fh_arr[:-1])
+    return predicted, key_change
 
-    sample_hours = sorted(predicted["sample_hour"].unique())
-    forecast_hours = sorted(predicted["forecast_hour"].unique())
-    node_ids = sorted(predicted["node_id"].unique())
 
-    print(f"  Data: {len(node_ids)} nodes, {len(sample_hours)} sample hours, "
-          f"{len(forecast_hours)} forecast hours")
+def _interval_row(field, values, key_change):
+    """Run-length statistics of unchanged predictions for one field.
 
-    # Vectorized approach: sort, diff, then run-length encode using cumsum trick
-    predicted = predicted.sort_values(["node_id", "forecast_hour", "sample_hour"]).reset_index(drop=True)
+    Args:
+        values: Field column of the group-sorted frame (Series).
+        key_change: Group-start mask as a bool Series.
 
-    # Pre-compute group ID for each row (unique per node_id + forecast_hour)
-    group_id = predicted.groupby(["node_id", "forecast_hour"]).ngroup()
+    Returns:
+        dict, or None if the field has no within-group pairs.
+    """
+    # Diff within each group: plain diff, blanked at group starts
+    diffs = values.diff()
+    diffs[key_change] = np.nan
+
+    # Identify group starts (where diff is NaN due to being first in group)
+    is_group_start = diffs.isna() & values.notna() | key_change
+
+    # Non-start pairs
+    pair_mask = ~is_group_start
+    pair_diffs = diffs[pair_mask]
+    total_pairs = len(pair_diffs)
+    if total_pairs == 0:
+        return None
+
+    # Unchanged: diff==0 (within tolerance) or both NaN
+    unchanged_mask = pair_diffs.abs() < 1e-6
+    both_nan_mask = pair_diffs.isna()
+    unchanged_pairs = int((unchanged_mask | both_nan_mask).sum())
+
+    # Run-length encoding via cumsum:
+    # A new run starts at: group boundaries OR value changes
+    is_change = (~unchanged_mask & ~both_nan_mask)
+    # Also mark group starts as new runs
+    new_run = is_group_start.copy()
+    new_run.loc[is_change[is_change].index] = True
+    run_id = new_run.cumsum()
+
+    # Count elements per run
+    arr = run_id.value_counts().values
+    vals_unique, counts = np.unique(arr, return_counts=True)
+    mode_val = int(vals_unique[np.argmax(counts)])
+
+    return {
+        "field": field,
+        "mean_interval": round(float(arr.mean()), 2),
+        "median_interval": round(float(np.median(arr)), 2),
+        "mode_interval": mode_val,
+        "max_interval": int(arr.max()),
+        "total_runs": len(arr),
+        "pct_unchanged_hourly": round(unchanged_pairs / total_pairs * 100, 1),
+        "expected_cycle_h": MODEL_CYCLES[field],
+    }
 
+
+def _gap_delta_rows(field, grid, gaps):
+    """|forecast(t+gap) - forecast(t)| statistics for one field.
+
+    Args:
+        grid: (group x sample_hour) array of the field, NaN where no row
+            exists. A shifted difference then pairs exactly the rows a
+            self-join on sample_hour + gap would, and NaN drops the rest.
+        gaps: Gap sizes in hours.
+
+    Returns:
+        List of dicts, one per gap with at least one pair.
+    """
     rows = []
-    for field in FIELDS:
-        # Diff within each group
-        vals = predicted[field].values
-        diffs = pd.Series(vals).groupby(group_id).diff()
-
-        # Identify group starts (where diff is NaN due to being first in group)
-        is_group_start = diffs.isna() & predicted[field].notna() | (group_id != group_id.shift(1))
-
-        # Non-start pairs
-        pair_mask = ~is_group_start
-        pair_diffs = diffs[pair_mask]
-        total_pairs = len(pair_diffs)
-        if total_pairs == 0:
+    for gap in gaps:
+        if gap >= grid.shape[1]:
+            continue
+        deltas = np.abs(grid[:, gap:] - grid[:, :-gap]).ravel()
+        deltas = pd.Series(deltas[~np.isnan(deltas)])
+        if deltas.empty:
             continue
 
-        # Unchanged: diff==0 (within tolerance) or both NaN
-        unchanged_mask = pair_diffs.abs() < 1e-6
-        both_nan_mask = pair_diffs.isna()
-        unchanged_pairs = int((unchanged_mask | both_nan_mask).sum())
+        nonzero = (deltas > 1e-6).sum()
+        rows.append({
+            "field": field,
+            "gap_hours": gap,
+            "mean_abs_delta": round(float(deltas.mean()), 6),
+            "median_abs_delta": round(float(deltas.median()), 6),
+            "std_abs_delta": round(float(deltas.std()), 6),
+            "pct_nonzero": round(float(nonzero / len(deltas) * 100), 1),
+            "n_pairs": len(deltas),
+        })
+    return rows
 
-        # Run-length encoding via cumsum:
-        # A new run starts at: group boundaries OR value changes
-        is_change = (~unchanged_mask & ~both_nan_mask)
-        # Also mark group starts as new runs
-        new_run = is_group_start.copy()
-        new_run.loc[is_change[is_change].index] = True
-        run_id = new_run.cumsum()
 
-        # Count elements per run
-        run_counts = run_id.value_counts().values
+def _staleness_rows(predicted, key_change, gaps, intervals=True):
+    """Update-interval and gap-delta statistics from one pass over the groups.
 
-        if len(run_counts) > 0:
-            arr = run_counts
-            vals_unique, counts = np.unique(arr, return_counts=True)
-            mode_val = int(vals_unique[np.argmax(counts)])
+    Each field column of the group-sorted frame is visited once: the
+    run-length statistics come from its row-to-row diff and every gap
+    delta from a (group x sample_hour) grid scattered from the same column.
 
-            pct_unchanged = unchanged_pairs / total_pairs * 100 if total_pairs > 0 else 0
+    Args:
+        predicted, key_change: Output of _sort_by_group().
+        gaps: Gap sizes (hours) for the delta statistics; empty to skip.
+        intervals: Whether to compute the update-interval statistics.
 
-            rows.append({
-                "field": field,
-                "mean_interval": round(float(arr.mean()), 2),
-                "median_interval": round(float(np.median(arr)), 2),
-                "mode_interval": mode_val,
-                "max_interval": int(arr.max()),
-                "total_runs": len(run_counts),
-                "pct_unchanged_hourly": round(pct_unchanged, 1),
-                "expected_cycle_h": MODEL_CYCLES[field],
-            })
+    Returns:
+        (interval_rows, delta_rows) lists of dicts.
+    """
+    key_change_s = pd.Series(key_change)
 
-    return pd.DataFrame(rows)
+    # Grid coordinates: one row per group, one column per sample hour
+    group_id = np.cumsum(key_change) - 1
+    slot = predicted["sample_hour"].to_numpy()
+    slot = slot - slot.min()
+    grid_shape = (int(group_id[-1]) + 1, int(slot.max()) + 1)
+
+    interval_rows = []
+    delta_rows = []
+    for field in FIELDS:
+        if intervals:
+            row = _interval_row(field, predicted[field], key_change_s)
+            if row is not None:
+                interval_rows.append(row)
+
+        if gaps:
+            vals = predicted[field].to_numpy()
+            grid = np.full(grid_shape, np.nan, dtype=np.result_type(vals.dtype, np.float32))
+            grid[group_id, slot] = vals
+            delta_rows.extend(_gap_delta_rows(field, grid, gaps))
+
+    return interval_rows, delta_rows
+
+
+def compute_staleness_stats(hdf5_path, gaps=None, predicted=None):
+    """Update intervals and gap deltas from a single read and sort.
+
+    Equivalent to calling compute_update_intervals() and
+    compute_gap_deltas(), but traverses the predicted weather only once.
+
+    Args:
+        predicted: Predicted weather already read from hdf5_path, to reuse
+            instead of reading it again. Default: read here.
+
+    Returns:
+        (intervals_df, deltas_df)
+    """
+    if gaps is None:
+        gaps = [1, 2, 3, 6, 12, 24]
+
+    predicted = _read_predicted(hdf5_path, predicted)
+    if predicted.empty:
+        print("  No predicted weather data found.")
+        return pd.DataFrame(), pd.DataFrame()
+
+    _print_data_shape(predicted)
+    interval_rows, delta_rows = _staleness_rows(*_sort_by_group(predicted), gaps)
+    return pd.DataFrame(interval_rows), pd.DataFrame(delta_rows)
+
+
+# =====================================================================
+# 1. Update Intervals (run-length analysis)
+# =====================================================================
+
+def compute_update_intervals(hdf5_path, predicted=None):
+    """For each weather field, measure consecutive sample hours where the
+    predicted value for a fixed (node, forecast_hour) doesn't change.
+
+    Reports mean/median/mode update interval per field.
+
+    Returns:
+        DataFrame with columns: field, mean_interval, median_interval,
+        mode_interval, total_runs, pct_unchanged_hourly.
+    """
+    intervals_df, _ = compute_staleness_stats(hdf5_path, gaps=[], predicted=predicted)
+    return intervals_df
 
 
 # =====================================================================
 # 2. Gap Deltas
 # =====================================================================
 
-def compute_gap_deltas(hdf5_path, gaps=None):
+def compute_gap_deltas(hdf5_path, gaps=None, predicted=None):
     """For each field and gap size, compute |forecast(t+gap) - forecast(t)|
     for the same (node, forecast_hour).
 
@@ -164,6 +291,7 @@ def compute_gap_deltas(hdf5_path, gaps=None):
 
     Args:
         gaps: List of gap sizes in hours. Default: [1, 2, 3, 6, 12, 24].
+        predicted: Predicted weather already read from hdf5_path.
 
     Returns:
         DataFrame with columns: field, gap_hours, mean_abs_delta,
@@ -172,54 +300,20 @@ def compute_gap_deltas(hdf5_path, gaps=None):
     if gaps is None:
         gaps = [1, 2, 3, 6, 12, 24]
 
-    sys.path.insert(0, BASE_DIR)
-    from shared.hdf5_io import read_predicted
-
-    predicted = read_predicted(hdf5_path)
+    predicted = _read_predicted(hdf5_path, predicted)
     if predicted.empty:
         print("  No predicted weather data found.")
         return pd.DataFrame()
 
-    rows = []
-    for field in FIELDS:
-        for gap in gaps:
-            # Self-join: match rows with same (node_id, forecast_hour) but sample_hour differs by gap
-            left = predicted[["node_id", "forecast_hour", "sample_hour", field]].copy()
-            right = left.copy()
-            right["sample_hour"] = right["sample_hour"] - gap
-            right = right.rename(columns={field: f"{field}_future"})
-
-            merged = left.merge(
-                right,
-                on=["node_id", "forecast_hour", "sample_hour"],
-                how="inner",
-            )
-            merged = merged.dropna(subset=[field, f"{field}_future"])
-
-            if merged.empty:
-                continue
-
-            deltas = (merged[f"{field}_future"] - merged[field]).abs()
-            nonzero = (deltas > 1e-6).sum()
-
-            rows.append({
-                "field": field,
-                "gap_hours": gap,
-                "mean_abs_delta": round(float(deltas.mean()), 6),
-                "median_abs_delta": round(float(deltas.median()), 6),
-                "std_abs_delta": round(float(deltas.std()), 6),
-                "pct_nonzero": round(float(nonzero / len(deltas) * 100), 1),
-                "n_pairs": len(deltas),
-            })
-
-    return pd.DataFrame(rows)
+    _, delta_rows = _staleness_rows(*_sort_by_group(predicted), gaps, intervals=False)
+    return pd.DataFrame(delta_rows)
 
 
 # =====================================================================
 # 3. SOG Sensitivity
 # =====================================================================
 
-def compute_sog_sensitivity(hdf5_path, config):
+def compute_sog_sensitivity(hdf5_path, config, gap_deltas=None, predicted=None):
     """Translate forecast deltas into SOG impact.
 
     For a representative set of (node, forecast_hour) pairs, perturb
@@ -228,16 +322,18 @@ def compute_sog_sensitivity(hdf5_path, config):
 
     Args:
         config: Experiment config dict (for ship parameters).
+        gap_deltas: compute_gap_deltas() output covering SOG_GAPS, to reuse
+            instead of recomputing. Default: computed here.
+        predicted: Predicted weather already read from hdf5_path.
 
     Returns:
         DataFrame with columns: field, gap_hours, mean_sog_delta_knots,
         max_sog_delta_knots.
     """
     sys.path.insert(0, BASE_DIR)
-    from shared.hdf5_io import read_predicted
     from shared.physics import calculate_speed_over_ground, load_ship_parameters
 
-    predicted = read_predicted(hdf5_path)
+    predicted = _read_predicted(hdf5_path, predicted)
     if predicted.empty:
         print("  No predicted weather data found.")
         return pd.DataFrame()
@@ -245,31 +341,41 @@ def compute_sog_sensitivity(hdf5_path, config):
     ship_params = load_ship_parameters(config)
 
     # Use baseline weather from sample_hour=0 for a representative subset of nodes
-    baseline = predicted[predicted["sample_hour"] == 0].copy()
+    baseline = predicted[predicted["sample_hour"] == 0]
     # Sample up to 200 rows for speed
     if len(baseline) > 200:
         baseline = baseline.sample(200, random_state=42)
 
-    def _sog_from_row(row):
-        """Compute SOG from a predicted weather row."""
-        wind_dir_rad = math.radians(row.get("wind_direction_10m_deg", 0.0))
-        beaufort = int(row.get("beaufort_number", 3))
-        wave_height = row.get("wave_height_m", 1.0)
-        current_knots = row.get("ocean_current_velocity_kmh", 0.0) / 1.852
-        current_dir_rad = math.radians(row.get("ocean_current_direction_deg", 0.0))
+    # Pull the numeric columns out once; rows are then plain float arrays
+    # instead of one pandas Series per (field, gap, row).
+    sog_cols = ["wind_speed_10m_kmh", "wind_direction_10m_deg", "wave_height_m",
+                "ocean_current_velocity_kmh", "ocean_current_direction_deg",
+                "beaufort_number"]
+    col_idx = {c: i for i, c in enumerate(sog_cols)}
+    base = baseline[sog_cols].to_numpy(dtype=np.float64)
+
+    def _sog_from_row(wind_speed, wind_dir_deg, wave_height, current_kmh,
+                      current_dir_deg, beaufort):
+        """Compute SOG from one row of ``sog_cols`` values."""
         return calculate_speed_over_ground(
             ship_speed=12.0,  # mid-range SWS
-            ocean_current=current_knots,
-            current_direction=current_dir_rad,
+            ocean_current=current_kmh / 1.852,
+            current_direction=math.radians(current_dir_deg),
             ship_heading=0.0,
-            wind_direction=wind_dir_rad,
-            beaufort_scale=beaufort,
+            wind_direction=math.radians(wind_dir_deg),
+            beaufort_scale=int(beaufort),
             wave_height=wave_height,
             ship_parameters=ship_params,
         )
 
-    # First compute gap_deltas to get typical perturbation sizes
-    gap_deltas = compute_gap_deltas(hdf5_path, gaps=[1, 3, 6, 12, 24])
+    # Baseline SOG does not depend on the perturbation — compute it once
+    base_sog = np.array([_sog_from_row(*wx) for wx in base])
+
+    # Typical perturbation sizes from the gap deltas
+    if gap_deltas is None:
+        gap_deltas = compute_gap_deltas(hdf5_path, gaps=SOG_GAPS, predicted=predicted)
+    else:
+        gap_deltas = gap_deltas[gap_deltas["gap_hours"].isin(SOG_GAPS)]
 
     perturb_fields = {
         "wind_speed_10m_kmh": "wind_speed_10m_kmh",
@@ -283,27 +389,21 @@ def compute_sog_sensitivity(hdf5_path, config):
         if field_deltas.empty:
             continue
 
-        for _, delta_row in field_deltas.iterrows():
-            gap = delta_row["gap_hours"]
-            perturbation = delta_row["mean_abs_delta"]
-
-            sog_changes = []
-            for _, wx_row in baseline.iterrows():
-                base_sog = _sog_from_row(wx_row)
-
-                # Perturb the field
-                perturbed = wx_row.copy()
-                perturbed[field] = wx_row[field] + perturbation
-                # Recalculate beaufort if wind speed changed
-                if field == "wind_speed_10m_kmh":
-                    from shared.beaufort import wind_speed_to_beaufort
-                    perturbed["beaufort_number"] = wind_speed_to_beaufort(
-                        perturbed["wind_speed_10m_kmh"]
-                    )
-                perturbed_sog = _sog_from_row(perturbed)
-                sog_changes.append(abs(perturbed_sog - base_sog))
-
-            arr = np.array(sog_changes)
+        j = col_idx[field]
+        for gap, perturbation in zip(field_deltas["gap_hours"].to_numpy(),
+                                     field_deltas["mean_abs_delta"].to_numpy()):
+            # Perturb the field
+            perturbed = base.copy()
+            perturbed[:, j] += perturbation
+            # Recalculate beaufort if wind speed changed
+            if field == "wind_speed_10m_kmh":
+                from shared.beaufort import wind_speed_to_beaufort
+                perturbed[:, col_idx["beaufort_number"]] = [
+                    wind_speed_to_beaufort(ws) for ws in perturbed[:, j]
+                ]
+            perturbed_sog = np.array([_sog_from_row(*wx) for wx in perturbed])
+
+            arr = np.abs(perturbed_sog - base_sog)
             rows.append({
                 "field": field,
                 "gap_hours": int(gap),
@@ -320,6 +420,19 @@ def compute_sog_sensitivity(hdf5_path, config):
 # Figure generation
 # =====================================================================
 
+@cache
+def _pyplot():
+    """Import pyplot on the Agg backend, on first use only.
+
+    Kept out of the module imports so callers that only need the compute_*
+    functions do not pay for loading matplotlib.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
 def generate_figures(intervals_df, deltas_df, sog_df, output_suffix=""):
     """Generate a 2-panel thesis figure.
 
@@ -329,6 +442,7 @@ def generate_figures(intervals_df, deltas_df, sog_df, output_suffix=""):
     Returns:
         Path to saved figure.
     """
+    plt = _pyplot()
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5.5))
 
     # ── Panel 1: Update intervals ────────────────────────────────────
@@ -434,80 +548,135 @@ def generate_figures(intervals_df, deltas_df, sog_df, output_suffix=""):
 # Print summaries
 # =====================================================================
 
+def _table_lines(columns, indent, sep):
+    """Render fixed-width table rows column-at-a-time.
+
+    Each column is formatted in one np.char pass and padded with
+    rjust/ljust, instead of running a format spec per cell.
+
+    Args:
+        columns: List of (values, printf_fmt, width, suffix); a negative
+            width left-justifies. Widths are minimums, as in format specs.
+        indent: Prefix of every line.
+        sep: Separator between cells.
+
+    Returns:
+        List of row strings.
+    """
+    cells = []
+    for values, fmt, width, suffix in columns:
+        col = np.char.mod(fmt, np.asarray(values))
+        col = np.char.ljust(col, -width) if width < 0 else np.char.rjust(col, width)
+        cells.append(np.char.add(col, suffix) if suffix else col)
+    return [indent + sep.join(row) for row in zip(*cells)]
+
+
 def print_summary(intervals_df, deltas_df, sog_df):
     """Print thesis-ready summary tables to stdout."""
+    # Collected and written in one go rather than one print() per line
+    buf = []
+    w = buf.append
 
-    print("\n" + "=" * 70)
-    print("FORECAST STALENESS ANALYSIS")
-    print("=" * 70)
+    w("\n" + "=" * 70)
+    w("FORECAST STALENESS ANALYSIS")
+    w("=" * 70)
 
     # 1. Update intervals
-    print("\n--- 1. Update Intervals (run-length of unchanged predictions) ---\n")
+    w("\n--- 1. Update Intervals (run-length of unchanged predictions) ---\n")
     if not intervals_df.empty:
-        print(f"  {'Field':<30} {'Median':>7} {'Mean':>7} {'Mode':>6} "
-              f"{'Max':>5} {'%Unchanged':>11} {'NWP Cycle':>10}")
-        print("  " + "-" * 78)
-        for _, row in intervals_df.iterrows():
-            label = FIELD_LABELS[row["field"]][0]
-            print(f"  {label:<30} {row['median_interval']:>7.1f} {row['mean_interval']:>7.1f} "
-                  f"{row['mode_interval']:>6d} {row['max_interval']:>5d} "
-                  f"{row['pct_unchanged_hourly']:>10.1f}% {row['expected_cycle_h']:>9d}h")
+        w(f"  {'Field':<30} {'Median':>7} {'Mean':>7} {'Mode':>6} "
+          f"{'Max':>5} {'%Unchanged':>11} {'NWP Cycle':>10}")
+        w("  " + "-" * 78)
+        labels = intervals_df["field"].map(_LABEL0)
+        buf.extend(_table_lines([
+            (labels, "%s", -30, ""),
+            (intervals_df["median_interval"], "%.1f", 7, ""),
+            (intervals_df["mean_interval"], "%.1f", 7, ""),
+            (intervals_df["mode_interval"], "%d", 6, ""),
+            (intervals_df["max_interval"], "%d", 5, ""),
+            (intervals_df["pct_unchanged_hourly"], "%.1f", 10, "%"),
+            (intervals_df["expected_cycle_h"], "%d", 9, "h"),
+        ], indent="  ", sep=" "))
     else:
-        print("  No data.")
+        w("  No data.")
 
     # 2. Gap deltas
-    print("\n--- 2. Forecast Deltas by Gap Size ---\n")
+    w("\n--- 2. Forecast Deltas by Gap Size ---\n")
     if not deltas_df.empty:
         magnitude_fields = ["wind_speed_10m_kmh", "wave_height_m", "ocean_current_velocity_kmh"]
+        # One sort + one grouping instead of a mask and a sort per field
+        by_field = dict(list(
+            deltas_df.sort_values(["field", "gap_hours"], kind="mergesort")
+                     .groupby("field", sort=False)
+        ))
         for field in magnitude_fields:
             label, unit, _ = FIELD_LABELS[field]
-            sub = deltas_df[deltas_df["field"] == field].sort_values("gap_hours")
-            if sub.empty:
+            sub = by_field.get(field)
+            if sub is None:
                 continue
-            print(f"  {label} ({unit}):")
-            print(f"    {'Gap':>5}  {'Mean |d|':>10}  {'Median |d|':>11}  {'% nonzero':>10}")
-            print("    " + "-" * 40)
-            for _, row in sub.iterrows():
-                print(f"    {row['gap_hours']:>4}h  {row['mean_abs_delta']:>10.4f}  "
-                      f"{row['median_abs_delta']:>11.4f}  {row['pct_nonzero']:>9.1f}%")
-            print()
+            w(f"  {label} ({unit}):")
+            w(f"    {'Gap':>5}  {'Mean |d|':>10}  {'Median |d|':>11}  {'% nonzero':>10}")
+            w("    " + "-" * 40)
+            buf.extend(_table_lines([
+                (sub["gap_hours"], "%d", 4, "h"),
+                (sub["mean_abs_delta"], "%.4f", 10, ""),
+                (sub["median_abs_delta"], "%.4f", 11, ""),
+                (sub["pct_nonzero"], "%.1f", 9, "%"),
+            ], indent="    ", sep="  "))
+            w("")
 
     # 3. SOG sensitivity
-    print("--- 3. SOG Sensitivity ---\n")
+    w("--- 3. SOG Sensitivity ---\n")
     if sog_df is not None and not sog_df.empty:
-        print(f"  {'Field':<25} {'Gap':>5} {'Perturb':>9} {'Mean SOG d':>11} "
-              f"{'Max SOG d':>10} {'>0.1kn':>7}")
-        print("  " + "-" * 70)
-        for _, row in sog_df.iterrows():
-            label = FIELD_LABELS[row["field"]][0]
-            print(f"  {label:<25} {row['gap_hours']:>4}h {row['perturbation_size']:>9.4f} "
-                  f"{row['mean_sog_delta_knots']:>11.6f} {row['max_sog_delta_knots']:>10.6f} "
-                  f"{row['pct_above_01kn']:>6.1f}%")
+        w(f"  {'Field':<25} {'Gap':>5} {'Perturb':>9} {'Mean SOG d':>11} "
+          f"{'Max SOG d':>10} {'>0.1kn':>7}")
+        w("  " + "-" * 70)
+        labels = sog_df["field"].map(_LABEL0)
+        buf.extend(_table_lines([
+            (labels, "%s", -25, ""),
+            (sog_df["gap_hours"], "%d", 4, "h"),
+            (sog_df["perturbation_size"], "%.4f", 9, ""),
+            (sog_df["mean_sog_delta_knots"], "%.6f", 11, ""),
+            (sog_df["max_sog_delta_knots"], "%.6f", 10, ""),
+            (sog_df["pct_above_01kn"], "%.1f", 6, "%"),
+        ], indent="  ", sep=" "))
     else:
-        print("  No data (requires config for ship parameters).")
+        w("  No data (requires config for ship parameters).")
 
     # Thesis conclusion
-    print("\n" + "=" * 70)
-    print("CONCLUSION")
-    print("=" * 70)
+    w("\n" + "=" * 70)
+    w("CONCLUSION")
+    w("=" * 70)
     if not intervals_df.empty:
-        wind_row = intervals_df[intervals_df["field"] == "wind_speed_10m_kmh"]
-        wave_row = intervals_df[intervals_df["field"] == "wave_height_m"]
-        curr_row = intervals_df[intervals_df["field"] == "ocean_current_velocity_kmh"]
-
-        wind_pct = wind_row["pct_unchanged_hourly"].values[0] if not wind_row.empty else 0
-        wave_pct = wave_row["pct_unchanged_hourly"].values[0] if not wave_row.empty else 0
-        curr_pct = curr_row["pct_unchanged_hourly"].values[0] if not curr_row.empty else 0
-
-        print(f"  Hourly collection redundancy:")
-        print(f"    Wind:     {wind_pct:.0f}% of consecutive hours are identical (NWP cycle: 6h)")
-        print(f"    Waves:    {wave_pct:.0f}% of consecutive hours are identical (NWP cycle: 12h)")
-        print(f"    Currents: {curr_pct:.0f}% of consecutive hours are identical (NWP cycle: 24h)")
-        print()
-        print("  Recommendation: 6-hourly collection aligns with the fastest model")
-        print("  update cycle (GFS wind). Hourly collection wastes ~80%+ of API calls")
-        print("  on identical data. Replan frequency should match collection frequency.")
-    print("=" * 70)
+        pct_map = dict(zip(intervals_df["field"], intervals_df["pct_unchanged_hourly"]))
+        wind_pct = pct_map.get("wind_speed_10m_kmh", 0)
+        wave_pct = pct_map.get("wave_height_m", 0)
+        curr_pct = pct_map.get("ocean_current_velocity_kmh", 0)
+
+        w(f"  Hourly collection redundancy:")
+        w(f"    Wind:     {wind_pct:.0f}% of consecutive hours are identical (NWP cycle: 6h)")
+        w(f"    Waves:    {wave_pct:.0f}% of consecutive hours are identical (NWP cycle: 12h)")
+        w(f"    Currents: {curr_pct:.0f}% of consecutive hours are identical (NWP cycle: 24h)")
+        w("")
+        w("  Recommendation: 6-hourly collection aligns with the fastest model")
+        w("  update cycle (GFS wind). Hourly collection wastes ~80%+ of API calls")
+        w("  on identical data. Replan frequency should match collection frequency.")
+    w("=" * 70)
+    sys.stdout.write("\n".join(buf) + "\n")
+
+
+# =====================================================================
+# Output
+# =====================================================================
+
+def write_csv(df, path):
+    """Write df to CSV with DataFrame.to_csv.
+
+    Kept on pandas' writer so the files match the baseline byte for byte:
+    pyarrow's CSV writer quotes the header and string cells and writes
+    integral floats without ".0" (see sensitivity._write_timeseries).
+    """
+    df.to_csv(path, index=False)
 
 
 # =====================================================================
@@ -524,7 +693,13 @@ if __name__ == "__main__":
                         help="Path to experiment YAML (for SOG sensitivity)")
     parser.add_argument("--suffix", type=str, default="",
                         help="Output filename suffix")
+    parser.add_argument("--format", choices=["csv", "parquet", "both"], default="both",
+                        help="Table output format (default: both)")
+    parser.add_argument("--rechunk", type=int, default=None, metavar="N",
+                        help="Copy the HDF5 to a sibling file with N-row chunks and read that")
     args = parser.parse_args()
+    if args.rechunk is not None and args.rechunk <= 0:
+        parser.error("--rechunk must be a positive number of rows")
 
     logging.basicConfig(level=logging.WARNING)
 
@@ -534,46 +709,65 @@ if __name__ == "__main__":
     if args.config is None:
         args.config = os.path.join(BASE_DIR, "config", "experiment_exp_b.yaml")
 
+    sys.path.insert(0, BASE_DIR)
+    from compare.weather_cache import check_chunks, rechunk
+    if args.rechunk is not None:
+        args.hdf5 = rechunk(args.hdf5, args.rechunk)
+    else:
+        check_chunks(args.hdf5)
+
     print("=" * 70)
     print("FORECAST STALENESS ANALYSIS")
     print(f"  HDF5: {args.hdf5}")
     print("=" * 70)
 
-    # 1. Update intervals
-    print("\n[1/3] Computing update intervals...")
-    intervals_df = compute_update_intervals(args.hdf5)
+    # Predicted weather is read once and shared by all three analyses
+    predicted = _read_predicted(args.hdf5)
 
-    # 2. Gap deltas
-    print("\n[2/3] Computing gap deltas...")
-    deltas_df = compute_gap_deltas(args.hdf5)
+    # 1-2. Update intervals and gap deltas (one pass over predicted weather)
+    print("\n[1-2/3] Computing update intervals and gap deltas...")
+    intervals_df, deltas_df = compute_staleness_stats(args.hdf5, predicted=predicted)
 
-    # 3. SOG sensitivity (requires config)
+    # 3. SOG sensitivity (requires config). Runs after 1-2 rather than in
+    # parallel: it reuses their gap deltas and the shared predicted frame.
     sog_df = None
     if os.path.isfile(args.config):
         import yaml
         print("\n[3/3] Computing SOG sensitivity...")
         with open(args.config) as f:
             config = yaml.safe_load(f)
-        sog_df = compute_sog_sensitivity(args.hdf5, config)
+        sog_df = compute_sog_sensitivity(args.hdf5, config, gap_deltas=deltas_df,
+                                         predicted=predicted)
     else:
         print("\n[3/3] Skipping SOG sensitivity (no config file)")
 
     # Print summaries
     print_summary(intervals_df, deltas_df, sog_df)
 
-    # Save CSVs
-    if not intervals_df.empty:
-        csv_path = os.path.join(FIG_DIR, f"staleness_intervals{args.suffix}.csv")
-        intervals_df.to_csv(csv_path, index=False)
-        print(f"Saved: {csv_path}")
-    if not deltas_df.empty:
-        csv_path = os.path.join(FIG_DIR, f"staleness_deltas{args.suffix}.csv")
-        deltas_df.to_csv(csv_path, index=False)
-        print(f"Saved: {csv_path}")
-    if sog_df is not None and not sog_df.empty:
-        csv_path = os.path.join(FIG_DIR, f"staleness_sog_sensitivity{args.suffix}.csv")
-        sog_df.to_csv(csv_path, index=False)
-        print(f"Saved: {csv_path}")
+    # Save tables
+    tables = [
+        ("staleness_intervals", intervals_df),
+        ("staleness_deltas", deltas_df),
+        ("staleness_sog_sensitivity", sog_df),
+    ]
+    for name, df in tables:
+        if df is None or df.empty:
+            continue
+        stem = os.path.join(FIG_DIR, f"{name}{args.suffix}")
+        if args.format in ("csv", "both"):
+            write_csv(df, stem + ".csv")
+            print(f"Saved: {stem}.csv")
+        if args.format in ("parquet", "both"):
+            try:
+                df.to_parquet(stem + ".parquet", compression="zstd", index=False)
+                print(f"Saved: {stem}.parquet")
+            except ImportError:
+                if args.format == "both":
+                    logger.warning("No Parquet engine installed, skipping %s.parquet", stem)
+                else:
+                    logger.warning("No Parquet engine installed, writing %s.csv instead", stem)
+                    write_csv(df, stem + ".csv")
+                    print(f"Saved: {stem}.csv")
 
     # Generate figures
     print("\nGenerating figures...")
@@ -1,15 +1,16 @@
 """
 Matplotlib figure generation for cross-approach comparison.
 
-All figures are saved as PNG files. Uses Agg backend for headless environments.
+All figures are saved as PNG files. Figures are drawn on a bare Agg canvas,
+without pyplot, so nothing depends on a display or pyplot's figure manager.
 """
 
 import logging
 import os
+import re
+from functools import cache, lru_cache
+from types import MappingProxyType
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
@@ -27,46 +28,95 @@ STYLES = {
 _AUTO_COLORS = ["#9C27B0", "#00BCD4", "#FF5722", "#795548", "#607D8B",
                 "#E91E63", "#009688", "#CDDC39", "#3F51B5", "#FFC107"]
 
+# Sweep variant names, e.g. "dynamic_rh_replan_6h", "dynamic_det_horizon_72h"
+_REPLAN_RE = re.compile(r"^dynamic_rh_replan_(\d+)h?$")
+_HORIZON_RE = re.compile(r"^dynamic_(det|rh)_horizon_(\d+)h?$")
 
+
+@lru_cache(maxsize=None)
 def _style(approach):
+    # Cached and shared between calls, so hand out a read-only view
     if approach in STYLES:
-        return STYLES[approach]
+        return MappingProxyType(STYLES[approach])
     # Auto-generate a style for unknown approaches (e.g. sweep variants)
     idx = hash(approach) % len(_AUTO_COLORS)
-    return {"color": _AUTO_COLORS[idx], "label": approach, "ls": "--"}
+    return MappingProxyType({"color": _AUTO_COLORS[idx], "label": approach, "ls": "--"})
+
+
+# A single figure is reused for every plot: plot_* functions draw into the
+# figure returned by _figure() and _save() clears it after writing, instead
+# of building and tearing down a new figure per plot. The figure uses
+# constrained layout, so margins are settled during the normal draw and
+# savefig does not need a second bbox_inches="tight" pass.
+_FIG = None
+
+
+@cache
+def _agg():
+    """Import the Figure/Agg canvas classes on first use only, so importing
+    this module does not load matplotlib."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    return Figure, FigureCanvasAgg
+
+
+def _figure(figsize):
+    """Return the shared figure, emptied and resized to figsize."""
+    global _FIG
+    if _FIG is None:
+        Figure, FigureCanvasAgg = _agg()
+        _FIG = Figure(figsize=figsize, layout="constrained")
+        FigureCanvasAgg(_FIG)
+    else:
+        _FIG.clear()
+        _FIG.set_size_inches(figsize)
+    return _FIG
+
+
+# zlib level 3 instead of Pillow's default 6: the plots are mostly flat colour
+# and compress nearly as well, at a fraction of the encoding time
+_PNG_KWARGS = {"compress_level": 3, "optimize": False}
 
 
 def _save(fig, save_dir, name):
     path = os.path.join(save_dir, f"{name}.png")
-    fig.savefig(path, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    fig.savefig(path, dpi=150, pil_kwargs=_PNG_KWARGS)
+    fig.clear()
     logger.info("Saved figure: %s", path)
     return path
 
 
 def _segment_boundaries(df):
     """Return cumulative distances where segment changes."""
-    boundaries = []
-    prev_seg = None
-    for _, row in df.iterrows():
-        seg = row.get("segment")
-        if seg is not None and seg != prev_seg and prev_seg is not None:
-            boundaries.append(row["cum_distance_nm"])
-        prev_seg = seg
-    return boundaries
+    if "segment" not in df.columns or len(df) < 2:
+        return []
+    seg = df["segment"].to_numpy()
+    # A change only counts between two rows that both carry a segment
+    present = pd.notna(seg)
+    change = present[1:] & present[:-1] & (seg[1:] != seg[:-1])
+    return df["cum_distance_nm"].to_numpy()[1:][change].tolist()
+
+
+def _record_column(records, key):
+    """Float array of records[i][key]; NaN where a record lacks the key
+    (e.g. dp_planned_* on infeasible decision points)."""
+    return np.fromiter((r.get(key, np.nan) for r in records),
+                       dtype=np.float64, count=len(records))
 
 
 def plot_speed_profiles(time_series, save_dir):
     """Figure 1: SWS vs cumulative distance, one line per approach.
 
     Args:
-        time_series: dict {approach: DataFrame}
+        time_series: dict {approach: DataFrame}, each sorted by
+            cum_distance_nm (as returned by load_time_series)
         save_dir: directory to save the figure
 
     Returns:
         Path to saved PNG.
     """
-    fig, ax = plt.subplots(figsize=(12, 5))
+    fig = _figure((12, 5))
+    ax = fig.add_subplot()
 
     # Draw segment boundaries from first available time series
     first_df = next(iter(time_series.values()))
@@ -76,8 +126,10 @@ def plot_speed_profiles(time_series, save_dir):
     for approach in sorted(time_series.keys()):
         df = time_series[approach]
         s = _style(approach)
+        x = df["cum_distance_nm"].to_numpy()
+        y = df["sws_knots"].to_numpy()
         ax.plot(
-            df["cum_distance_nm"], df["sws_knots"],
+            x, y,
             color=s["color"], linestyle=s["ls"], label=s["label"],
             linewidth=1.2, alpha=0.9,
         )
@@ -95,19 +147,23 @@ def plot_fuel_curves(time_series, save_dir):
     """Figure 2: Cumulative fuel vs cumulative distance, one line per approach.
 
     Args:
-        time_series: dict {approach: DataFrame}
+        time_series: dict {approach: DataFrame}, each sorted by
+            cum_distance_nm (as returned by load_time_series)
         save_dir: directory to save the figure
 
     Returns:
         Path to saved PNG.
     """
-    fig, ax = plt.subplots(figsize=(12, 5))
+    fig = _figure((12, 5))
+    ax = fig.add_subplot()
 
     for approach in sorted(time_series.keys()):
         df = time_series[approach]
         s = _style(approach)
+        x = df["cum_distance_nm"].to_numpy()
+        y = df["cum_fuel_mt"].to_numpy()
         ax.plot(
-            df["cum_distance_nm"], df["cum_fuel_mt"],
+            x, y,
             color=s["color"], linestyle=s["ls"], label=s["label"],
             linewidth=1.2, alpha=0.9,
         )
@@ -140,7 +196,8 @@ def plot_fuel_comparison(results, save_dir):
     x = np.arange(len(approaches))
     width = 0.35
 
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig = _figure((8, 5))
+    ax = fig.add_subplot()
     bars1 = ax.bar(x - width / 2, planned, width, label="Planned", color="#64B5F6", edgecolor="white")
     bars2 = ax.bar(x + width / 2, simulated, width, label="Simulated", color="#EF5350", edgecolor="white")
 
@@ -191,20 +248,21 @@ def plot_forecast_error(forecast_errors_df, save_dir):
     if not available:
         return None
 
-    fig, axes = plt.subplots(1, len(available), figsize=(5 * len(available), 4), squeeze=False)
+    fig = _figure((5 * len(available), 4))
+    axes = fig.subplots(1, len(available), squeeze=False)
 
     for i, field in enumerate(available):
         ax = axes[0, i]
         subset = forecast_errors_df[forecast_errors_df["field"] == field].sort_values("lead_time_h")
         label, unit = field_labels[field]
-        ax.plot(subset["lead_time_h"], subset["rmse"], "o-", markersize=3, linewidth=1.2)
+        ax.plot(subset["lead_time_h"].to_numpy(), subset["rmse"].to_numpy(),
+                "o-", markersize=3, linewidth=1.2)
         ax.set_xlabel("Lead Time (h)")
         ax.set_ylabel(f"RMSE ({unit})")
         ax.set_title(label)
         ax.grid(True, alpha=0.3)
 
-    fig.suptitle("Forecast Error vs Lead Time", fontsize=13, y=1.02)
-    fig.tight_layout()
+    fig.suptitle("Forecast Error vs Lead Time", fontsize=13)
 
     return _save(fig, save_dir, "forecast_error")
 
@@ -224,13 +282,14 @@ def plot_replan_evolution(decision_points, save_dir):
         logger.info("No decision points, skipping replan evolution plot")
         return None
 
-    df = pd.DataFrame(decision_points)
+    hours = _record_column(decision_points, "decision_hour")
 
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), sharex=True)
+    fig = _figure((10, 7))
+    ax1, ax2 = fig.subplots(2, 1, sharex=True)
 
     # Top: DP planned total fuel at each decision point
     ax1.plot(
-        df["decision_hour"], df["dp_planned_fuel_mt"],
+        hours, _record_column(decision_points, "dp_planned_fuel_mt"),
         "o-", color="#4CAF50", markersize=4, linewidth=1.2,
         label="DP planned total fuel",
     )
@@ -241,7 +300,7 @@ def plot_replan_evolution(decision_points, save_dir):
 
     # Bottom: Elapsed fuel
     ax2.plot(
-        df["decision_hour"], df["elapsed_fuel_mt"],
+        hours, _record_column(decision_points, "elapsed_fuel_mt"),
         "s-", color="#FF9800", markersize=4, linewidth=1.2,
         label="Elapsed fuel (actual)",
     )
@@ -251,8 +310,6 @@ def plot_replan_evolution(decision_points, save_dir):
     ax2.legend()
     ax2.grid(True, alpha=0.3)
 
-    fig.tight_layout()
-
     return _save(fig, save_dir, "replan_evolution")
 
 
@@ -269,14 +326,9 @@ def plot_replan_sensitivity(results, save_dir):
     # Extract sweep results
     sweep = {}
     for approach, r in results.items():
-        if approach.startswith("dynamic_rh_replan_"):
-            # Parse frequency from "dynamic_rh_replan_6h"
-            suffix = approach.replace("dynamic_rh_replan_", "").rstrip("h")
-            try:
-                freq = int(suffix)
-            except ValueError:
-                continue
-            sweep[freq] = r["simulated"]["total_fuel_mt"]
+        m = _REPLAN_RE.match(approach)
+        if m:
+            sweep[int(m.group(1))] = r["simulated"]["total_fuel_mt"]
 
     if not sweep:
         logger.info("No replan sweep data, skipping sensitivity plot")
@@ -285,7 +337,8 @@ def plot_replan_sensitivity(results, save_dir):
     freqs = sorted(sweep.keys())
     fuels = [sweep[f] for f in freqs]
 
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig = _figure((8, 5))
+    ax = fig.add_subplot()
     ax.plot(freqs, fuels, "o-", color="#4CAF50", markersize=6, linewidth=1.5,
             label="RH sweep", zorder=5)
 
@@ -325,27 +378,19 @@ def plot_horizon_sensitivity(results, save_dir):
     Returns:
         Path to saved PNG, or None if no horizon sweep data.
     """
-    dd_sweep = {}
-    rh_sweep = {}
+    sweeps = {"det": {}, "rh": {}}
     for approach, r in results.items():
-        if approach.startswith("dynamic_det_horizon_"):
-            suffix = approach.replace("dynamic_det_horizon_", "").rstrip("h")
-            try:
-                dd_sweep[int(suffix)] = r["simulated"]["total_fuel_mt"]
-            except ValueError:
-                continue
-        elif approach.startswith("dynamic_rh_horizon_"):
-            suffix = approach.replace("dynamic_rh_horizon_", "").rstrip("h")
-            try:
-                rh_sweep[int(suffix)] = r["simulated"]["total_fuel_mt"]
-            except ValueError:
-                continue
+        m = _HORIZON_RE.match(approach)
+        if m:
+            sweeps[m.group(1)][int(m.group(2))] = r["simulated"]["total_fuel_mt"]
+    dd_sweep, rh_sweep = sweeps["det"], sweeps["rh"]
 
     if not dd_sweep and not rh_sweep:
         logger.info("No horizon sweep data, skipping plot")
         return None
 
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig = _figure((8, 5))
+    ax = fig.add_subplot()
 
     if dd_sweep:
         horizons = sorted(dd_sweep.keys())
@@ -2,12 +2,42 @@
 Markdown report generation for cross-approach comparison.
 """
 
+import hashlib
+import io
 import logging
 import os
-from datetime import datetime
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Report file buffer: large enough that the whole report reaches the OS in
+# one write
+_WRITE_BUFFER = 1 << 20
+
+# Sweep variant names, e.g. "dynamic_rh_replan_6h", "dynamic_det_horizon_72h"
+_REPLAN_RE = re.compile(r"^dynamic_rh_replan_(\d+)h?$")
+_HORIZON_RE = re.compile(r"^dynamic_(det|rh)_horizon_(\d+)h?$")
+
+# Section builders go to a thread pool from this many approaches upward
+_PARALLEL_MIN_RESULTS = 50
+_SECTION_WORKERS = 4
+
+# Sections rendered when there is nothing to report
+_EMPTY_FORECAST_ERROR = ("## Forecast Error Summary\n\n"
+                         "Forecast error analysis: N/A (no HDF5 data or no overlapping hours)")
+_EMPTY_DECISION_POINTS = ("## Decision Points (Rolling Horizon)\n\n"
+                          "No rolling horizon decision points available.")
+_EMPTY_BOUNDS = ("## Theoretical Bounds\n\n"
+                 "No bounds data available (run `sensitivity` first).")
+_EMPTY_REPLAN_SWEEP = ("## Replan Frequency Sensitivity\n\n"
+                       "No replan sweep data available (run `sensitivity` first).")
+_EMPTY_HORIZON_SWEEP = ("## Forecast Horizon Sensitivity\n\n"
+                        "No forecast horizon sweep data available (run `sensitivity` first).")
+
+# Rendered sections keyed by a hash of their inputs, under save_dir
+_SECTION_CACHE_DIR = ".report_cache"
+
 
 def generate_report(comparison_df, forecast_errors, figure_paths, results, save_dir):
     """Generate a markdown comparison report.
@@ -22,52 +52,128 @@ def generate_report(comparison_df, forecast_errors, figure_paths, results, save_
     Returns:
         Path to the generated report.md
     """
-    sections = []
-
-    # 1. Header
-    sections.append(_header_section(results))
+    decision_points = None
+    if "dynamic_rh" in results:
+        decision_points = results["dynamic_rh"].get("decision_points")
+    figures_key = repr((os.path.abspath(save_dir), sorted((figure_paths or {}).items())))
+    comparison_cols = frozenset(comparison_df.columns)
+    # Simulated fuel per approach, shared by the bounds and sweep sections
+    fuel = {a: r.get("simulated", {}).get("total_fuel_mt") for a, r in results.items()}
+
+    # (builder, args) per section, in report order
+    section_specs = [
+        # 1. Header
+        (_header_section, (results,)),
+        # 2. Comparison table
+        (_cached_section, (save_dir, "comparison_table", [_frame_key(comparison_df)],
+                           _comparison_table_section, comparison_df, comparison_cols)),
+        # 3. Key findings
+        (_key_findings_section, (comparison_df, results)),
+        # 4. Theoretical bounds
+        (_bounds_section, (fuel,)),
+        # 5. Forecast error summary
+        (_cached_section, (save_dir, "forecast_error", [_frame_key(forecast_errors)],
+                           _forecast_error_section, forecast_errors)),
+        # 6. Decision points / re-planning
+        (_decision_points_section, (decision_points,)),
+        # 7. Replan frequency sweep
+        (_replan_sweep_section, (fuel,)),
+        # 8. Forecast horizon sweep
+        (_horizon_sweep_section, (fuel,)),
+        # 9. Figures
+        (_cached_section, (save_dir, "figures", [figures_key.encode()],
+                           _figures_section, figure_paths, save_dir)),
+    ]
 
-    # 2. Comparison table
-    sections.append(_comparison_table_section(comparison_df))
+    # The builders are independent; for large sweeps run them on a thread
+    # pool (results are collected in order). Small reports build faster
+    # inline than the pool takes to start.
+    if len(results) >= _PARALLEL_MIN_RESULTS:
+        with ThreadPoolExecutor(max_workers=_SECTION_WORKERS) as ex:
+            futures = [ex.submit(fn, *args) for fn, args in section_specs]
+            sections = [f.result() for f in futures]
+    else:
+        sections = [fn(*args) for fn, args in section_specs]
 
-    # 3. Key findings
-    sections.append(_key_findings_section(comparison_df, results))
+    os.makedirs(save_dir, exist_ok=True)
+    report_path = os.path.join(save_dir, "report.md")
+    # Sections are streamed into the file buffer rather than joined into
+    # one report string first. The report is written to a temp file and
+    # renamed over report.md, so readers never see a partial report.
+    tmp_path = report_path + ".tmp"
+    try:
+        with open(tmp_path, "w", buffering=_WRITE_BUFFER) as f:
+            f.writelines(_report_chunks(sections))
+        os.replace(tmp_path, report_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-    # 4. Theoretical bounds
-    sections.append(_bounds_section(results))
+    logger.info("Report written: %s", report_path)
+    return report_path
 
-    # 5. Forecast error summary
-    sections.append(_forecast_error_section(forecast_errors))
 
-    # 6. Decision points / re-planning
-    decision_points = None
-    if "dynamic_rh" in results:
-        decision_points = results["dynamic_rh"].get("decision_points")
-    sections.append(_decision_points_section(decision_points))
+def _report_chunks(sections):
+    """Yield the report text piecewise: non-empty sections separated by a
+    blank line, then the final newline."""
+    sep = ""
+    for section in sections:
+        if section:
+            yield sep
+            yield section
+            sep = "\n\n"
+    yield "\n"
 
-    # 7. Replan frequency sweep
-    sections.append(_replan_sweep_section(results))
 
-    # 8. Forecast horizon sweep
-    sections.append(_horizon_sweep_section(results))
+def _frame_key(df):
+    """Bytes identifying a DataFrame's contents, columns and dtypes."""
+    if df is None:
+        return b"None"
+    import pandas as pd
 
-    # 9. Figures
-    sections.append(_figures_section(figure_paths, save_dir))
+    meta = repr((list(df.columns), [str(t) for t in df.dtypes])).encode()
+    return meta + pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
 
-    report = "\n\n".join(s for s in sections if s)
 
-    os.makedirs(save_dir, exist_ok=True)
-    report_path = os.path.join(save_dir, "report.md")
-    with open(report_path, "w") as f:
-        f.write(report)
-        f.write("\n")
+def _cached_section(save_dir, name, key_parts, build_fn, *args):
+    """Return build_fn(*args), reusing the markdown cached for the same inputs.
 
-    logger.info("Report written: %s", report_path)
-    return report_path
+    Cache files live in save_dir/.report_cache as {name}_{hash}.md. The hash
+    also covers this module's file, so edits to a section builder invalidate
+    its cached output.
+    """
+    st = os.stat(__file__)
+    h = hashlib.blake2b(f"{st.st_mtime_ns}|{st.st_size}".encode(), digest_size=16)
+    for part in key_parts:
+        h.update(part)
+    cache_dir = os.path.join(save_dir, _SECTION_CACHE_DIR)
+    filename = f"{name}_{h.hexdigest()}.md"
+    path = os.path.join(cache_dir, filename)
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        pass
+
+    text = build_fn(*args)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Drop the entries of this section from earlier inputs
+        for old in os.listdir(cache_dir):
+            if old.startswith(f"{name}_") and old != filename:
+                os.remove(os.path.join(cache_dir, old))
+        with open(path, "w") as f:
+            f.write(text)
+    except OSError as e:
+        logger.warning("Could not cache report section %s: %s", name, e)
+    return text
 
 
 def _header_section(results):
     """Generate header with date, route, ship specs, ETA."""
+    from datetime import datetime
+
     lines = ["# Comparison Report"]
     lines.append(f"\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
@@ -90,8 +196,12 @@ def _header_section(results):
     return "\n".join(lines)
 
 
-def _comparison_table_section(comparison_df):
-    """Generate markdown table from comparison DataFrame."""
+def _comparison_table_section(comparison_df, columns=None):
+    """Generate markdown table from comparison DataFrame.
+
+    Args:
+        columns: frozenset of comparison_df's column names, if already built.
+    """
     if comparison_df.empty:
         return "## Comparison Table\n\nNo results available."
 
@@ -113,43 +223,85 @@ def _comparison_table_section(comparison_df):
     ]
 
     # Filter to columns that exist
-    cols = [(k, lbl) for k, lbl in col_map if k in comparison_df.columns]
+    if columns is None:
+        columns = frozenset(comparison_df.columns)
+    cols = [(k, lbl) for k, lbl in col_map if k in columns]
     keys = [k for k, _ in cols]
     headers = [lbl for _, lbl in cols]
 
-    # Header row
+    # Data rows, formatted a column at a time
     lines.append("")
-    lines.append("| " + " | ".join(headers) + " |")
-    lines.append("| " + " | ".join("---" for _ in headers) + " |")
-
-    # Data rows
-    for _, row in comparison_df.iterrows():
-        cells = []
-        for key in keys:
-            val = row[key]
-            if val is None or (isinstance(val, float) and val != val):
-                cells.append("N/A")
-            elif isinstance(val, float):
-                cells.append(f"{val:.4f}")
-            elif isinstance(val, int):
-                cells.append(str(val))
-            else:
-                cells.append(str(val))
-        lines.append("| " + " | ".join(cells) + " |")
+    lines.extend(_md_table(headers, [_format_column(comparison_df[key]) for key in keys]))
 
     return "\n".join(lines)
 
 
+def _md_table(headers, columns):
+    """Markdown table lines (header, separator, rows) from column-wise cells.
+
+    Rows are assembled with np.char a column at a time rather than joining
+    a cell list per row.
+    """
+    import numpy as np
+
+    lines = ["| " + " | ".join(headers) + " |",
+             "| " + " | ".join("---" for _ in headers) + " |"]
+    rows = np.char.add("| ", np.asarray(columns[0], dtype=str))
+    for col in columns[1:]:
+        rows = np.char.add(np.char.add(rows, " | "), np.asarray(col, dtype=str))
+    lines.extend(np.char.add(rows, " |").tolist())
+    return lines
+
+
+def _format_float(val):
+    return "N/A" if val != val else f"{val:.4f}"
+
+
+# Cell formatter by exact type: one dict lookup instead of an isinstance chain
+_CELL_FMT = {
+    float: _format_float,
+    int: str,
+    str: str,
+    type(None): lambda val: "N/A",
+}
+
+
+def _format_cell(val):
+    fmt = _CELL_FMT.get(type(val))
+    if fmt is not None:
+        return fmt(val)
+    # Subclasses such as numpy.float64, and anything else
+    return _format_float(val) if isinstance(val, float) else str(val)
+
+
+def _format_column(col):
+    """Markdown cell strings for one comparison column: floats to 4 decimals,
+    missing values as N/A."""
+    if col.dtype.kind == "f":
+        import numpy as np
+
+        arr = col.to_numpy(dtype=float)
+        return np.where(np.isnan(arr), "N/A", np.char.mod("%.4f", arr)).tolist()
+    return [_format_cell(val) for val in col.tolist()]
+
+
 def _key_findings_section(comparison_df, results):
     """Generate pairwise delta analysis."""
+    import pandas as pd
+
     lines = ["## Key Findings"]
 
-    approaches = set(comparison_df["approach"].values) if not comparison_df.empty else set()
+    # Row of each approach (first occurrence), from one pass over the column
+    rows = {}
+    if not comparison_df.empty:
+        for i, approach in enumerate(comparison_df["approach"].tolist()):
+            rows.setdefault(approach, i)
+    approaches = set(rows)
 
     # Value of dynamic weather: static vs dynamic_det
     if "static_det" in approaches and "dynamic_det" in approaches:
-        static_row = comparison_df[comparison_df["approach"] == "static_det"].iloc[0]
-        dyn_row = comparison_df[comparison_df["approach"] == "dynamic_det"].iloc[0]
+        static_row = comparison_df.iloc[rows["static_det"]]
+        dyn_row = comparison_df.iloc[rows["dynamic_det"]]
 
         static_fuel = static_row["simulated_fuel_mt"]
         dyn_fuel = dyn_row["simulated_fuel_mt"]
@@ -161,18 +313,18 @@ def _key_findings_section(comparison_df, results):
         # Gap comparison
         static_gap = static_row["fuel_gap_pct"]
         dyn_gap = dyn_row["fuel_gap_pct"]
-        if static_gap is not None and dyn_gap is not None:
+        if pd.notna(static_gap) and pd.notna(dyn_gap):  # missing gaps are NaN
             lines.append(f"- Static LP plan-vs-sim gap: {static_gap:+.2f}%")
             lines.append(f"- Dynamic DP plan-vs-sim gap: {dyn_gap:+.2f}%")
 
     # Value of re-planning: dynamic_det vs dynamic_rh
     if "dynamic_det" in approaches and "dynamic_rh" in approaches:
-        dyn_row = comparison_df[comparison_df["approach"] == "dynamic_det"].iloc[0]
-        rh_row = comparison_df[comparison_df["approach"] == "dynamic_rh"].iloc[0]
+        dyn_row = comparison_df.iloc[rows["dynamic_det"]]
+        rh_row = comparison_df.iloc[rows["dynamic_rh"]]
 
         dyn_gap = dyn_row["fuel_gap_pct"]
         rh_gap = rh_row["fuel_gap_pct"]
-        if dyn_gap is not None and rh_gap is not None:
+        if pd.notna(dyn_gap) and pd.notna(rh_gap):
             lines.append(f"\n**Value of re-planning**: Rolling Horizon gap is {rh_gap:+.2f}% "
                          f"vs Dynamic DP gap of {dyn_gap:+.2f}%")
             lines.append(f"- RH achieves a tighter plan-to-simulation match "
@@ -186,59 +338,55 @@ def _key_findings_section(comparison_df, results):
 
 def _forecast_error_section(forecast_errors):
     """Generate forecast error summary at key lead times."""
-    lines = ["## Forecast Error Summary"]
-
     if forecast_errors is None or forecast_errors.empty:
-        lines.append("\nForecast error analysis: N/A (no HDF5 data or no overlapping hours)")
-        return "\n".join(lines)
+        return _EMPTY_FORECAST_ERROR
 
-    fields = forecast_errors["field"].unique()
-    lead_times = sorted(forecast_errors["lead_time_h"].unique())
+    lines = ["## Forecast Error Summary"]
+
+    # (field, lead_time_h) -> rmse, built once instead of masking per cell;
+    # the field and lead time lists come from the same pass
+    rmse = dict(zip(zip(forecast_errors["field"], forecast_errors["lead_time_h"]),
+                    forecast_errors["rmse"]))
+    fields = list(dict.fromkeys(field for field, _ in rmse))
+    lead_times = sorted({lt for _, lt in rmse})
 
     # Show RMSE at a few key lead times
     key_leads = [lt for lt in [0, 6, 12, 24, 48] if lt in lead_times]
     if not key_leads:
         key_leads = lead_times[:5]
 
-    lines.append("")
-    header = "| Field | " + " | ".join(f"LT={lt}h" for lt in key_leads) + " |"
-    sep = "| --- | " + " | ".join("---" for _ in key_leads) + " |"
-    lines.append(header)
-    lines.append(sep)
-
     field_labels = {
         "wind_speed_10m_kmh": "Wind Speed (km/h)",
         "wave_height_m": "Wave Height (m)",
         "ocean_current_velocity_kmh": "Current Vel (km/h)",
     }
 
-    for field in fields:
-        label = field_labels.get(field, field)
-        cells = []
-        for lt in key_leads:
-            row = forecast_errors[
-                (forecast_errors["field"] == field) & (forecast_errors["lead_time_h"] == lt)
-            ]
-            if row.empty:
-                cells.append("N/A")
-            else:
-                cells.append(f"{row.iloc[0]['rmse']:.4f}")
-        lines.append(f"| {label} | " + " | ".join(cells) + " |")
+    columns = [[field_labels.get(field, field) for field in fields]]
+    for lt in key_leads:
+        vals = (rmse.get((field, lt)) for field in fields)
+        columns.append(["N/A" if val is None else f"{val:.4f}" for val in vals])
+
+    lines.append("")
+    lines.extend(_md_table(["Field"] + [f"LT={lt}h" for lt in key_leads], columns))
 
     return "\n".join(lines)
 
 
 def _decision_points_section(decision_points):
     """Generate summary of RH re-planning behavior."""
+    if not decision_points:
+        return _EMPTY_DECISION_POINTS
+
     lines = ["## Decision Points (Rolling Horizon)"]
 
-    if not decision_points:
-        lines.append("\nNo rolling horizon decision points available.")
-        return "\n".join(lines)
+    import pandas as pd
 
-    n = len(decision_points)
-    first = decision_points[0]
-    last = decision_points[-1]
+    # Columnar view; keys missing from some points (dp_planned_* on
+    # infeasible ones) become NaN instead of raising KeyError
+    dp_df = pd.DataFrame(decision_points)
+    n = len(dp_df)
+    first = dp_df.iloc[0]
+    last = dp_df.iloc[-1]
 
     lines.append(f"\n- Total re-plan events: {n}")
     lines.append(f"- First decision: hour {first['decision_hour']}, "
@@ -253,124 +401,123 @@ def _decision_points_section(decision_points):
     lines.append(f"- Final elapsed fuel: {final_elapsed:.2f} mt")
 
     # All statuses
-    statuses = set(dp["dp_status"] for dp in decision_points)
-    lines.append(f"- Solver statuses: {', '.join(sorted(statuses))}")
+    statuses = sorted(pd.unique(dp_df["dp_status"]))
+    lines.append(f"- Solver statuses: {', '.join(statuses)}")
 
     return "\n".join(lines)
 
 
-def _bounds_section(results):
-    """Generate theoretical bounds analysis."""
-    lines = ["## Theoretical Bounds"]
+def _bounds_section(fuel):
+    """Generate theoretical bounds analysis.
 
-    has_lower = "lower_bound" in results
-    has_upper = "upper_bound" in results
+    Args:
+        fuel: dict {approach: simulated total_fuel_mt}
+    """
+    has_lower = "lower_bound" in fuel
+    has_upper = "upper_bound" in fuel
 
     if not has_lower and not has_upper:
-        lines.append("\nNo bounds data available (run `sensitivity` first).")
-        return "\n".join(lines)
+        return _EMPTY_BOUNDS
+
+    # Lines go straight into a StringIO buffer; [:-1] drops the final newline
+    buf = io.StringIO()
+    print("## Theoretical Bounds", file=buf)
 
     if has_lower:
-        lb_fuel = results["lower_bound"]["simulated"]["total_fuel_mt"]
-        lines.append(f"\n- **Lower bound** (perfect information): {lb_fuel:.2f} mt")
+        lb_fuel = fuel["lower_bound"]
+        print(f"\n- **Lower bound** (perfect information): {lb_fuel:.2f} mt", file=buf)
     if has_upper:
-        ub_fuel = results["upper_bound"]["simulated"]["total_fuel_mt"]
-        lines.append(f"- **Upper bound** (constant speed, no optimization): {ub_fuel:.2f} mt")
+        ub_fuel = fuel["upper_bound"]
+        print(f"- **Upper bound** (constant speed, no optimization): {ub_fuel:.2f} mt", file=buf)
 
     if has_lower and has_upper:
         span = ub_fuel - lb_fuel
-        lines.append(f"- **Optimization span**: {span:.2f} mt ({span / ub_fuel * 100:.1f}% of upper bound)")
+        print(f"- **Optimization span**: {span:.2f} mt ({span / ub_fuel * 100:.1f}% of upper bound)",
+              file=buf)
 
         # Show where each core approach falls
-        lines.append("")
+        print(file=buf)
         core_approaches = ["static_det", "dynamic_det", "dynamic_rh"]
         core_labels = {"static_det": "Static LP", "dynamic_det": "Dynamic DP",
                        "dynamic_rh": "Rolling Horizon"}
         for approach in core_approaches:
-            if approach not in results:
+            if approach not in fuel:
                 continue
-            fuel = results[approach]["simulated"]["total_fuel_mt"]
+            approach_fuel = fuel[approach]
             if span > 0:
-                position = (fuel - lb_fuel) / span * 100
+                position = (approach_fuel - lb_fuel) / span * 100
                 captured = 100 - position
-                lines.append(f"- **{core_labels[approach]}**: {fuel:.2f} mt "
-                             f"({captured:.1f}% of optimization potential captured)")
+                print(f"- **{core_labels[approach]}**: {approach_fuel:.2f} mt "
+                      f"({captured:.1f}% of optimization potential captured)", file=buf)
 
-    return "\n".join(lines)
+    return buf.getvalue()[:-1]
 
 
-def _replan_sweep_section(results):
-    """Generate replan frequency sensitivity summary."""
-    lines = ["## Replan Frequency Sensitivity"]
+def _replan_sweep_section(fuel):
+    """Generate replan frequency sensitivity summary.
 
+    Args:
+        fuel: dict {approach: simulated total_fuel_mt}
+    """
     sweep = {}
-    for approach, r in results.items():
-        if approach.startswith("dynamic_rh_replan_"):
-            suffix = approach.replace("dynamic_rh_replan_", "").rstrip("h")
-            try:
-                freq = int(suffix)
-            except ValueError:
-                continue
-            sweep[freq] = r["simulated"]["total_fuel_mt"]
+    for approach, approach_fuel in fuel.items():
+        m = _REPLAN_RE.match(approach)
+        if m:
+            sweep[int(m.group(1))] = approach_fuel
 
     if not sweep:
-        lines.append("\nNo replan sweep data available (run `sensitivity` first).")
-        return "\n".join(lines)
+        return _EMPTY_REPLAN_SWEEP
 
     freqs = sorted(sweep.keys())
-    lines.append("")
-    lines.append("| Replan Freq (h) | Sim Fuel (mt) |")
-    lines.append("| --- | --- |")
-    for freq in freqs:
-        lines.append(f"| {freq} | {sweep[freq]:.2f} |")
+    # Lines go straight into a StringIO buffer; [:-1] drops the final newline
+    buf = io.StringIO()
+    print("## Replan Frequency Sensitivity\n", file=buf)
+    for line in _md_table(
+        ["Replan Freq (h)", "Sim Fuel (mt)"],
+        [[str(freq) for freq in freqs], [f"{sweep[freq]:.2f}" for freq in freqs]],
+    ):
+        print(line, file=buf)
 
     # Diminishing returns analysis
     if len(freqs) >= 2:
         best_fuel = sweep[freqs[0]]
         worst_fuel = sweep[freqs[-1]]
         delta = worst_fuel - best_fuel
-        lines.append(f"\n- Range: {delta:.2f} mt between {freqs[0]}h and {freqs[-1]}h replan")
+        print(f"\n- Range: {delta:.2f} mt between {freqs[0]}h and {freqs[-1]}h replan", file=buf)
         if worst_fuel > 0:
-            lines.append(f"- Relative impact: {delta / worst_fuel * 100:.2f}%")
-        lines.append("- More frequent replanning uses fresher forecasts, reducing fuel; "
-                      "diminishing returns beyond a certain point.")
+            print(f"- Relative impact: {delta / worst_fuel * 100:.2f}%", file=buf)
+        print("- More frequent replanning uses fresher forecasts, reducing fuel; "
+              "diminishing returns beyond a certain point.", file=buf)
 
-    return "\n".join(lines)
+    return buf.getvalue()[:-1]
 
 
-def _horizon_sweep_section(results):
-    """Generate forecast horizon sensitivity summary."""
-    lines = ["## Forecast Horizon Sensitivity"]
+def _horizon_sweep_section(fuel):
+    """Generate forecast horizon sensitivity summary.
 
-    dd_sweep = {}
-    rh_sweep = {}
-    for approach, r in results.items():
-        if approach.startswith("dynamic_det_horizon_"):
-            suffix = approach.replace("dynamic_det_horizon_", "").rstrip("h")
-            try:
-                dd_sweep[int(suffix)] = r["simulated"]["total_fuel_mt"]
-            except ValueError:
-                continue
-        elif approach.startswith("dynamic_rh_horizon_"):
-            suffix = approach.replace("dynamic_rh_horizon_", "").rstrip("h")
-            try:
-                rh_sweep[int(suffix)] = r["simulated"]["total_fuel_mt"]
-            except ValueError:
-                continue
+    Args:
+        fuel: dict {approach: simulated total_fuel_mt}
+    """
+    sweeps = {"det": {}, "rh": {}}
+    for approach, approach_fuel in fuel.items():
+        m = _HORIZON_RE.match(approach)
+        if m:
+            sweeps[m.group(1)][int(m.group(2))] = approach_fuel
+    dd_sweep, rh_sweep = sweeps["det"], sweeps["rh"]
 
     if not dd_sweep and not rh_sweep:
-        lines.append("\nNo forecast horizon sweep data available (run `sensitivity` first).")
-        return "\n".join(lines)
+        return _EMPTY_HORIZON_SWEEP
 
     all_horizons = sorted(set(list(dd_sweep.keys()) + list(rh_sweep.keys())))
 
-    lines.append("")
-    lines.append("| Horizon (h) | Days | DP Fuel (mt) | RH Fuel (mt) |")
-    lines.append("| --- | --- | --- | --- |")
-    for h in all_horizons:
-        dd_val = f"{dd_sweep[h]:.2f}" if h in dd_sweep else "N/A"
-        rh_val = f"{rh_sweep[h]:.2f}" if h in rh_sweep else "N/A"
-        lines.append(f"| {h} | {h / 24:.0f} | {dd_val} | {rh_val} |")
+    lines = ["## Forecast Horizon Sensitivity", ""]
+    lines.extend(_md_table(
+        ["Horizon (h)", "Days", "DP Fuel (mt)", "RH Fuel (mt)"],
+        [[str(h) for h in all_horizons],
+         [f"{h / 24:.0f}" for h in all_horizons],
+         [f"{dd_sweep[h]:.2f}" if h in dd_sweep else "N/A" for h in all_horizons],
+         [f"{rh_sweep[h]:.2f}" if h in rh_sweep else "N/A" for h in all_horizons]],
+    ))
 
     # Analysis
     if len(all_horizons) >= 2:
@@ -409,13 +556,22 @@ def _figures_section(figure_paths, save_dir):
         "horizon_sensitivity": "Fuel consumption vs forecast horizon (3, 5, 7 day forecasts)",
     }
 
+    # Figures normally live under save_dir, where the relative path is a
+    # plain prefix strip; anything else goes through relpath
+    save_prefix = os.path.normpath(os.path.abspath(save_dir)) + os.sep
+
     for name in ["speed_profiles", "fuel_curves", "fuel_comparison",
                   "forecast_error", "replan_evolution", "replan_sensitivity",
                   "horizon_sensitivity"]:
-        if name not in figure_paths or figure_paths[name] is None:
+        path = figure_paths.get(name)
+        if path is None:
             continue
         # Use relative path from report location
-        rel = os.path.relpath(figure_paths[name], save_dir)
+        path = os.path.normpath(os.path.abspath(path))
+        if path.startswith(save_prefix):
+            rel = path[len(save_prefix):]
+        else:
+            rel = os.path.relpath(path, save_dir)
         caption = captions.get(name, name)
         lines.append(f"\n### {caption}")
         lines.append(f"![{caption}]({rel})")
@@ -6,18 +6,283 @@ Sensitivity analysis: theoretical bounds and replan frequency sweep.
 - Replan sweep: Rolling Horizon at varying replan frequencies
 """
 
-import copy
+import contextlib
+import hashlib
+import io
 import json
 import logging
+import math
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 
+import numpy as np
+import pandas as pd
+
+from shared import hdf5_io, physics, simulation
+from shared.hdf5_io import read_metadata, read_actual, get_completed_runs, open_read
 from shared.metrics import compute_result_metrics, build_result_json, save_result
-from shared.simulation import simulate_voyage
+from shared.physics import (
+    calculate_ship_heading,
+    calculate_sws_from_sog,
+    calculate_speed_over_ground,
+    calculate_fuel_consumption_rate,
+    calculate_co2_emissions,
+    load_ship_parameters,
+)
+from shared.simulation import simulate_voyage, simulate_voyage_arrays
 
 logger = logging.getLogger(__name__)
 
+# Pickled simulate_voyage() results, kept next to the HDF5 file; the least
+# recently used entries beyond _SIM_CACHE_MAX_ENTRIES are deleted
+_SIM_CACHE_DIR = ".sim_cache"
+_SIM_CACHE_MAX_ENTRIES = 2000
+
+# Floor on leg length (nm), so duplicate waypoints still give a positive leg
+_MIN_LEG_NM = 0.001
+
+
+def _unavailable(package, error):
+    """Stand-in for an optimizer whose package failed to import."""
+    def fn(*args, **kwargs):
+        raise ImportError(f"{package} is not available: {error}") from error
+    return fn
+
+
+# Optimizer packages are imported once here rather than on every sweep
+# call; a missing one only fails the experiments that use it.
+try:
+    from static_det.transform import transform as lp_transform
+    from static_det.optimize import optimize as lp_optimize
+except ImportError as e:
+    lp_transform = lp_optimize = _unavailable("static_det", e)
+
+try:
+    from dynamic_det.transform import transform as dd_transform
+    from dynamic_det.optimize import optimize as dd_optimize
+except ImportError as e:
+    dd_transform = dd_optimize = _unavailable("dynamic_det", e)
+
+try:
+    from dynamic_rh.transform import transform as rh_transform
+    from dynamic_rh.optimize import optimize as rh_optimize
+    from dynamic_rh.optimize import first_decision_plan as rh_first_decision_plan
+except ImportError as e:
+    rh_transform = rh_optimize = rh_first_decision_plan = _unavailable("dynamic_rh", e)
+
+
+def _cfg_override(config, overrides):
+    """Return a copy of config with overrides applied.
+
+    Args:
+        overrides: {(section, ..., key): value}.
+
+    Only the dicts on each override path are copied; everything else is
+    shared with config, so the result must not be mutated further.
+    """
+    cfg = dict(config)
+    copied = set()
+    for path, value in overrides.items():
+        node = cfg
+        for depth, key in enumerate(path[:-1], 1):
+            if path[:depth] not in copied:
+                node[key] = dict(node[key])
+                copied.add(path[:depth])
+            node = node[key]
+        node[path[-1]] = value
+    return cfg
+
+
+def _write_timeseries(df, path):
+    """Write a simulated time series as CSV.
+
+    Written with DataFrame.to_csv: faster writers (e.g. pyarrow's) quote
+    the header and drop the ".0" of integral floats, so such columns
+    would read back as int64.  The format stays CSV (not Feather) because
+    compare.load_time_series() reads timeseries_*.csv.
+    """
+    df.to_csv(path, index=False)
+
+
+@contextlib.contextmanager
+def _open_hdf5(hdf5_path):
+    """Open hdf5_path read-only for the duration of one experiment.
+
+    The handle stands in for the path in transform(), simulate_voyage() and
+    the hdf5_io readers, so the file is opened once rather than per read.
+    Sweep workers open their own handle; none is held across a fork.
+    The handle uses hdf5_io's enlarged chunk cache.
+
+    There is deliberately no handle spanning a whole run_sensitivity():
+    its bound stages and sweep tasks run in separate processes, and an
+    h5py handle must not be shared across them.
+    """
+    f = open_read(hdf5_path)
+    try:
+        yield f
+    finally:
+        f.close()
+
+
+class _SweepReporter:
+    """Collects progress lines and prints them in one write.
+
+    Used as a context manager, the lines are flushed on exit (also when the
+    experiment raises).  Set live=True to print each line as it comes.
+    """
+
+    def __init__(self, live=False):
+        self.live = live
+        self.lines = []
+
+    def step(self, msg):
+        if self.live:
+            print(msg)
+        else:
+            self.lines.append(msg)
+
+    def flush(self):
+        if self.lines:
+            print("\n".join(self.lines))
+            self.lines = []
 
-def run_lower_bound(config, hdf5_path, output_dir):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        return False
+
+
+def _simulate_cached(schedule, hdf5_path, config, sample_hour=0,
+                     time_varying=False, use_cache=True, h5=None):
+    """simulate_voyage(...), reusing the result saved for identical inputs.
+
+    Cache files live in .sim_cache beside the HDF5 file as {hash}.pkl. The
+    hash covers the schedule, config["ship"] (the only section the
+    simulation reads), sample_hour, time_varying, and the HDF5 file and
+    the shared simulation/physics/hdf5_io sources, so a changed input is
+    re-run.  The directory keeps at most _SIM_CACHE_MAX_ENTRIES files
+    (least recently used go first); it is safe to delete at any time.
+
+    h5 is an open handle on hdf5_path (see _open_hdf5) to simulate from.
+
+    schedule is either a list of per-leg dicts or a dict of parallel arrays
+    (simulated with simulate_voyage_arrays).
+    """
+    source = hdf5_path if h5 is None else h5
+    if isinstance(schedule, dict):
+        simulate = simulate_voyage_arrays
+        key_schedule = {k: np.asarray(v).tolist() for k, v in schedule.items()}
+    else:
+        simulate = simulate_voyage
+        key_schedule = schedule
+    if not use_cache:
+        return simulate(schedule, source, config, sample_hour=sample_hour,
+                        time_varying=time_varying, metadata=_metadata(hdf5_path))
+
+    h = hashlib.blake2b(digest_size=16)
+    for src in (hdf5_path, simulation.__file__, physics.__file__, hdf5_io.__file__):
+        st = os.stat(src)
+        h.update(f"{st.st_mtime_ns}|{st.st_size}|".encode())
+    h.update(json.dumps([key_schedule, config["ship"], sample_hour, time_varying],
+                        sort_keys=True, default=str).encode())
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(hdf5_path)), _SIM_CACHE_DIR)
+    path = os.path.join(cache_dir, f"{h.hexdigest()}.pkl")
+    try:
+        with open(path, "rb") as f:
+            simulated = pickle.load(f)
+        os.utime(path)  # mark as recently used for _prune_sim_cache
+        return simulated
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, pickle.UnpicklingError) as e:
+        logger.warning("Ignoring unreadable simulation cache %s: %s", path, e)
+
+    simulated = simulate(schedule, source, config, sample_hour=sample_hour,
+                         time_varying=time_varying, metadata=_metadata(hdf5_path))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(simulated, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not cache simulation %s: %s", path, e)
+    _prune_sim_cache(cache_dir, _SIM_CACHE_MAX_ENTRIES)
+    return simulated
+
+
+def _prune_sim_cache(cache_dir, max_entries):
+    """Delete the least recently used .pkl files beyond max_entries."""
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pkl"):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                    except OSError:
+                        pass  # removed by a concurrent prune
+    except OSError:
+        return
+    if len(entries) <= max_entries:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - max_entries]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=8)
+def _cached_metadata(hdf5_path, mtime):
+    """read_metadata(hdf5_path) sorted by node_id, memoized per file version.
+
+    Callers pass os.path.getmtime(hdf5_path) so a rewritten file is re-read.
+    The frame is shared between callers: treat it as read-only.
+    """
+    return read_metadata(hdf5_path).sort_values("node_id").reset_index(drop=True)
+
+
+def _metadata(hdf5_path):
+    return _cached_metadata(hdf5_path, os.path.getmtime(hdf5_path))
+
+
+def _build_constant_sog_schedule(metadata, sog):
+    """Constant-SOG plan over every leg of the route.
+
+    Returns:
+        (legs, schedule): legs is a dict of parallel arrays for
+        simulate_voyage_arrays(); schedule is the same plan as per-leg dicts
+        for the result JSON.
+    """
+    node_ids = metadata["node_id"].to_numpy()
+    segs = metadata["segment"].to_numpy()
+    deltas = np.maximum(np.diff(metadata["distance_from_start_nm"].to_numpy()), _MIN_LEG_NM)
+    num_legs = len(deltas)
+    legs = {
+        "node_id": node_ids[:-1],
+        "segment": segs[:-1],
+        "sog_knots": np.full(num_legs, sog),
+        "sws_knots": np.full(num_legs, sog),  # reference only — simulation computes actual SWS
+        "distance_nm": deltas,
+    }
+    schedule = [{
+        "leg": i,
+        "node_id": int(node_ids[i]),
+        "segment": int(segs[i]),
+        "sog_knots": sog,
+        "sws_knots": sog,
+        "distance_nm": float(deltas[i]),
+    } for i in range(num_legs)]
+    return legs, schedule
+
+
+def run_lower_bound(config, hdf5_path, output_dir, use_cache=True):
     """Compute the theoretical lower bound: constant speed in calm water.
 
     Lower bound = FCR(V_const) * ETA, where V_const = total_distance / ETA.
@@ -28,17 +293,13 @@ def run_lower_bound(config, hdf5_path, output_dir):
 
     Also simulates the constant-SOG voyage under actual weather to show
     the gap between the analytical floor and real-world constant speed.
+    Nothing is optimized here; the one simulation is reused from the
+    .sim_cache on repeat runs (see _simulate_cached).
 
     Returns:
         Result dict (also saved as result_lower_bound.json).
     """
-    from shared.hdf5_io import read_metadata
-    from shared.physics import calculate_fuel_consumption_rate
-
-    metadata = read_metadata(hdf5_path)
-    metadata = metadata.sort_values("node_id").reset_index(drop=True)
-    num_nodes = len(metadata)
-    num_legs = num_nodes - 1
+    metadata = _metadata(hdf5_path)
 
     total_dist = metadata.iloc[-1]["distance_from_start_nm"]
     eta = config["ship"]["eta_hours"]
@@ -54,22 +315,12 @@ def run_lower_bound(config, hdf5_path, output_dir):
     print(f"    Fuel           = {analytical_fuel:.2f} mt")
 
     # --- Simulated constant-SOG voyage under actual weather ---
-    schedule = []
-    for i in range(num_legs):
-        node_a = metadata.iloc[i]
-        node_b = metadata.iloc[i + 1]
-        dist = node_b["distance_from_start_nm"] - node_a["distance_from_start_nm"]
-        schedule.append({
-            "leg": i,
-            "node_id": int(node_a["node_id"]),
-            "segment": int(node_a["segment"]),
-            "sog_knots": constant_sog,
-            "sws_knots": constant_sog,  # reference only — simulation computes actual SWS
-            "distance_nm": max(dist, 0.001),
-        })
+    legs, schedule = _build_constant_sog_schedule(metadata, constant_sog)
 
     print("--- Lower Bound: Simulate (constant SOG under actual weather) ---")
-    simulated = simulate_voyage(schedule, hdf5_path, config, sample_hour=0)
+    with _open_hdf5(hdf5_path) as h5:
+        simulated = _simulate_cached(legs, hdf5_path, config, sample_hour=0,
+                                     use_cache=use_cache, h5=h5)
 
     planned_stub = {
         "planned_fuel_mt": analytical_fuel,
@@ -81,7 +332,7 @@ def run_lower_bound(config, hdf5_path, output_dir):
     metrics = compute_result_metrics(planned_stub, simulated, total_dist)
 
     ts_path = os.path.join(output_dir, "timeseries_lower_bound.csv")
-    simulated["time_series"].to_csv(ts_path, index=False)
+    _write_timeseries(simulated.pop("time_series"), ts_path)
 
     result = build_result_json(
         approach="lower_bound",
@@ -101,7 +352,7 @@ def run_lower_bound(config, hdf5_path, output_dir):
     return result
 
 
-def run_upper_bound(config, hdf5_path, output_dir):
+def run_upper_bound(config, hdf5_path, output_dir, use_cache=True):
     """Simulate a constant-SOG voyage at max speed (no optimization).
 
     Uses max_speed as target SOG for all legs.  The ship adjusts SWS to
@@ -111,13 +362,7 @@ def run_upper_bound(config, hdf5_path, output_dir):
     Returns:
         Result dict (also saved as result_upper_bound.json).
     """
-    from shared.hdf5_io import read_metadata
-    from shared.physics import calculate_fuel_consumption_rate
-
-    metadata = read_metadata(hdf5_path)
-    metadata = metadata.sort_values("node_id").reset_index(drop=True)
-    num_nodes = len(metadata)
-    num_legs = num_nodes - 1
+    metadata = _metadata(hdf5_path)
 
     min_speed, max_speed = config["ship"]["speed_range_knots"]
     total_dist = metadata.iloc[-1]["distance_from_start_nm"]
@@ -128,22 +373,12 @@ def run_upper_bound(config, hdf5_path, output_dir):
     analytical_fuel = fcr_max * analytical_time
 
     # Build constant-SOG schedule at max speed
-    schedule = []
-    for i in range(num_legs):
-        node_a = metadata.iloc[i]
-        node_b = metadata.iloc[i + 1]
-        dist = node_b["distance_from_start_nm"] - node_a["distance_from_start_nm"]
-        schedule.append({
-            "leg": i,
-            "node_id": int(node_a["node_id"]),
-            "segment": int(node_a["segment"]),
-            "sog_knots": max_speed,
-            "sws_knots": max_speed,
-            "distance_nm": max(dist, 0.001),
-        })
+    legs, schedule = _build_constant_sog_schedule(metadata, max_speed)
 
     print("--- Upper Bound: Simulate (constant SOG = max speed) ---")
-    simulated = simulate_voyage(schedule, hdf5_path, config, sample_hour=0)
+    with _open_hdf5(hdf5_path) as h5:
+        simulated = _simulate_cached(legs, hdf5_path, config, sample_hour=0,
+                                     use_cache=use_cache, h5=h5)
 
     planned_stub = {
         "planned_fuel_mt": analytical_fuel,
@@ -155,7 +390,7 @@ def run_upper_bound(config, hdf5_path, output_dir):
     metrics = compute_result_metrics(planned_stub, simulated, total_dist)
 
     ts_path = os.path.join(output_dir, "timeseries_upper_bound.csv")
-    simulated["time_series"].to_csv(ts_path, index=False)
+    _write_timeseries(simulated.pop("time_series"), ts_path)
 
     result = build_result_json(
         approach="upper_bound",
@@ -189,30 +424,16 @@ def run_constant_speed_bound(config, hdf5_path, output_dir):
     Returns:
         Result dict (also saved as result_constant_speed_bound.json).
     """
-    import math
-    import pandas as pd
-    from shared.hdf5_io import read_metadata, read_actual
-    from shared.physics import (
-        calculate_ship_heading,
-        calculate_sws_from_sog,
-        calculate_speed_over_ground,
-        calculate_fuel_consumption_rate,
-        calculate_co2_emissions,
-        load_ship_parameters,
-    )
-
     ship_params = load_ship_parameters(config)
     eta = config["ship"]["eta_hours"]
     min_speed, max_speed = config["ship"]["speed_range_knots"]
 
-    metadata = read_metadata(hdf5_path)
-    metadata = metadata.sort_values("node_id").reset_index(drop=True)
+    metadata = _metadata(hdf5_path)
 
     weather = read_actual(hdf5_path, sample_hour=0)
     merged = metadata.merge(weather, on="node_id", how="left")
     merged = merged.sort_values("node_id").reset_index(drop=True)
 
-    num_nodes = len(merged)
     total_dist = merged.iloc[-1]["distance_from_start_nm"]
     initial_sog = total_dist / eta
 
@@ -229,10 +450,9 @@ def run_constant_speed_bound(config, hdf5_path, output_dir):
     cum_fuel = 0.0
     sws_violations = 0
 
-    for idx in range(num_nodes - 1):
-        node_a = merged.iloc[idx]
-        node_b = merged.iloc[idx + 1]
-
+    # Plain dicts per node: indexing them is far cheaper than merged.iloc[i]
+    nodes = merged.to_dict("records")
+    for node_a, node_b in zip(nodes, nodes[1:]):
         dist = node_b["distance_from_start_nm"] - node_a["distance_from_start_nm"]
         if dist <= 0:
             continue
@@ -324,7 +544,6 @@ def run_constant_speed_bound(config, hdf5_path, output_dir):
             "heading_deg": heading_deg,
         })
 
-    time_series = pd.DataFrame(rows)
     co2 = calculate_co2_emissions(cum_fuel)
 
     # Build result using standard helpers
@@ -335,7 +554,7 @@ def run_constant_speed_bound(config, hdf5_path, output_dir):
         "speed_changes": 0,
         "sws_violations": sws_violations,
         "co2_emissions_mt": co2,
-        "time_series": time_series,
+        "time_series": pd.DataFrame(rows),
     }
 
     planned_stub = {
@@ -348,7 +567,7 @@ def run_constant_speed_bound(config, hdf5_path, output_dir):
     metrics = compute_result_metrics(planned_stub, simulated, total_dist)
 
     ts_path = os.path.join(output_dir, "timeseries_constant_speed_bound.csv")
-    time_series.to_csv(ts_path, index=False)
+    _write_timeseries(simulated.pop("time_series"), ts_path)
 
     result = build_result_json(
         approach="constant_speed_bound",
@@ -368,7 +587,7 @@ def run_constant_speed_bound(config, hdf5_path, output_dir):
 
 
 def _feasible_sog_bounds(hdf5_path, seg_idx, sample_hours_range,
-                         ship_params, heading_rad):
+                         ship_params, heading_rad, h5=None):
     """Find the feasible SOG band for a segment across all waypoints and hours.
 
     Ceiling: min SOG at SWS=max_speed across all (waypoint, hour) pairs.
@@ -376,21 +595,19 @@ def _feasible_sog_bounds(hdf5_path, seg_idx, sample_hours_range,
     Floor:   max SOG at SWS=min_speed across all (waypoint, hour) pairs.
              Any committed SOG below this causes min-speed violations.
 
+    h5 is an open handle on hdf5_path to read the weather from.
+
     Returns:
         (sog_floor, sog_ceiling)
     """
-    import math
-    from shared.hdf5_io import read_metadata, read_actual
-    from shared.physics import calculate_speed_over_ground
-
-    metadata = read_metadata(hdf5_path)
+    metadata = _metadata(hdf5_path)
     max_sws = ship_params["max_speed"]
     min_sws = ship_params["min_speed"]
     sog_ceiling = float("inf")
     sog_floor = 0.0
 
     for sh in sample_hours_range:
-        wx = read_actual(hdf5_path, sample_hour=sh)
+        wx = read_actual(hdf5_path if h5 is None else h5, sample_hour=sh)
         merged = metadata[["node_id", "segment"]].merge(wx, on="node_id", how="left")
         seg_nodes = merged[merged["segment"] == seg_idx]
 
@@ -436,7 +653,7 @@ def _feasible_sog_bounds(hdf5_path, seg_idx, sample_hours_range,
     return sog_floor, sog_ceiling
 
 
-def run_rolling_lp(config, hdf5_path, output_dir):
+def run_rolling_lp(config, hdf5_path, output_dir, use_cache=True):
     """Rolling LP: re-solve the LP at each segment boundary with fresh weather.
 
     At each segment, re-run transform with the actual weather closest to the
@@ -450,261 +667,458 @@ def run_rolling_lp(config, hdf5_path, output_dir):
     Returns:
         Result dict (also saved as result_rolling_lp.json).
     """
-    from static_det.transform import transform
-    from static_det.optimize import optimize
-    from shared.hdf5_io import get_completed_runs
-    from shared.physics import load_ship_parameters
+    with _open_hdf5(hdf5_path) as h5, _SweepReporter() as report:
+        available_hours = get_completed_runs(h5)
+        if not available_hours:
+            logger.warning("Rolling LP: no sample hours in HDF5")
+            return None
+
+        eta = config["ship"]["eta_hours"]
+        sd_cfg = config["static_det"]
+        num_segments = sd_cfg["segments"]
+        ship_params = load_ship_parameters(config)
+
+        committed = []  # one entry per segment: {segment, sws_knots, sog_knots, ...}
+        cum_time = 0.0
+        cum_fuel = 0.0
+        cum_dist = 0.0
+        hours_used = []
+
+        report.step(f"  Rolling LP: {num_segments} segments, ETA={eta} h, "
+                    f"available sample hours: {available_hours}")
+
+        for seg_idx in range(num_segments):
+            # Pick closest sample_hour <= cum_time (or smallest available)
+            candidates = [h for h in available_hours if h <= cum_time]
+            sample_hour = max(candidates) if candidates else available_hours[0]
+            hours_used.append(sample_hour)
+
+            # Override the weather snapshot on a copy of config
+            cfg = _cfg_override(config, {("static_det", "weather_snapshot"): sample_hour})
+
+            # Transform with fresh weather
+            t_out = lp_transform(h5, cfg, metadata=_metadata(hdf5_path))
+
+            # Slice to remaining segments [seg_idx : num_segments]
+            remaining_eta = eta - cum_time
+            remaining_segments = num_segments - seg_idx
+            t_sub = {
+                "ETA": remaining_eta,
+                "num_segments": remaining_segments,
+                "num_speeds": t_out["num_speeds"],
+                "distances": t_out["distances"][seg_idx:],
+                "speeds": t_out["speeds"],
+                "fcr": t_out["fcr"],
+                "sog_matrix": t_out["sog_matrix"][seg_idx:],
+                "sog_lower": t_out["sog_lower"][seg_idx:],
+                "sog_upper": t_out["sog_upper"][seg_idx:],
+            }
+
+            # Solve LP for remaining segments
+            planned = lp_optimize(t_sub, cfg)
+
+            if planned.get("status") != "Optimal":
+                # Fallback: max speed for this segment
+                max_speed = config["ship"]["speed_range_knots"][1]
+                # Use the SOG at max speed from the transform output
+                max_sog = t_out["sog_matrix"][seg_idx][-1]  # last speed = max
+                max_fcr = t_out["fcr"][-1]
+                seg_dist = t_out["distances"][seg_idx]
+                seg_time = seg_dist / max_sog
+                logger.warning("Rolling LP seg %d: infeasible (remaining_eta=%.1f h), "
+                               "using max speed", seg_idx, remaining_eta)
+                committed.append({
+                    "segment": seg_idx,
+                    "sws_knots": t_out["speeds"][-1],
+                    "sog_knots": max_sog,
+                    "distance_nm": seg_dist,
+                    "time_h": seg_time,
+                    "fuel_mt": seg_dist * max_fcr / max_sog,
+                    "fcr_mt_h": max_fcr,
+                })
+                cum_time += seg_time
+            else:
+                # Commit only the first segment from this re-solve
+                first = planned["speed_schedule"][0]
+
+                # Post-solve clamp: cap SOG at the worst-case feasibility ceiling
+                # to prevent SWS violations from within-segment weather variability
+                # and time-varying weather during transit.
+                _meta = _metadata(hdf5_path)
+                _orig = _meta[_meta["is_original"]].reset_index(drop=True)
+                _wp_a, _wp_b = _orig.iloc[seg_idx], _orig.iloc[seg_idx + 1]
+                _heading_rad = math.radians(calculate_ship_heading(
+                    _wp_a["lat"], _wp_a["lon"], _wp_b["lat"], _wp_b["lon"]))
+
+                min_speed = config["ship"]["speed_range_knots"][0]
+                seg_dist = first["distance_nm"]
+                max_seg_time = seg_dist / min_speed
+                w_start = int(cum_time)
+                w_end = min(int(cum_time + max_seg_time) + 1, max(available_hours))
+                transit_hours = [h for h in available_hours if w_start <= h <= w_end]
+                if not transit_hours:
+                    transit_hours = [sample_hour]
+
+                sog_floor, sog_ceiling = _feasible_sog_bounds(
+                    hdf5_path, seg_idx, transit_hours, ship_params, _heading_rad,
+                    h5=h5)
+
+                committed_sog = first["sog_knots"]
+                if committed_sog > sog_ceiling:
+                    logger.info("Rolling LP seg %d: clamping SOG %.4f -> %.4f "
+                                "(max-speed ceiling)", seg_idx, committed_sog, sog_ceiling)
+                    committed_sog = sog_ceiling
+                elif committed_sog < sog_floor:
+                    logger.info("Rolling LP seg %d: raising SOG %.4f -> %.4f "
+                                "(min-speed floor)", seg_idx, committed_sog, sog_floor)
+                    committed_sog = sog_floor
+
+                seg_time = seg_dist / committed_sog
+                committed.append({
+                    "segment": seg_idx,
+                    "sws_knots": first["sws_knots"],
+                    "sog_knots": committed_sog,
+                    "distance_nm": seg_dist,
+                    "time_h": seg_time,
+                    "fuel_mt": first["fcr_mt_h"] * seg_time,
+                    "fcr_mt_h": first["fcr_mt_h"],
+                })
+                cum_time += seg_time
+
+            cum_fuel += committed[-1]["fuel_mt"]
+            cum_dist += committed[-1]["distance_nm"]
+            report.step(f"    Seg {seg_idx}: sample_hour={sample_hour}, "
+                        f"SWS={committed[-1]['sws_knots']:.2f} kn, "
+                        f"SOG={committed[-1]['sog_knots']:.2f} kn, "
+                        f"cum_time={cum_time:.1f} h")
+
+        # Planned totals, accumulated segment by segment above
+        planned_fuel = cum_fuel
+        planned_time = cum_time
+
+        report.step(f"  Rolling LP planned: {planned_fuel:.2f} mt fuel, {planned_time:.2f} h")
+        report.step(f"  Sample hours used per segment: {hours_used}")
+
+        # Simulate under actual weather (time_varying=True, same as run_exp_b.py)
+        report.step("  Simulate (actual weather, time-varying)...")
+        simulated = _simulate_cached(committed, hdf5_path, config,
+                                     sample_hour=0, time_varying=True,
+                                     use_cache=use_cache, h5=h5)
+
+        total_dist = cum_dist
+        planned_stub = {
+            "planned_fuel_mt": planned_fuel,
+            "planned_time_h": planned_time,
+            "speed_schedule": committed,
+            "computation_time_s": 0.0,
+            "status": "Optimal",
+        }
+        metrics = compute_result_metrics(planned_stub, simulated, total_dist)
 
-    available_hours = get_completed_runs(hdf5_path)
-    if not available_hours:
-        logger.warning("Rolling LP: no sample hours in HDF5")
-        return None
+        ts_path = os.path.join(output_dir, "timeseries_rolling_lp.csv")
+        _write_timeseries(simulated.pop("time_series"), ts_path)
 
-    eta = config["ship"]["eta_hours"]
-    sd_cfg = config["static_det"]
-    num_segments = sd_cfg["segments"]
-    ship_params = load_ship_parameters(config)
+        result = build_result_json(
+            approach="rolling_lp",
+            config=config,
+            planned=planned_stub,
+            simulated=simulated,
+            metrics=metrics,
+            time_series_file=ts_path,
+        )
+        result["sample_hours_per_segment"] = hours_used
+        json_path = os.path.join(output_dir, "result_rolling_lp.json")
+        save_result(result, json_path)
 
-    committed = []  # one entry per segment: {segment, sws_knots, sog_knots, ...}
-    cum_time = 0.0
-    hours_used = []
-
-    print(f"  Rolling LP: {num_segments} segments, ETA={eta} h, "
-          f"available sample hours: {available_hours}")
-
-    for seg_idx in range(num_segments):
-        # Pick closest sample_hour <= cum_time (or smallest available)
-        candidates = [h for h in available_hours if h <= cum_time]
-        sample_hour = max(candidates) if candidates else available_hours[0]
-        hours_used.append(sample_hour)
-
-        # Deep-copy config and override weather snapshot
-        cfg = copy.deepcopy(config)
-        cfg["static_det"]["weather_snapshot"] = sample_hour
-
-        # Transform with fresh weather
-        t_out = transform(hdf5_path, cfg)
-
-        # Slice to remaining segments [seg_idx : num_segments]
-        remaining_eta = eta - cum_time
-        remaining_segments = num_segments - seg_idx
-        t_sub = {
-            "ETA": remaining_eta,
-            "num_segments": remaining_segments,
-            "num_speeds": t_out["num_speeds"],
-            "distances": t_out["distances"][seg_idx:],
-            "speeds": t_out["speeds"],
-            "fcr": t_out["fcr"],
-            "sog_matrix": t_out["sog_matrix"][seg_idx:],
-            "sog_lower": t_out["sog_lower"][seg_idx:],
-            "sog_upper": t_out["sog_upper"][seg_idx:],
-        }
+        report.step(f"  Rolling LP: plan={planned_fuel:.2f} mt, "
+                    f"sim={simulated['total_fuel_mt']:.2f} mt, "
+                    f"gap={metrics['fuel_gap_percent']:.2f}%, "
+                    f"SWS violations={simulated.get('sws_violations', 0)}")
+        return result
 
-        # Solve LP for remaining segments
-        planned = optimize(t_sub, cfg)
-
-        if planned.get("status") != "Optimal":
-            # Fallback: max speed for this segment
-            max_speed = config["ship"]["speed_range_knots"][1]
-            # Use the SOG at max speed from the transform output
-            max_sog = t_out["sog_matrix"][seg_idx][-1]  # last speed = max
-            max_fcr = t_out["fcr"][-1]
-            seg_dist = t_out["distances"][seg_idx]
-            seg_time = seg_dist / max_sog
-            logger.warning("Rolling LP seg %d: infeasible (remaining_eta=%.1f h), "
-                           "using max speed", seg_idx, remaining_eta)
-            committed.append({
-                "segment": seg_idx,
-                "sws_knots": t_out["speeds"][-1],
-                "sog_knots": max_sog,
-                "distance_nm": seg_dist,
-                "time_h": seg_time,
-                "fuel_mt": seg_dist * max_fcr / max_sog,
-                "fcr_mt_h": max_fcr,
-            })
-            cum_time += seg_time
-        else:
-            # Commit only the first segment from this re-solve
-            first = planned["speed_schedule"][0]
-
-            # Post-solve clamp: cap SOG at the worst-case feasibility ceiling
-            # to prevent SWS violations from within-segment weather variability
-            # and time-varying weather during transit.
-            import math as _math
-            from shared.hdf5_io import read_metadata as _read_meta
-            from shared.physics import calculate_ship_heading as _calc_heading
-
-            _meta = _read_meta(hdf5_path)
-            _orig = _meta[_meta["is_original"]].sort_values("node_id").reset_index(drop=True)
-            _wp_a, _wp_b = _orig.iloc[seg_idx], _orig.iloc[seg_idx + 1]
-            _heading_rad = _math.radians(_calc_heading(
-                _wp_a["lat"], _wp_a["lon"], _wp_b["lat"], _wp_b["lon"]))
-
-            min_speed = config["ship"]["speed_range_knots"][0]
-            seg_dist = first["distance_nm"]
-            max_seg_time = seg_dist / min_speed
-            w_start = int(cum_time)
-            w_end = min(int(cum_time + max_seg_time) + 1, max(available_hours))
-            transit_hours = [h for h in available_hours if w_start <= h <= w_end]
-            if not transit_hours:
-                transit_hours = [sample_hour]
-
-            sog_floor, sog_ceiling = _feasible_sog_bounds(
-                hdf5_path, seg_idx, transit_hours, ship_params, _heading_rad)
-
-            committed_sog = first["sog_knots"]
-            if committed_sog > sog_ceiling:
-                logger.info("Rolling LP seg %d: clamping SOG %.4f -> %.4f "
-                            "(max-speed ceiling)", seg_idx, committed_sog, sog_ceiling)
-                committed_sog = sog_ceiling
-            elif committed_sog < sog_floor:
-                logger.info("Rolling LP seg %d: raising SOG %.4f -> %.4f "
-                            "(min-speed floor)", seg_idx, committed_sog, sog_floor)
-                committed_sog = sog_floor
-
-            seg_time = seg_dist / committed_sog
-            committed.append({
-                "segment": seg_idx,
-                "sws_knots": first["sws_knots"],
-                "sog_knots": committed_sog,
-                "distance_nm": seg_dist,
-                "time_h": seg_time,
-                "fuel_mt": first["fcr_mt_h"] * seg_time,
-                "fcr_mt_h": first["fcr_mt_h"],
-            })
-            cum_time += seg_time
-
-        print(f"    Seg {seg_idx}: sample_hour={sample_hour}, "
-              f"SWS={committed[-1]['sws_knots']:.2f} kn, "
-              f"SOG={committed[-1]['sog_knots']:.2f} kn, "
-              f"cum_time={cum_time:.1f} h")
-
-    # Planned totals
-    planned_fuel = sum(c["fuel_mt"] for c in committed)
-    planned_time = sum(c["time_h"] for c in committed)
-
-    print(f"  Rolling LP planned: {planned_fuel:.2f} mt fuel, {planned_time:.2f} h")
-    print(f"  Sample hours used per segment: {hours_used}")
-
-    # Simulate under actual weather (time_varying=True, same as run_exp_b.py)
-    print("  Simulate (actual weather, time-varying)...")
-    simulated = simulate_voyage(committed, hdf5_path, config,
-                                sample_hour=0, time_varying=True)
-
-    total_dist = sum(c["distance_nm"] for c in committed)
-    planned_stub = {
-        "planned_fuel_mt": planned_fuel,
-        "planned_time_h": planned_time,
-        "speed_schedule": committed,
-        "computation_time_s": 0.0,
-        "status": "Optimal",
-    }
-    metrics = compute_result_metrics(planned_stub, simulated, total_dist)
 
-    ts_path = os.path.join(output_dir, "timeseries_rolling_lp.csv")
-    simulated["time_series"].to_csv(ts_path, index=False)
+def _process_map(fn, items, *args):
+    """Return [fn(item, *args) for item in items], one process per item.
+
+    Workers are capped at the CPU count; results keep the order of items.
+    Whole sweep iterations run concurrently, so one iteration's optimize
+    already overlaps another's simulate without staging them separately.
+    With a single worker the items run in this process instead.
+    """
+    if not items:
+        return []
+    n = len(items)
+    workers = min(n, os.cpu_count() or 1)
+    if workers == 1:
+        return [fn(item, *args) for item in items]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fn, items, *[[a] * n for a in args]))
+
+
+def _run_plan_and_simulate(approach_name, cfg, hdf5_path, output_dir,
+                           transform_fn, optimize_fn, sample_hour=0,
+                           extra_result_fields=None, decision_points=False,
+                           accept=("Optimal", "Feasible"), steps=None,
+                           log=print, use_cache=True, h5=None, t_out=None,
+                           save=True):
+    """Transform, optimize and simulate one approach, then save its result.
+
+    Writes timeseries_{approach_name}.csv and (when save is set)
+    result_{approach_name}.json to output_dir.
+
+    Args:
+        extra_result_fields: Extra keys added to the result dict.
+        decision_points: Copy the optimizer's decision_points into the result.
+        accept: Solver statuses that count as a usable plan.
+        steps: Progress messages for the transform, optimize and simulate
+            stages.  Default: "  Transform...", "  Optimize...", "  Simulate...".
+        log: Callable receiving the progress messages.
+        h5: Open handle on hdf5_path (see _open_hdf5) to read from.
+        t_out: transform_fn output computed by the caller; skips the
+            transform stage.
+
+    Returns:
+        (planned, simulated, result); simulated and result are None when
+        the solver status is not in accept.  simulated no longer holds the
+        time_series frame, which is only kept on disk.
+    """
+    transform_msg, optimize_msg, simulate_msg = steps or (
+        "  Transform...", "  Optimize...", "  Simulate...")
+
+    if t_out is None:
+        log(transform_msg)
+        t_out = transform_fn(hdf5_path if h5 is None else h5, cfg,
+                             metadata=_metadata(hdf5_path))
+
+    log(optimize_msg)
+    planned = optimize_fn(t_out, cfg)
+    if planned.get("status") not in accept:
+        return planned, None, None
+
+    # Only the route length is needed from the transform output; drop it
+    # (its weather grids can be large) before simulating.
+    total_dist = float(np.sum(t_out["distances"]))
+    del t_out
+
+    log(simulate_msg)
+    simulated = _simulate_cached(
+        planned["speed_schedule"], hdf5_path, cfg,
+        sample_hour=sample_hour,
+        use_cache=use_cache,
+        h5=h5,
+    )
+
+    # Three scalar ratios over the simulation totals -- no per-leg work, so
+    # nothing here is worth JIT-compiling.
+    metrics = compute_result_metrics(planned, simulated, total_dist)
+
+    ts_path = os.path.join(output_dir, f"timeseries_{approach_name}.csv")
+    _write_timeseries(simulated.pop("time_series"), ts_path)
 
     result = build_result_json(
-        approach="rolling_lp",
-        config=config,
-        planned=planned_stub,
+        approach=approach_name,
+        config=cfg,
+        planned=planned,
         simulated=simulated,
         metrics=metrics,
         time_series_file=ts_path,
     )
-    result["sample_hours_per_segment"] = hours_used
-    json_path = os.path.join(output_dir, "result_rolling_lp.json")
-    save_result(result, json_path)
+    if decision_points:
+        result["decision_points"] = planned.get("decision_points", [])
+    if extra_result_fields:
+        result.update(extra_result_fields)
+    if save:
+        save_result(result, os.path.join(output_dir, f"result_{approach_name}.json"))
+    return planned, simulated, result
 
-    print(f"  Rolling LP: plan={planned_fuel:.2f} mt, "
-          f"sim={simulated['total_fuel_mt']:.2f} mt, "
-          f"gap={metrics['fuel_gap_percent']:.2f}%, "
-          f"SWS violations={simulated.get('sws_violations', 0)}")
-    return result
+
+def _replan_sweep_one(freq, config, hdf5_path, output_dir, t_out, first_plan,
+                      use_cache=True, per_file=True):
+    """Optimize and simulate one replan frequency (runs in a worker process).
+
+    t_out is the rh_transform output shared by every frequency, and
+    first_plan the shared first-decision DP result (None to solve it
+    here).  The HDF5
+    file is opened once inside the worker, so no file handle is shared
+    with the parent.  Progress lines
+    are returned rather than printed so the parent can emit them in order.
+
+    Returns:
+        (status, lines, result) -- result is None when the plan failed.
+    """
+    cfg = _cfg_override(config, {("dynamic_rh", "replan_frequency_hours"): freq})
+    approach_name = f"dynamic_rh_replan_{freq}h"
+
+    lines = [f"\n--- Replan Sweep: freq={freq}h ---"]
+    with _open_hdf5(hdf5_path) as h5:
+        planned, simulated, result = _run_plan_and_simulate(
+            approach_name, cfg, hdf5_path, output_dir, rh_transform,
+            partial(rh_optimize, first_dp_result=first_plan),
+            decision_points=True,
+            steps=("  Transform...", f"  Optimize (RH, replan every {freq}h)...", "  Simulate..."),
+            log=lines.append, use_cache=use_cache, h5=h5, t_out=t_out,
+            save=per_file,
+        )
+    if result is not None:
+        lines.append(f"  {approach_name}: {simulated['total_fuel_mt']:.2f} mt fuel, "
+                     f"{simulated['total_time_h']:.2f} h")
+    return planned.get("status"), lines, result
 
 
-def run_replan_sweep(config, hdf5_path, output_dir, frequencies=None):
+def run_replan_sweep(config, hdf5_path, output_dir, frequencies=None, use_cache=True,
+                     per_file=True):
     """Run rolling horizon at multiple replan frequencies.
 
+    Frequencies are independent, so each one runs in its own process.
+    The replan frequency only affects the optimizer, so the transform runs
+    once and its output is shared by all frequencies, as is the DP solve
+    for the first decision point (unless use_actual_at_replan is set).
+
     Args:
         frequencies: List of replan frequencies in hours.
             Default: [3, 6, 12, 24, 48]
+        per_file: Save each result as result_dynamic_rh_replan_{freq}h.json
+            (the files compare.py loads).  False writes all of them to a
+            single results_replan_sweep.json instead.
 
     Returns:
-        List of result dicts (each also saved as result_dynamic_rh_replan_{freq}h.json).
+        List of result dicts.
     """
-    from dynamic_rh.transform import transform
-    from dynamic_rh.optimize import optimize
-
     if frequencies is None:
         frequencies = [3, 6, 12, 24, 48]
 
     results = []
-    for freq in frequencies:
-        cfg = copy.deepcopy(config)
-        cfg["dynamic_rh"]["replan_frequency_hours"] = freq
-        approach_name = f"dynamic_rh_replan_{freq}h"
-
-        print(f"\n--- Replan Sweep: freq={freq}h ---")
-
-        print(f"  Transform...")
-        t_out = transform(hdf5_path, cfg)
-
-        print(f"  Optimize (RH, replan every {freq}h)...")
-        planned = optimize(t_out, cfg)
-        if planned.get("status") not in ("Optimal", "Feasible"):
-            logger.warning("Replan sweep freq=%d: status=%s", freq, planned.get("status"))
+    report = _SweepReporter()
+    if not frequencies:
+        return results
+    print("  Transform (shared by all replan frequencies)...")
+    with _open_hdf5(hdf5_path) as h5:
+        t_out = rh_transform(h5, config, metadata=_metadata(hdf5_path))
+    first_plan = None
+    if not config["dynamic_rh"].get("use_actual_at_replan", False):
+        first_plan = rh_first_decision_plan(t_out, config)
+    outcomes = _process_map(_replan_sweep_one, frequencies, config, hdf5_path,
+                            output_dir, t_out, first_plan, use_cache, per_file)
+    for freq, (status, lines, result) in zip(frequencies, outcomes):
+        report.step("\n".join(lines))
+        if result is None:
+            logger.warning("Replan sweep freq=%d: status=%s", freq, status)
             continue
+        results.append(result)
 
-        print(f"  Simulate...")
-        simulated = simulate_voyage(
-            planned["speed_schedule"], hdf5_path, cfg,
-            sample_hour=0,
-        )
-
-        total_dist = sum(t_out["distances"])
-        metrics = compute_result_metrics(planned, simulated, total_dist)
-
-        ts_path = os.path.join(output_dir, f"timeseries_{approach_name}.csv")
-        simulated["time_series"].to_csv(ts_path, index=False)
+    report.flush()
+    if not per_file:
+        save_result({"runs": results}, os.path.join(output_dir, "results_replan_sweep.json"))
+    return results
 
-        result = build_result_json(
-            approach=approach_name,
-            config=cfg,
-            planned=planned,
-            simulated=simulated,
-            metrics=metrics,
-            time_series_file=ts_path,
-        )
-        result["decision_points"] = planned.get("decision_points", [])
-        json_path = os.path.join(output_dir, f"result_{approach_name}.json")
-        save_result(result, json_path)
 
-        print(f"  {approach_name}: {simulated['total_fuel_mt']:.2f} mt fuel, "
-              f"{simulated['total_time_h']:.2f} h")
-        results.append(result)
+def _horizon_sweep_one(task, config, hdf5_path, output_dir, relaxed_eta,
+                       use_cache=True, per_file=True):
+    """Plan and simulate one (horizon, arm) pair (runs in a worker process).
 
-    return results
+    Args:
+        task: (kind, horizon, approach_name, header, ratio) where kind is
+            "dd" (Dynamic Det) or "rh" (Rolling Horizon) and ratio is the
+            horizon as a percentage of the voyage (None for the long route).
 
+    Returns:
+        (status, lines, result) -- result is None when the plan failed.
+    """
+    kind, horizon, approach_name, header, ratio = task
+    if kind == "dd":
+        transform, optimize = dd_transform, dd_optimize
+    else:
+        transform, optimize = rh_transform, rh_optimize
+
+    cfg = _cfg_override(config, {
+        ("dynamic_det", "max_forecast_horizon"): horizon,
+        ("ship", "eta_hours"): relaxed_eta,
+    })
+
+    lines = [header]
+    with _open_hdf5(hdf5_path) as h5:
+        planned, simulated, result = _run_plan_and_simulate(
+            approach_name, cfg, hdf5_path, output_dir, transform, optimize,
+            sample_hour=cfg["dynamic_det"]["forecast_origin"] if kind == "dd" else 0,
+            extra_result_fields=None if ratio is None else {"horizon_ratio_pct": round(ratio, 1)},
+            decision_points=kind == "rh",
+            steps=("  Transform...",
+                   f"  Optimize ({'DP' if kind == 'dd' else 'RH'}, horizon={horizon}h)...",
+                   "  Simulate..."),
+            log=lines.append, use_cache=use_cache, h5=h5, save=per_file,
+        )
+    if result is not None and ratio is None:
+        lines.append(f"  {approach_name}: {simulated['total_fuel_mt']:.2f} mt fuel")
+    elif result is not None:
+        lines.append(f"  {approach_name}: {simulated['total_fuel_mt']:.2f} mt, "
+                     f"ratio={ratio:.0f}%")
+    return planned.get("status"), lines, result
+
+
+def _run_horizon_tasks(tasks, config, hdf5_path, output_dir, relaxed_eta, use_cache,
+                       per_file=True):
+    """Run horizon sweep tasks longest horizon first (see _process_map).
+
+    Tasks are submitted in windows of one task per worker, so all CPUs
+    stay busy across horizons.  Once both arms fail at some horizon,
+    shorter horizons are assumed to fail too (a shorter forecast only
+    loses weather windows): no further windows are submitted, and
+    outcomes of shorter horizons that already ran in the same window are
+    dropped, so the skipped set does not depend on CPU count or timing.
+
+    There is no distance/speed pre-check before optimizing: the horizon
+    caps the forecast range, not the voyage time, and currents or
+    following seas can lift SOG above the maximum SWS, so such a test is
+    not a safe infeasibility bound.
 
-def run_horizon_sweep(config, hdf5_path, output_dir, horizons=None):
+    Returns:
+        One (status, lines, result) per task, in task order; None for a
+        skipped task.
+    """
+    if not tasks:
+        return []
+    order = sorted(range(len(tasks)), key=lambda i: -tasks[i][1])
+    window = min(len(tasks), os.cpu_count() or 1)
+    outcomes = [None] * len(tasks)
+    failures = {}
+    for start in range(0, len(order), window):
+        batch = order[start:start + window]
+        batch_outcomes = _process_map(_horizon_sweep_one, [tasks[i] for i in batch], config,
+                                      hdf5_path, output_dir, relaxed_eta, use_cache, per_file)
+        for i, outcome in zip(batch, batch_outcomes):
+            outcomes[i] = outcome
+            if outcome[2] is None:
+                failures[tasks[i][1]] = failures.get(tasks[i][1], 0) + 1
+        failed = [h for h, count in failures.items() if count >= 2]
+        if failed:
+            cutoff = max(failed)
+            logger.warning("Horizon %dh infeasible for both approaches, "
+                           "skipping shorter horizons", cutoff)
+            for i, task in enumerate(tasks):
+                if task[1] < cutoff:
+                    outcomes[i] = None
+            break
+    return outcomes
+
+
+def run_horizon_sweep(config, hdf5_path, output_dir, horizons=None, use_cache=True,
+                      per_file=True):
     """Run dynamic_det and dynamic_rh at multiple forecast horizons.
 
     Truncates forecast data to simulate having shorter-range forecasts
-    (e.g. 3-day or 5-day instead of 7-day).
+    (e.g. 3-day or 5-day instead of 7-day).  Every (horizon, approach)
+    pair is independent and runs in its own process.  Once a horizon is
+    infeasible for both approaches, shorter horizons are skipped.
 
     Args:
         horizons: List of forecast horizon caps in hours.
             Default: [72, 120, 168] (3, 5, 7 days)
+        per_file: Save one result_{approach}.json per run; False writes
+            them all to results_horizon_sweep.json instead.
 
     Returns:
         List of result dicts.
     """
-    from dynamic_det.transform import transform as dd_transform
-    from dynamic_det.optimize import optimize as dd_optimize
-    from dynamic_rh.transform import transform as rh_transform
-    from dynamic_rh.optimize import optimize as rh_optimize
-
     if horizons is None:
         horizons = [72, 120, 168]
 
@@ -714,102 +1128,37 @@ def run_horizon_sweep(config, hdf5_path, output_dir, horizons=None):
     nominal_eta = config["ship"]["eta_hours"]
     relaxed_eta = int(nominal_eta * 1.02)
 
-    results = []
+    tasks = []
     for horizon in horizons:
         days = horizon / 24
+        tasks.append(("dd", horizon, f"dynamic_det_horizon_{horizon}h",
+                      f"\n--- Horizon Sweep: {horizon}h ({days:.0f}d) — Dynamic Det ---", None))
+        tasks.append(("rh", horizon, f"dynamic_rh_horizon_{horizon}h",
+                      f"\n--- Horizon Sweep: {horizon}h ({days:.0f}d) — Rolling Horizon ---", None))
 
-        # --- Dynamic Det at this horizon ---
-        cfg = copy.deepcopy(config)
-        cfg["dynamic_det"]["max_forecast_horizon"] = horizon
-        cfg["ship"]["eta_hours"] = relaxed_eta
-        approach_name = f"dynamic_det_horizon_{horizon}h"
-
-        print(f"\n--- Horizon Sweep: {horizon}h ({days:.0f}d) — Dynamic Det ---")
-
-        print(f"  Transform...")
-        t_out = dd_transform(hdf5_path, cfg)
-
-        print(f"  Optimize (DP, horizon={horizon}h)...")
-        planned = dd_optimize(t_out, cfg)
-        if planned.get("status") not in ("Optimal", "Feasible"):
-            logger.warning("Horizon sweep %dh dynamic_det: status=%s",
-                           horizon, planned.get("status"))
-        else:
-            print(f"  Simulate...")
-            simulated = simulate_voyage(
-                planned["speed_schedule"], hdf5_path, cfg,
-                sample_hour=cfg["dynamic_det"]["forecast_origin"],
-            )
-
-            total_dist = sum(t_out["distances"])
-            metrics = compute_result_metrics(planned, simulated, total_dist)
-
-            ts_path = os.path.join(output_dir, f"timeseries_{approach_name}.csv")
-            simulated["time_series"].to_csv(ts_path, index=False)
-
-            result = build_result_json(
-                approach=approach_name,
-                config=cfg,
-                planned=planned,
-                simulated=simulated,
-                metrics=metrics,
-                time_series_file=ts_path,
-            )
-            json_path = os.path.join(output_dir, f"result_{approach_name}.json")
-            save_result(result, json_path)
-
-            print(f"  {approach_name}: {simulated['total_fuel_mt']:.2f} mt fuel")
-            results.append(result)
-
-        # --- Rolling Horizon at this horizon ---
-        cfg_rh = copy.deepcopy(config)
-        cfg_rh["dynamic_det"]["max_forecast_horizon"] = horizon
-        cfg_rh["ship"]["eta_hours"] = relaxed_eta
-        approach_name_rh = f"dynamic_rh_horizon_{horizon}h"
-
-        print(f"\n--- Horizon Sweep: {horizon}h ({days:.0f}d) — Rolling Horizon ---")
-
-        print(f"  Transform...")
-        t_out_rh = rh_transform(hdf5_path, cfg_rh)
-
-        print(f"  Optimize (RH, horizon={horizon}h)...")
-        planned_rh = rh_optimize(t_out_rh, cfg_rh)
-        if planned_rh.get("status") not in ("Optimal", "Feasible"):
-            logger.warning("Horizon sweep %dh dynamic_rh: status=%s",
-                           horizon, planned_rh.get("status"))
+    results = []
+    report = _SweepReporter()
+    outcomes = _run_horizon_tasks(tasks, config, hdf5_path, output_dir, relaxed_eta,
+                                  use_cache, per_file)
+    for (kind, horizon, _, header, _), outcome in zip(tasks, outcomes):
+        if outcome is None:
+            report.step(f"{header}\n  Skipped: infeasible at a longer horizon")
             continue
+        status, lines, result = outcome
+        report.step("\n".join(lines))
+        if result is None:
+            logger.warning("Horizon sweep %dh %s: status=%s", horizon,
+                           "dynamic_det" if kind == "dd" else "dynamic_rh", status)
+            continue
+        results.append(result)
 
-        print(f"  Simulate...")
-        simulated_rh = simulate_voyage(
-            planned_rh["speed_schedule"], hdf5_path, cfg_rh,
-            sample_hour=0,
-        )
-
-        total_dist_rh = sum(t_out_rh["distances"])
-        metrics_rh = compute_result_metrics(planned_rh, simulated_rh, total_dist_rh)
-
-        ts_path_rh = os.path.join(output_dir, f"timeseries_{approach_name_rh}.csv")
-        simulated_rh["time_series"].to_csv(ts_path_rh, index=False)
-
-        result_rh = build_result_json(
-            approach=approach_name_rh,
-            config=cfg_rh,
-            planned=planned_rh,
-            simulated=simulated_rh,
-            metrics=metrics_rh,
-            time_series_file=ts_path_rh,
-        )
-        result_rh["decision_points"] = planned_rh.get("decision_points", [])
-        json_path_rh = os.path.join(output_dir, f"result_{approach_name_rh}.json")
-        save_result(result_rh, json_path_rh)
-
-        print(f"  {approach_name_rh}: {simulated_rh['total_fuel_mt']:.2f} mt fuel")
-        results.append(result_rh)
-
+    report.flush()
+    if not per_file:
+        save_result({"runs": results}, os.path.join(output_dir, "results_horizon_sweep.json"))
     return results
 
 
-def run_lp_predicted(config, hdf5_path, output_dir):
+def run_lp_predicted(config, hdf5_path, output_dir, use_cache=True):
     """Run the LP optimizer using predicted weather instead of actual.
 
     This isolates whether the LP's disadvantage comes from segment-averaging
@@ -820,56 +1169,35 @@ def run_lp_predicted(config, hdf5_path, output_dir):
     Returns:
         Result dict (also saved as result_static_det_predicted.json).
     """
-    from static_det.transform import transform
-    from static_det.optimize import optimize
-
-    cfg = copy.deepcopy(config)
-    cfg["static_det"]["weather_source"] = "predicted"
-    cfg["static_det"]["forecast_origin"] = 0
+    cfg = _cfg_override(config, {
+        ("static_det", "weather_source"): "predicted",
+        ("static_det", "forecast_origin"): 0,
+    })
     approach_name = "static_det_predicted"
 
-    print(f"\n--- LP with Predicted Weather ---")
-
-    print(f"  Transform (predicted weather)...")
-    t_out = transform(hdf5_path, cfg)
-
-    print(f"  Optimize (LP)...")
-    planned = optimize(t_out, cfg)
-    if planned.get("status") != "Optimal":
-        logger.warning("LP predicted: status=%s", planned.get("status"))
-        return None
-
-    print(f"  Simulate (actual weather)...")
-    simulated = simulate_voyage(
-        planned["speed_schedule"], hdf5_path, cfg,
-        sample_hour=0,
-    )
-
-    total_dist = sum(t_out["distances"])
-    metrics = compute_result_metrics(planned, simulated, total_dist)
-
-    ts_path = os.path.join(output_dir, f"timeseries_{approach_name}.csv")
-    simulated["time_series"].to_csv(ts_path, index=False)
-
-    result = build_result_json(
-        approach=approach_name,
-        config=cfg,
-        planned=planned,
-        simulated=simulated,
-        metrics=metrics,
-        time_series_file=ts_path,
-    )
-    json_path = os.path.join(output_dir, f"result_{approach_name}.json")
-    save_result(result, json_path)
-
-    print(f"  {approach_name}: plan={planned['planned_fuel_mt']:.2f} mt, "
-          f"sim={simulated['total_fuel_mt']:.2f} mt, "
-          f"gap={metrics['fuel_gap_percent']:.2f}%, "
-          f"SWS violations={simulated.get('sws_violations', 0)}")
+    with _SweepReporter() as report, _open_hdf5(hdf5_path) as h5:
+        report.step("\n--- LP with Predicted Weather ---")
+        planned, simulated, result = _run_plan_and_simulate(
+            approach_name, cfg, hdf5_path, output_dir, lp_transform, lp_optimize,
+            accept=("Optimal",),
+            steps=("  Transform (predicted weather)...", "  Optimize (LP)...",
+                   "  Simulate (actual weather)..."),
+            log=report.step, use_cache=use_cache, h5=h5,
+        )
+        if result is None:
+            logger.warning("LP predicted: status=%s", planned.get("status"))
+            return None
+
+        metrics = result["metrics"]
+        report.step(f"  {approach_name}: plan={planned['planned_fuel_mt']:.2f} mt, "
+                    f"sim={simulated['total_fuel_mt']:.2f} mt, "
+                    f"gap={metrics['fuel_gap_percent']:.2f}%, "
+                    f"SWS violations={simulated.get('sws_violations', 0)}")
     return result
 
 
-def run_2x2_decomposition(config_a, config_b, hdf5_a, hdf5_b, output_dir):
+def run_2x2_decomposition(config_a, config_b, hdf5_a, hdf5_b, output_dir,
+                          use_cache=True):
     """Run 2x2 spatial x temporal decomposition.
 
     Four configurations:
@@ -888,13 +1216,6 @@ def run_2x2_decomposition(config_a, config_b, hdf5_a, hdf5_b, output_dir):
     Returns:
         Dict with all results and decomposition values.
     """
-    from static_det.transform import transform as lp_transform
-    from static_det.optimize import optimize as lp_optimize
-    from dynamic_det.transform import transform as dd_transform
-    from dynamic_det.optimize import optimize as dd_optimize
-    from dynamic_rh.transform import transform as rh_transform
-    from dynamic_rh.optimize import optimize as rh_optimize
-
     os.makedirs(output_dir, exist_ok=True)
     results = {}
 
@@ -907,103 +1228,77 @@ def run_2x2_decomposition(config_a, config_b, hdf5_a, hdf5_b, output_dir):
     }
 
     for label, (cfg, hdf5, approach, transform_fn, optimize_fn) in configs.items():
-        print(f"\n--- 2x2 Decomposition: {label} ({approach}) ---")
-
-        print(f"  Transform...")
-        t_out = transform_fn(hdf5, cfg)
-
-        print(f"  Optimize...")
-        planned = optimize_fn(t_out, cfg)
-        status = planned.get("status", "unknown")
-        if status not in ("Optimal", "Feasible"):
-            logger.warning("2x2 %s: status=%s", label, status)
-            print(f"  WARNING: {label} status={status}, skipping")
-            continue
-
-        print(f"  Simulate...")
-        simulated = simulate_voyage(
-            planned["speed_schedule"], hdf5, cfg,
-            sample_hour=0,
-        )
-
-        total_dist = sum(t_out["distances"])
-        metrics = compute_result_metrics(planned, simulated, total_dist)
-
-        approach_name = f"decomp_{label}"
-        ts_path = os.path.join(output_dir, f"timeseries_{approach_name}.csv")
-        simulated["time_series"].to_csv(ts_path, index=False)
-
-        result = build_result_json(
-            approach=approach_name,
-            config=cfg,
-            planned=planned,
-            simulated=simulated,
-            metrics=metrics,
-            time_series_file=ts_path,
-        )
-        json_path = os.path.join(output_dir, f"result_{approach_name}.json")
-        save_result(result, json_path)
-
-        fuel = simulated["total_fuel_mt"]
-        time_h = simulated["total_time_h"]
-        violations = simulated.get("sws_violations", 0)
-        print(f"  {label}: {fuel:.2f} mt fuel, {time_h:.2f} h, {violations} SWS violations")
+        # One write per configuration
+        with _SweepReporter() as report, _open_hdf5(hdf5) as h5:
+            report.step(f"\n--- 2x2 Decomposition: {label} ({approach}) ---")
+            planned, simulated, result = _run_plan_and_simulate(
+                f"decomp_{label}", cfg, hdf5, output_dir, transform_fn, optimize_fn,
+                log=report.step, use_cache=use_cache, h5=h5,
+            )
+            if result is None:
+                status = planned.get("status", "unknown")
+                logger.warning("2x2 %s: status=%s", label, status)
+                report.step(f"  WARNING: {label} status={status}, skipping")
+                continue
+
+            fuel = simulated["total_fuel_mt"]
+            time_h = simulated["total_time_h"]
+            violations = simulated.get("sws_violations", 0)
+            report.step(f"  {label}: {fuel:.2f} mt fuel, {time_h:.2f} h, "
+                        f"{violations} SWS violations")
         results[label] = result
 
     # Compute decomposition if all 4 core configs succeeded
     decomp = {}
     if all(k in results for k in ("A_LP", "A_DP", "B_LP", "B_DP")):
-        a_lp = results["A_LP"]["simulated"]["total_fuel_mt"]
-        a_dp = results["A_DP"]["simulated"]["total_fuel_mt"]
-        b_lp = results["B_LP"]["simulated"]["total_fuel_mt"]
-        b_dp = results["B_DP"]["simulated"]["total_fuel_mt"]
-
-        temporal = a_dp - a_lp
-        spatial = b_lp - a_lp
-        interaction = b_dp - a_lp - temporal - spatial
-
-        decomp = {
-            "A_LP_fuel": round(a_lp, 4),
-            "A_DP_fuel": round(a_dp, 4),
-            "B_LP_fuel": round(b_lp, 4),
-            "B_DP_fuel": round(b_dp, 4),
-            "temporal_effect_mt": round(temporal, 4),
-            "spatial_effect_mt": round(spatial, 4),
-            "interaction_mt": round(interaction, 4),
-        }
-
+        labels = ["A_LP", "A_DP", "B_LP", "B_DP"]
         if "B_RH" in results:
-            b_rh = results["B_RH"]["simulated"]["total_fuel_mt"]
-            decomp["B_RH_fuel"] = round(b_rh, 4)
-            decomp["rh_additional_mt"] = round(b_rh - b_dp, 4)
-
-        print("\n" + "=" * 60)
-        print("2x2 DECOMPOSITION RESULTS")
-        print("=" * 60)
-        print(f"{'Config':<10} {'Fuel (mt)':>12} {'vs A-LP':>10}")
-        print("-" * 35)
-        print(f"{'A-LP':<10} {a_lp:>12.2f} {'baseline':>10}")
-        print(f"{'A-DP':<10} {a_dp:>12.2f} {temporal:>+10.2f}")
-        print(f"{'B-LP':<10} {b_lp:>12.2f} {spatial:>+10.2f}")
-        print(f"{'B-DP':<10} {b_dp:>12.2f} {b_dp - a_lp:>+10.2f}")
+            labels.append("B_RH")
+        fuels = np.array([results[k]["simulated"]["total_fuel_mt"] for k in labels])
+        deltas = fuels - fuels[0]  # vs A-LP
+
+        temporal, spatial = deltas[1], deltas[2]
+        interaction = deltas[3] - temporal - spatial
+
+        decomp = {f"{k}_fuel": round(float(f), 4) for k, f in zip(labels[:4], fuels)}
+        decomp.update({
+            "temporal_effect_mt": round(float(temporal), 4),
+            "spatial_effect_mt": round(float(spatial), 4),
+            "interaction_mt": round(float(interaction), 4),
+        })
         if "B_RH" in results:
-            print(f"{'B-RH':<10} {b_rh:>12.2f} {b_rh - a_lp:>+10.2f}")
-        print("-" * 35)
-        print(f"Temporal effect (A-DP - A-LP):  {temporal:+.2f} mt")
-        print(f"Spatial effect  (B-LP - A-LP):  {spatial:+.2f} mt")
-        print(f"Interaction:                    {interaction:+.2f} mt")
-        print("=" * 60)
+            decomp["B_RH_fuel"] = round(float(fuels[4]), 4)
+            decomp["rh_additional_mt"] = round(float(fuels[4] - fuels[3]), 4)
 
+        names = [k.replace("_", "-") for k in labels]
+        table = [f"{names[0]:<10} {fuels[0]:>12.2f} {'baseline':>10}"]
+        table += [f"{n:<10} {f:>12.2f} {d:>+10.2f}"
+                  for n, f, d in zip(names[1:], fuels[1:], deltas[1:])]
         # Save decomposition
         decomp_path = os.path.join(output_dir, "decomposition_2x2.json")
         with open(decomp_path, "w") as f:
             json.dump(decomp, f, indent=2)
-        print(f"Saved: {decomp_path}")
+
+        print("\n".join([
+            "\n" + "=" * 60,
+            "2x2 DECOMPOSITION RESULTS",
+            "=" * 60,
+            f"{'Config':<10} {'Fuel (mt)':>12} {'vs A-LP':>10}",
+            "-" * 35,
+            *table,
+            "-" * 35,
+            f"Temporal effect (A-DP - A-LP):  {temporal:+.2f} mt",
+            f"Spatial effect  (B-LP - A-LP):  {spatial:+.2f} mt",
+            f"Interaction:                    {interaction:+.2f} mt",
+            "=" * 60,
+            f"Saved: {decomp_path}",
+        ]))
 
     return {"results": results, "decomposition": decomp}
 
 
-def run_short_route_horizon_sweep(config, hdf5_path, output_dir, horizons=None):
+def run_short_route_horizon_sweep(config, hdf5_path, output_dir, horizons=None,
+                                  use_cache=True, per_file=True):
     """Run horizon sweep on the shorter route (exp_b, ~140h voyage).
 
     Since the route is ~140h, the horizon sweep becomes more interesting:
@@ -1014,21 +1309,21 @@ def run_short_route_horizon_sweep(config, hdf5_path, output_dir, horizons=None):
     This tests the Section 4.5 hypothesis: does the plateau shift when
     forecast_horizon / voyage_duration changes?
 
+    As in run_horizon_sweep, horizons shorter than one that is infeasible
+    for both approaches are skipped.
+
     Args:
         config: Experiment config for the short route.
         hdf5_path: Path to exp_b HDF5.
         output_dir: Output directory.
         horizons: List of forecast horizons in hours.
             Default: [24, 48, 72, 96, 120, 144]
+        per_file: Save one result_{approach}.json per run; False writes
+            them all to results_short_route_horizon_sweep.json instead.
 
     Returns:
         List of result dicts.
     """
-    from dynamic_det.transform import transform as dd_transform
-    from dynamic_det.optimize import optimize as dd_optimize
-    from dynamic_rh.transform import transform as rh_transform
-    from dynamic_rh.optimize import optimize as rh_optimize
-
     if horizons is None:
         horizons = [24, 48, 72, 96, 120, 144]
 
@@ -1037,115 +1332,42 @@ def run_short_route_horizon_sweep(config, hdf5_path, output_dir, horizons=None):
     eta = config["ship"]["eta_hours"]
     relaxed_eta = int(eta * 1.02)
 
-    results = []
-
-    print("=" * 60)
-    print(f"SHORT-ROUTE HORIZON SWEEP (ETA={eta}h, relaxed={relaxed_eta}h)")
-    print("=" * 60)
+    report = _SweepReporter()
+    report.step("=" * 60)
+    report.step(f"SHORT-ROUTE HORIZON SWEEP (ETA={eta}h, relaxed={relaxed_eta}h)")
+    report.step("=" * 60)
+    report.flush()
 
+    tasks = []
     for horizon in horizons:
         ratio = horizon / eta * 100
+        tasks.append(("dd", horizon, f"short_dd_horizon_{horizon}h",
+                      f"\n--- Horizon {horizon}h ({ratio:.0f}% of voyage) — Dynamic Det ---", ratio))
+        tasks.append(("rh", horizon, f"short_rh_horizon_{horizon}h",
+                      f"\n--- Horizon {horizon}h ({ratio:.0f}% of voyage) — Rolling Horizon ---", ratio))
 
-        # --- Dynamic Det ---
-        cfg = copy.deepcopy(config)
-        cfg["dynamic_det"]["max_forecast_horizon"] = horizon
-        cfg["ship"]["eta_hours"] = relaxed_eta
-        approach_name = f"short_dd_horizon_{horizon}h"
-
-        print(f"\n--- Horizon {horizon}h ({ratio:.0f}% of voyage) — Dynamic Det ---")
-
-        print(f"  Transform...")
-        t_out = dd_transform(hdf5_path, cfg)
-
-        print(f"  Optimize (DP, horizon={horizon}h)...")
-        planned = dd_optimize(t_out, cfg)
-        if planned.get("status") not in ("Optimal", "Feasible"):
-            logger.warning("Short route horizon %dh DP: status=%s",
-                           horizon, planned.get("status"))
-            print(f"  WARNING: DP status={planned.get('status')}")
-        else:
-            print(f"  Simulate...")
-            simulated = simulate_voyage(
-                planned["speed_schedule"], hdf5_path, cfg,
-                sample_hour=cfg["dynamic_det"]["forecast_origin"],
-            )
-
-            total_dist = sum(t_out["distances"])
-            metrics = compute_result_metrics(planned, simulated, total_dist)
-
-            ts_path = os.path.join(output_dir, f"timeseries_{approach_name}.csv")
-            simulated["time_series"].to_csv(ts_path, index=False)
-
-            result = build_result_json(
-                approach=approach_name,
-                config=cfg,
-                planned=planned,
-                simulated=simulated,
-                metrics=metrics,
-                time_series_file=ts_path,
-            )
-            result["horizon_ratio_pct"] = round(ratio, 1)
-            json_path = os.path.join(output_dir, f"result_{approach_name}.json")
-            save_result(result, json_path)
-
-            print(f"  {approach_name}: {simulated['total_fuel_mt']:.2f} mt, "
-                  f"ratio={ratio:.0f}%")
-            results.append(result)
-
-        # --- Rolling Horizon ---
-        cfg_rh = copy.deepcopy(config)
-        cfg_rh["dynamic_det"]["max_forecast_horizon"] = horizon
-        cfg_rh["ship"]["eta_hours"] = relaxed_eta
-        approach_name_rh = f"short_rh_horizon_{horizon}h"
-
-        print(f"\n--- Horizon {horizon}h ({ratio:.0f}% of voyage) — Rolling Horizon ---")
-
-        print(f"  Transform...")
-        t_out_rh = rh_transform(hdf5_path, cfg_rh)
-
-        print(f"  Optimize (RH, horizon={horizon}h)...")
-        planned_rh = rh_optimize(t_out_rh, cfg_rh)
-        if planned_rh.get("status") not in ("Optimal", "Feasible"):
-            logger.warning("Short route horizon %dh RH: status=%s",
-                           horizon, planned_rh.get("status"))
-            print(f"  WARNING: RH status={planned_rh.get('status')}")
+    results = []
+    outcomes = _run_horizon_tasks(tasks, config, hdf5_path, output_dir, relaxed_eta,
+                                  use_cache, per_file)
+    for (kind, horizon, _, header, _), outcome in zip(tasks, outcomes):
+        if outcome is None:
+            report.step(f"{header}\n  Skipped: infeasible at a longer horizon")
             continue
-
-        print(f"  Simulate...")
-        simulated_rh = simulate_voyage(
-            planned_rh["speed_schedule"], hdf5_path, cfg_rh,
-            sample_hour=0,
-        )
-
-        total_dist_rh = sum(t_out_rh["distances"])
-        metrics_rh = compute_result_metrics(planned_rh, simulated_rh, total_dist_rh)
-
-        ts_path_rh = os.path.join(output_dir, f"timeseries_{approach_name_rh}.csv")
-        simulated_rh["time_series"].to_csv(ts_path_rh, index=False)
-
-        result_rh = build_result_json(
-            approach=approach_name_rh,
-            config=cfg_rh,
-            planned=planned_rh,
-            simulated=simulated_rh,
-            metrics=metrics_rh,
-            time_series_file=ts_path_rh,
-        )
-        result_rh["decision_points"] = planned_rh.get("decision_points", [])
-        result_rh["horizon_ratio_pct"] = round(ratio, 1)
-        json_path_rh = os.path.join(output_dir, f"result_{approach_name_rh}.json")
-        save_result(result_rh, json_path_rh)
-
-        print(f"  {approach_name_rh}: {simulated_rh['total_fuel_mt']:.2f} mt, "
-              f"ratio={ratio:.0f}%")
-        results.append(result_rh)
+        status, lines, result = outcome
+        report.step("\n".join(lines))
+        if result is None:
+            label = "DP" if kind == "dd" else "RH"
+            logger.warning("Short route horizon %dh %s: status=%s", horizon, label, status)
+            report.step(f"  WARNING: {label} status={status}")
+            continue
+        results.append(result)
 
     # Summary table
-    print("\n" + "=" * 60)
-    print("SHORT-ROUTE HORIZON SWEEP SUMMARY")
-    print("=" * 60)
-    print(f"{'Approach':<30} {'Horizon':>8} {'Ratio':>7} {'Sim Fuel':>10} {'Time':>8}")
-    print("-" * 68)
+    report.step("\n" + "=" * 60)
+    report.step("SHORT-ROUTE HORIZON SWEEP SUMMARY")
+    report.step("=" * 60)
+    report.step(f"{'Approach':<30} {'Horizon':>8} {'Ratio':>7} {'Sim Fuel':>10} {'Time':>8}")
+    report.step("-" * 68)
 
     for r in results:
         name = r["approach"]
@@ -1153,16 +1375,54 @@ def run_short_route_horizon_sweep(config, hdf5_path, output_dir, horizons=None):
         time_h = r["simulated"]["voyage_time_h"]
         ratio = r.get("horizon_ratio_pct", 0)
         h = name.split("_")[-1]  # e.g. "144h"
-        print(f"{name:<30} {h:>8} {ratio:>6.0f}% {fuel:>10.2f} {time_h:>8.2f}")
+        report.step(f"{name:<30} {h:>8} {ratio:>6.0f}% {fuel:>10.2f} {time_h:>8.2f}")
 
-    print("=" * 68)
+    report.step("=" * 68)
+    report.flush()
+    if not per_file:
+        save_result({"runs": results},
+                    os.path.join(output_dir, "results_short_route_horizon_sweep.json"))
     return results
 
 
-def run_sensitivity(config, output_dir, hdf5_path):
+def _bound_stage_one(stage, config, hdf5_path, output_dir, use_cache=True):
+    """Run one bound experiment (in a worker process), capturing its output.
+
+    Args:
+        stage: (run_fn, takes_use_cache).
+
+    Returns:
+        (printed_text, result, error) -- error is the exception the stage
+        raised (result is then None), so the caller can still print the
+        stage's output before re-raising it.
+    """
+    run_fn, takes_use_cache = stage
+    kwargs = {"use_cache": use_cache} if takes_use_cache else {}
+    buf = io.StringIO()
+    result = error = None
+    with contextlib.redirect_stdout(buf):
+        try:
+            result = run_fn(config, hdf5_path, output_dir, **kwargs)
+        except Exception as exc:
+            error = exc
+    return buf.getvalue(), result, error
+
+
+def run_sensitivity(config, output_dir, hdf5_path, use_cache=True, per_file=True):
     """Top-level orchestrator for all sensitivity experiments.
 
-    Runs bounds and replan sweep, prints summary table.
+    Runs bounds and replan sweep, prints summary table and saves it as
+    sensitivity_summary.csv (approach, fuel_mt, time_h).  The four bound
+    experiments are independent and run concurrently (their output is
+    printed in order once all have finished, before re-raising the first
+    error if one failed); the sweeps, which fill the
+    CPUs with their own worker processes, run after them.
+
+    Args:
+        use_cache: Reuse simulations saved in .sim_cache beside the HDF5
+            file (see _simulate_cached).  False re-runs every simulation.
+        per_file: Save one result JSON per sweep run (the files compare.py
+            loads).  False writes one results_*.json per sweep instead.
 
     Returns:
         Path to output directory.
@@ -1173,36 +1433,39 @@ def run_sensitivity(config, output_dir, hdf5_path):
     print("SENSITIVITY ANALYSIS")
     print("=" * 60)
 
-    # 1. Lower bound
-    print("\n[1/6] Lower bound (perfect information)...")
-    lb = run_lower_bound(config, hdf5_path, output_dir)
-
-    # 2. Constant-speed bound (ETA-meeting)
-    print("\n[2/6] Constant-speed bound (ETA-meeting)...")
-    csb = run_constant_speed_bound(config, hdf5_path, output_dir)
-
-    # 3. Rolling LP (segment-wise re-planning)
-    print("\n[3/6] Rolling LP (segment-wise re-planning)...")
-    rlp = run_rolling_lp(config, hdf5_path, output_dir)
-
-    # 4. Upper bound
-    print("\n[4/6] Upper bound (constant speed = max)...")
-    ub = run_upper_bound(config, hdf5_path, output_dir)
+    # 1-4. Bounds: lower (perfect information), constant-speed (ETA-meeting),
+    # rolling LP (segment-wise re-planning), upper (constant speed = max)
+    headers = [
+        "\n[1/6] Lower bound (perfect information)...",
+        "\n[2/6] Constant-speed bound (ETA-meeting)...",
+        "\n[3/6] Rolling LP (segment-wise re-planning)...",
+        "\n[4/6] Upper bound (constant speed = max)...",
+    ]
+    stages = [
+        (run_lower_bound, True),
+        (run_constant_speed_bound, False),
+        (run_rolling_lp, True),
+        (run_upper_bound, True),
+    ]
+    outcomes = _process_map(_bound_stage_one, stages,
+                            config, hdf5_path, output_dir, use_cache)
+    for header, (text, _, _) in zip(headers, outcomes):
+        print(header)
+        print(text, end="")
+    for _, _, error in outcomes:
+        if error is not None:
+            raise error
+    lb, csb, rlp, ub = (result for _, result, _ in outcomes)
 
     # 5. Replan sweep
     print("\n[5/6] Replan frequency sweep...")
-    sweep = run_replan_sweep(config, hdf5_path, output_dir)
+    sweep = run_replan_sweep(config, hdf5_path, output_dir, use_cache=use_cache,
+                             per_file=per_file)
 
     # 6. Forecast horizon sweep
     print("\n[6/6] Forecast horizon sweep...")
-    horizon = run_horizon_sweep(config, hdf5_path, output_dir)
-
-    # Summary table
-    print("\n" + "=" * 60)
-    print("SENSITIVITY SUMMARY")
-    print("=" * 60)
-    print(f"{'Approach':<35}  {'Sim Fuel (mt)':>14}  {'Sim Time (h)':>13}")
-    print("-" * 65)
+    horizon = run_horizon_sweep(config, hdf5_path, output_dir, use_cache=use_cache,
+                                per_file=per_file)
 
     all_results = []
     if lb:
@@ -1216,11 +1479,25 @@ def run_sensitivity(config, output_dir, hdf5_path):
     all_results.extend(sweep)
     all_results.extend(horizon)
 
-    for r in all_results:
-        name = r["approach"]
-        fuel = r["simulated"]["total_fuel_mt"]
-        time_h = r["simulated"]["voyage_time_h"]
-        print(f"{name:<35}  {fuel:>14.2f}  {time_h:>13.2f}")
-
-    print("=" * 65)
+    # Summary table: printed in one write and saved as sensitivity_summary.csv
+    summary = pd.DataFrame({
+        "approach": [r["approach"] for r in all_results],
+        "fuel_mt": [r["simulated"]["total_fuel_mt"] for r in all_results],
+        "time_h": [r["simulated"]["voyage_time_h"] for r in all_results],
+    })
+    summary.to_csv(os.path.join(output_dir, "sensitivity_summary.csv"), index=False)
+
+    lines = [
+        "\n" + "=" * 60,
+        "SENSITIVITY SUMMARY",
+        "=" * 60,
+        f"{'Approach':<35}  {'Sim Fuel (mt)':>14}  {'Sim Time (h)':>13}",
+        "-" * 65,
+    ]
+    lines.extend(
+        f"{name:<35}  {fuel:>14.2f}  {time_h:>13.2f}"
+        for name, fuel, time_h in summary.itertuples(index=False)
+    )
+    lines.append("=" * 65)
+    print("\n".join(lines))
     return output_dir
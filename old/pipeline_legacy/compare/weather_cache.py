@@ -0,0 +1,182 @@
+"""
+Columnar on-disk cache for the HDF5 weather tables.
+
+read_actual()/read_predicted() decode the full HDF5 table into a DataFrame
+on every call. The comparison and staleness analyses re-read the same file
+on every run, so the decoded frame is written once as Parquet next to the
+HDF5 file and reloaded from there for as long as it is newer than the HDF5.
+
+Parquet needs pyarrow (or fastparquet); without an engine the readers fall
+back to plain HDF5 reads. With pyarrow the cache is memory-mapped rather
+than read through buffered file I/O.
+
+Frames are returned with narrow dtypes (float32 weather fields, int16 hour
+indices) so the merges and diffs downstream move half the bytes.
+
+check_chunks()/rechunk() guard the HDF5 side: weather tables written with
+tiny chunks (a few rows each) decode many times slower than the 10000-row
+chunks create_hdf5() uses.
+"""
+
+import logging
+import os
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from shared.hdf5_io import read_actual, read_predicted
+
+logger = logging.getLogger(__name__)
+
+# Weather fields carry ~3 significant digits; float32 resolves them (and the
+# 1e-6 change threshold used by the staleness analysis) comfortably.
+FLOAT32_COLUMNS = [
+    "wind_speed_10m_kmh", "wind_direction_10m_deg", "wave_height_m",
+    "ocean_current_velocity_kmh", "ocean_current_direction_deg",
+]
+HOUR_COLUMNS = ["forecast_hour", "sample_hour"]
+
+_INT16 = np.iinfo(np.int16)
+
+WEATHER_DATASETS = ["actual_weather", "predicted_weather"]
+
+# Chunks below this many rows are reported by check_chunks()
+MIN_CHUNK_ROWS = 10
+
+
+def cache_path(hdf5_path, table):
+    """Path of the Parquet cache for one HDF5 table ("actual"/"predicted")."""
+    return f"{hdf5_path}.{table}.parquet"
+
+
+def compact_dtypes(df):
+    """Downcast weather fields to float32, node_id to int32 and the hour
+    columns to int16 (when their range allows it)."""
+    if df.empty:
+        return df
+    dtypes = {c: "float32" for c in FLOAT32_COLUMNS if c in df.columns}
+    if "node_id" in df.columns:
+        dtypes["node_id"] = "int32"
+    for c in HOUR_COLUMNS:
+        if c in df.columns and _INT16.min <= df[c].min() and df[c].max() <= _INT16.max:
+            dtypes[c] = "int16"
+    return df.astype(dtypes)
+
+
+def _read_parquet(path):
+    """Load a cache file, memory-mapping it when pyarrow is the engine."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return pd.read_parquet(path)
+    return pq.read_table(path, memory_map=True).to_pandas()
+
+
+def _cached_read(hdf5_path, table, reader):
+    path = cache_path(hdf5_path, table)
+    try:
+        if os.path.getmtime(path) >= os.path.getmtime(hdf5_path):
+            return compact_dtypes(_read_parquet(path))
+    except ImportError:
+        return compact_dtypes(reader(hdf5_path))
+    except (OSError, ValueError) as e:
+        # Missing cache (the normal first-run case) or an unreadable one
+        if os.path.exists(path):
+            logger.warning("Ignoring unreadable weather cache %s: %s", path, e)
+
+    df = compact_dtypes(reader(hdf5_path))
+    try:
+        df.to_parquet(path, compression="zstd", index=False)
+        logger.info("Wrote weather cache: %s", path)
+    except ImportError:
+        logger.debug("No Parquet engine installed, not caching %s", table)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not write weather cache %s: %s", path, e)
+    return df
+
+
+def read_actual_cached(hdf5_path):
+    """read_actual(hdf5_path), served from the Parquet cache when fresh."""
+    return _cached_read(hdf5_path, "actual", read_actual)
+
+
+def read_predicted_cached(hdf5_path):
+    """read_predicted(hdf5_path), served from the Parquet cache when fresh."""
+    return _cached_read(hdf5_path, "predicted", read_predicted)
+
+
+# ---------------------------------------------------------------------------
+# HDF5 chunk layout
+# ---------------------------------------------------------------------------
+
+def check_chunks(hdf5_path, min_rows=MIN_CHUNK_ROWS):
+    """Warn about weather datasets whose chunks hold fewer than min_rows rows.
+
+    Returns:
+        dict {dataset_name: chunk_rows} of the offending datasets.
+    """
+    small = {}
+    with h5py.File(hdf5_path, "r") as f:
+        for name in WEATHER_DATASETS:
+            if name not in f or f[name].chunks is None:
+                continue
+            rows = f[name].chunks[0]
+            if rows < min_rows:
+                small[name] = rows
+                logger.warning("HDF5 chunk size %d in %s:%s is likely causing slow reads; "
+                               "rechunk with h5repack or pass --rechunk",
+                               rows, hdf5_path, name)
+    return small
+
+
+def rechunk(hdf5_path, chunk_rows, out_path=None):
+    """Copy hdf5_path to a sibling file with weather chunks of chunk_rows rows.
+
+    The copy is reused while it is newer than the source.  It is written
+    to a temporary file and moved into place, so an interrupted copy is
+    never mistaken for a finished one.
+
+    Returns:
+        Path of the rechunked file.
+    """
+    if out_path is None:
+        root, ext = os.path.splitext(hdf5_path)
+        out_path = f"{root}.rechunk{chunk_rows}{ext}"
+    if os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(hdf5_path):
+        return out_path
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    try:
+        _copy_rechunked(hdf5_path, tmp_path, chunk_rows)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    logger.info("Rechunked %s -> %s (%d rows/chunk)", hdf5_path, out_path, chunk_rows)
+    return out_path
+
+
+def _copy_rechunked(hdf5_path, out_path, chunk_rows):
+    """Copy hdf5_path to out_path, rewriting the weather datasets' chunks."""
+    with h5py.File(hdf5_path, "r") as src, h5py.File(out_path, "w") as dst:
+        dst.attrs.update(src.attrs)
+        for name in src:
+            if name not in WEATHER_DATASETS:
+                src.copy(name, dst)
+                continue
+            ds = src[name]
+            out = dst.create_dataset(
+                name,
+                shape=ds.shape,
+                maxshape=(None,),
+                dtype=ds.dtype,
+                chunks=(chunk_rows,),
+                compression=ds.compression,
+                compression_opts=ds.compression_opts,
+            )
+            out.attrs.update(ds.attrs)
+            for start in range(0, len(ds), chunk_rows):
+                out[start:start + chunk_rows] = ds[start:start + chunk_rows]
@@ -16,7 +16,9 @@ pipeline_dir = os.path.dirname(os.path.abspath(__file__))
 if pipeline_dir not in sys.path:
     sys.path.insert(0, pipeline_dir)
 
+import numpy as np
 import yaml
+from lagrangian_bound import solve_lagrangian
 from shared.hdf5_io import read_metadata, read_actual
 from shared.physics import (
     calculate_speed_over_ground,
@@ -97,12 +99,13 @@ while s <= max_speed + SWS_STEP / 2:
 
 print(f"Precomputing SOG for {len(legs)} legs × {len(sws_grid)} SWS values...")
 
-# For each leg: list of (sws, sog, fcr, time, fuel)
-leg_tables = []
-for leg in legs:
-    table = []
-    for sws in sws_grid:
-        sog = calculate_speed_over_ground(
+# Per-leg tables as [leg, sws index] arrays; FCR depends on SWS only
+sws_grid_arr = np.array(sws_grid)
+fcr_arr = np.array([calculate_fuel_consumption_rate(sws) for sws in sws_grid])
+sog_mat = np.empty((num_legs, len(sws_grid)), dtype=np.float64)
+for i, leg in enumerate(legs):
+    for j, sws in enumerate(sws_grid):
+        sog_mat[i, j] = calculate_speed_over_ground(
             ship_speed=sws,
             ocean_current=leg["current_knots"],
             current_direction=leg["current_dir_rad"],
@@ -112,12 +115,10 @@ for leg in legs:
             wave_height=leg["wave_height"],
             ship_parameters=ship_params,
         )
-        sog = max(sog, 0.1)
-        fcr = calculate_fuel_consumption_rate(sws)
-        t = leg["dist"] / sog
-        f = fcr * t
-        table.append((sws, sog, fcr, t, f))
-    leg_tables.append(table)
+np.maximum(sog_mat, 0.1, out=sog_mat)
+dist_arr = np.array([leg["dist"] for leg in legs])
+time_mat = dist_arr[:, None] / sog_mat
+fuel_mat = fcr_arr * time_mat
 
 print("Done.\n")
 
@@ -127,8 +128,8 @@ print("=" * 60)
 print(f"UPPER BOUND — SWS = {max_speed} kn (max engine speed)")
 print("=" * 60)
 
-fuel_ub = sum(table[-1][4] for table in leg_tables)  # last entry = max SWS
-time_ub = sum(table[-1][3] for table in leg_tables)
+fuel_ub = fuel_mat[:, -1].sum()  # last column = max SWS
+time_ub = time_mat[:, -1].sum()
 
 print(f"  SWS = {max_speed} kn")
 print(f"  Fuel = {fuel_ub:.2f} mt")
@@ -138,69 +139,24 @@ print()
 
 # ── LOWER BOUND: Lagrangian optimization ──
 # Minimize sum fuel_i(SWS_i) subject to sum time_i(SWS_i) <= ETA
-#
-# Lagrangian: L = sum [fuel_i + lambda * time_i]
-# For each leg, find SWS_i minimizing fuel_i + lambda * time_i
-# Binary search on lambda until total_time = ETA
+# (breakpoint sweep over lambda, see lagrangian_bound.py)
 
 print("=" * 60)
 print("LOWER BOUND — Lagrangian optimization (actual weather)")
 print("=" * 60)
 
-
-def solve_for_lambda(lam):
-    """For a given lambda, find optimal SWS per leg and return totals."""
-    total_fuel = 0.0
-    total_time = 0.0
-    chosen_sws = []
-
-    for table in leg_tables:
-        best_cost = float("inf")
-        best_idx = 0
-        for j, (sws, sog, fcr, t, f) in enumerate(table):
-            cost = f + lam * t  # fuel + lambda * time
-            if cost < best_cost:
-                best_cost = cost
-                best_idx = j
-
-        sws, sog, fcr, t, f = table[best_idx]
-        total_fuel += f
-        total_time += t
-        chosen_sws.append(sws)
-
-    return total_fuel, total_time, chosen_sws
-
-
-# Binary search on lambda
 # lambda=0 → minimize fuel only → slowest speeds → longest time
 # lambda=large → minimize time → fastest speeds → shortest time
-print("  Searching for optimal lambda...")
-
-lo_lam, hi_lam = 0.0, 10.0
-
-# Check if ETA is feasible at all
-_, min_time, _ = solve_for_lambda(hi_lam)
-_, max_time, _ = solve_for_lambda(lo_lam)
-
-if min_time > eta:
-    print(f"  WARNING: ETA={eta}h is infeasible. Min time at max speed = {min_time:.2f}h")
-    # Use fastest possible
-    fuel_lb, time_lb, opt_sws = solve_for_lambda(hi_lam)
+print("  Sweeping lambda breakpoints...")
+
+best_idx, best_lam = solve_lagrangian(time_mat, fuel_mat, eta)
+rows = np.arange(num_legs)
+fuel_lb = fuel_mat[rows, best_idx].sum()
+time_lb = time_mat[rows, best_idx].sum()
+opt_sws = sws_grid_arr[best_idx]
+if best_lam is None:
+    print(f"  WARNING: ETA={eta}h is infeasible. Min time at max speed = {time_lb:.2f}h")
 else:
-    for iteration in range(100):
-        mid_lam = (lo_lam + hi_lam) / 2
-        _, t, _ = solve_for_lambda(mid_lam)
-
-        if t > eta:
-            lo_lam = mid_lam  # need to go faster (increase penalty)
-        else:
-            hi_lam = mid_lam  # can go slower (decrease penalty)
-
-        if hi_lam - lo_lam < 1e-10:
-            break
-
-    best_lam = (lo_lam + hi_lam) / 2
-    fuel_lb, time_lb, opt_sws = solve_for_lambda(best_lam)
     print(f"  Lambda = {best_lam:.6f}")
 
 print(f"  Fuel = {fuel_lb:.2f} mt")
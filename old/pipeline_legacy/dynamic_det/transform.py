@@ -62,9 +62,12 @@ def _segment_average_weather(all_metadata, weather_df, weather_fields):
     return result
 
 
-def transform(hdf5_path: str, config: dict) -> dict:
+def transform(hdf5_path: str, config: dict, metadata: pd.DataFrame = None) -> dict:
     """Transform HDF5 predicted weather data into DP-ready inputs.
 
+    ``metadata`` may be passed in (read_metadata() output) to skip
+    re-reading it from the HDF5 file.
+
     Returns dict with keys:
         ETA, num_nodes, num_legs, speeds, fcr, distances, headings_deg,
         weather_grid, max_forecast_hour, node_metadata, ship_params
@@ -80,8 +83,10 @@ def transform(hdf5_path: str, config: dict) -> dict:
     # ------------------------------------------------------------------
     # 1. Read HDF5
     # ------------------------------------------------------------------
-    metadata = read_metadata(hdf5_path)
+    if metadata is None:
+        metadata = read_metadata(hdf5_path)
     metadata = metadata.sort_values("node_id").reset_index(drop=True)
+    all_metadata = metadata
 
     # Filter to original waypoints only if configured
     if nodes_mode == "original":
@@ -141,8 +146,6 @@ def transform(hdf5_path: str, config: dict) -> dict:
 
         if nodes_mode == "original":
             # Segment-averaged weather from ALL 279 nodes, like the LP
-            all_metadata = read_metadata(hdf5_path)
-            all_metadata = all_metadata.sort_values("node_id").reset_index(drop=True)
             seg_avg = _segment_average_weather(all_metadata, actual_df, weather_fields)
             logger.info("Segment-averaged actual weather for %d segments", len(seg_avg))
 
@@ -213,7 +216,6 @@ def transform(hdf5_path: str, config: dict) -> dict:
     # 3. Per-leg headings and distances
     # ------------------------------------------------------------------
     headings_deg = []
-    distances = []
 
     for i in range(num_legs):
         node_a = metadata.iloc[i]
@@ -225,8 +227,10 @@ def transform(hdf5_path: str, config: dict) -> dict:
         )
         headings_deg.append(heading)
 
-        dist = node_b["distance_from_start_nm"] - node_a["distance_from_start_nm"]
-        distances.append(max(dist, 0.001))  # guard against zero
+    distances = np.maximum(
+        np.diff(metadata["distance_from_start_nm"].to_numpy(dtype=float)),
+        0.001,  # guard against zero
+    ).tolist()
 
     logger.info("Legs: %d, total distance: %.1f nm", num_legs, sum(distances))
 
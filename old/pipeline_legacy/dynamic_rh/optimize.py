@@ -18,12 +18,18 @@ from dynamic_det.optimize import optimize as dp_optimize
 logger = logging.getLogger(__name__)
 
 
-def optimize(transform_output: dict, config: dict) -> dict:
+def optimize(transform_output: dict, config: dict, first_dp_result: dict = None) -> dict:
     """Run rolling horizon optimization.
 
     Args:
         transform_output: Dict from dynamic_rh.transform().
         config: Full experiment config.
+        first_dp_result: first_decision_plan() output to use for the first
+            decision point instead of solving it again.  Ignored with
+            use_actual_at_replan, where that sub-problem depends on the
+            replan frequency.  Its solve time is still counted in
+            computation_time_s, and its decision point is marked
+            ``dp_reused``.
 
     Returns:
         Dict with: status, planned_fuel_mt, planned_time_h,
@@ -33,11 +39,6 @@ def optimize(transform_output: dict, config: dict) -> dict:
     ETA = transform_output["ETA"]
     num_legs = transform_output["num_legs"]
     distances = transform_output["distances"]
-    headings_deg = transform_output["headings_deg"]
-    node_metadata = transform_output["node_metadata"]
-    speeds = transform_output["speeds"]
-    fcr = transform_output["fcr"]
-    ship_params = transform_output["ship_params"]
     weather_grids = transform_output["weather_grids"]
     max_forecast_hours = transform_output["max_forecast_hours"]
     available_sample_hours = transform_output["available_sample_hours"]
@@ -66,6 +67,7 @@ def optimize(transform_output: dict, config: dict) -> dict:
     elapsed_fuel = 0.0
     committed_legs = []
     decision_log = []
+    reused_solve_s = 0.0  # solve time of first_dp_result, not timed here
 
     total_start = time.time()
 
@@ -77,7 +79,6 @@ def optimize(transform_output: dict, config: dict) -> dict:
         sample_hour = _pick_sample_hour(available_sample_hours, elapsed_time)
 
         # 2. Build sub-voyage transform dict
-        remaining_legs = num_legs - current_node_idx
         remaining_eta = ETA - elapsed_time
 
         if remaining_eta <= 0:
@@ -122,23 +123,16 @@ def optimize(transform_output: dict, config: dict) -> dict:
             logger.info("RH decision %d: injected actual weather for fh=[%d,%d] (%d node×hour entries)",
                         dp_idx, fh_start, min(fh_end, max_fh_val), injected)
 
-        sub_transform = {
-            "ETA": remaining_eta,
-            "num_nodes": remaining_legs + 1,
-            "num_legs": remaining_legs,
-            "speeds": speeds,
-            "fcr": fcr,
-            "distances": distances[current_node_idx:],
-            "headings_deg": headings_deg[current_node_idx:],
-            "weather_grid": grid_for_dp,
-            "max_forecast_hour": max_forecast_hours[sample_hour],
-            "node_metadata": node_metadata[current_node_idx:],
-            "ship_params": ship_params,
-            "time_offset": elapsed_time,
-        }
+        sub_transform = _sub_transform(transform_output, current_node_idx, remaining_eta,
+                                       elapsed_time, sample_hour, grid_for_dp)
 
         # 3. Run DP on remaining voyage
-        dp_result = dp_optimize(sub_transform, config)
+        reused = dp_idx == 0 and first_dp_result is not None and not use_actual
+        if reused:
+            dp_result = first_dp_result
+            reused_solve_s = first_dp_result.get("computation_time_s", 0)
+        else:
+            dp_result = dp_optimize(sub_transform, config)
 
         # Fallback: if actual weather injection made DP infeasible (tight ETA),
         # retry with forecast-only weather (only needed with hard ETA)
@@ -163,6 +157,8 @@ def optimize(transform_output: dict, config: dict) -> dict:
                 "dp_status": dp_result.get("status", "Infeasible"),
                 "dp_solve_time_s": dp_result.get("computation_time_s", 0),
             })
+            if reused:
+                decision_log[-1]["dp_reused"] = True
             break
 
         schedule = dp_result["speed_schedule"]
@@ -211,6 +207,8 @@ def optimize(transform_output: dict, config: dict) -> dict:
             "dp_status": dp_result["status"],
             "dp_solve_time_s": round(dp_result["computation_time_s"], 4),
         })
+        if reused:
+            decision_log[-1]["dp_reused"] = True
 
         logger.info("RH decision %d: hour=%.1f, SH=%d, node=%d, committed=%d legs, "
                      "fuel=%.2f mt, time=%.2f h",
@@ -218,7 +216,8 @@ def optimize(transform_output: dict, config: dict) -> dict:
                      current_node_idx - len(legs_this_round),
                      len(legs_this_round), sub_fuel, sub_elapsed)
 
-    total_elapsed = time.time() - total_start
+    # Include the reused first solve, so the total matches a run that solves it
+    total_elapsed = time.time() - total_start + reused_solve_s
 
     # Verify all legs are covered
     if current_node_idx < num_legs:
@@ -252,6 +251,40 @@ def optimize(transform_output: dict, config: dict) -> dict:
     return result
 
 
+def first_decision_plan(transform_output: dict, config: dict) -> dict:
+    """Solve the DP for the first decision point (hour 0, whole voyage).
+
+    Without use_actual_at_replan this sub-problem is the same for every
+    replan frequency, so a replan sweep can solve it once and pass it to
+    each optimize() call as first_dp_result.
+    """
+    sample_hour = _pick_sample_hour(transform_output["available_sample_hours"], 0.0)
+    sub_transform = _sub_transform(transform_output, 0, transform_output["ETA"], 0.0,
+                                   sample_hour, transform_output["weather_grids"][sample_hour])
+    return dp_optimize(sub_transform, config)
+
+
+def _sub_transform(transform_output, node_idx, remaining_eta, elapsed_time,
+                   sample_hour, weather_grid):
+    """dynamic_det transform dict for the voyage remaining from node_idx."""
+    t = transform_output
+    remaining_legs = t["num_legs"] - node_idx
+    return {
+        "ETA": remaining_eta,
+        "num_nodes": remaining_legs + 1,
+        "num_legs": remaining_legs,
+        "speeds": t["speeds"],
+        "fcr": t["fcr"],
+        "distances": t["distances"][node_idx:],
+        "headings_deg": t["headings_deg"][node_idx:],
+        "weather_grid": weather_grid,
+        "max_forecast_hour": t["max_forecast_hours"][sample_hour],
+        "node_metadata": t["node_metadata"][node_idx:],
+        "ship_params": t["ship_params"],
+        "time_offset": elapsed_time,
+    }
+
+
 def _pick_sample_hour(available, elapsed_time):
     """Pick the best available sample_hour <= elapsed_time.
 
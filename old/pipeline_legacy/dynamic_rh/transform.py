@@ -9,6 +9,7 @@ picks the freshest grid at each decision point.
 import math
 import logging
 
+import numpy as np
 import pandas as pd
 
 from shared.hdf5_io import read_metadata, read_predicted, read_actual
@@ -26,9 +27,12 @@ WEATHER_FIELDS = [
 ]
 
 
-def transform(hdf5_path: str, config: dict) -> dict:
+def transform(hdf5_path: str, config: dict, metadata: pd.DataFrame = None) -> dict:
     """Transform HDF5 predicted weather into RH-ready inputs.
 
+    ``metadata`` may be passed in (read_metadata() output) to skip
+    re-reading it from the HDF5 file.
+
     Returns dict with keys:
         ETA, num_nodes, num_legs, speeds, fcr, distances, headings_deg,
         node_metadata, ship_params, weather_grids, max_forecast_hours,
@@ -42,7 +46,8 @@ def transform(hdf5_path: str, config: dict) -> dict:
     # ------------------------------------------------------------------
     # 1. Read metadata
     # ------------------------------------------------------------------
-    metadata = read_metadata(hdf5_path)
+    if metadata is None:
+        metadata = read_metadata(hdf5_path)
     metadata = metadata.sort_values("node_id").reset_index(drop=True)
 
     if nodes_mode == "original":
@@ -57,7 +62,6 @@ def transform(hdf5_path: str, config: dict) -> dict:
     # 2. Per-leg headings and distances
     # ------------------------------------------------------------------
     headings_deg = []
-    distances = []
 
     for i in range(num_legs):
         node_a = metadata.iloc[i]
@@ -67,8 +71,10 @@ def transform(hdf5_path: str, config: dict) -> dict:
             node_b["lat"], node_b["lon"],
         )
         headings_deg.append(heading)
-        dist = node_b["distance_from_start_nm"] - node_a["distance_from_start_nm"]
-        distances.append(max(dist, 0.001))
+
+    distances = np.maximum(
+        np.diff(metadata["distance_from_start_nm"].to_numpy(dtype=float)), 0.001
+    ).tolist()
 
     logger.info("Legs: %d, total distance: %.1f nm", num_legs, sum(distances))
 
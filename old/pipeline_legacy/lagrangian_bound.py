@@ -0,0 +1,84 @@
+"""
+Lagrangian lower bound on voyage fuel over a per-leg SWS grid.
+
+Minimize sum fuel_i(SWS_i) subject to sum time_i(SWS_i) <= ETA, with
+Lagrangian L = sum [fuel_i + lambda * time_i].
+
+The minimizer of fuel + lambda * time on one leg is a vertex of the lower
+convex hull of the leg's (time, fuel) points, and it moves one vertex
+faster each time lambda passes the (negated) slope of a hull edge.  Total
+time is therefore a step function of lambda; sweeping all legs'
+breakpoints in increasing order finds the smallest lambda whose total
+time meets the ETA, with no search over lambda.
+
+Used by compute_bounds_exp_b.py.
+"""
+
+import numpy as np
+
+
+def lower_hull(times, fuels):
+    """Indices of the lower convex hull of (time, fuel), by increasing time.
+
+    Stops at the minimum-fuel vertex: slower points are never optimal
+    for lambda >= 0.
+    """
+    t = times.tolist()
+    f = fuels.tolist()
+    hull = []
+    for j in np.lexsort((fuels, times)).tolist():  # Andrew's monotone chain
+        while len(hull) >= 2:
+            a, b = hull[-2], hull[-1]
+            if (t[b] - t[a]) * (f[j] - f[a]) - (f[b] - f[a]) * (t[j] - t[a]) > 0:
+                break
+            hull.pop()
+        hull.append(j)
+    hull = np.array(hull)
+    return hull[:int(fuels[hull].argmin()) + 1]
+
+
+def solve_lagrangian(time_mat, fuel_mat, eta):
+    """Choose one grid point per leg minimizing fuel + lambda * time.
+
+    Args:
+        time_mat: [num_legs x num_sws] leg time (h) at each SWS.
+        fuel_mat: [num_legs x num_sws] leg fuel (mt) at each SWS.
+        eta:      Total time budget (h).
+
+    Returns:
+        (best_idx, lam): the chosen column per leg, and the smallest lambda
+        whose plan meets eta (legs tied at it take the faster point).  lam
+        is None when eta is infeasible; every leg is then at its fastest
+        point.
+    """
+    num_legs = len(time_mat)
+    hulls = [lower_hull(time_mat[i], fuel_mat[i]) for i in range(num_legs)]
+    bp_lam, bp_dt, bp_leg = [np.empty(0)], [np.empty(0)], [np.empty(0, dtype=int)]
+    for i, hull in enumerate(hulls):
+        dt = np.diff(time_mat[i, hull])
+        bp_lam.append(-np.diff(fuel_mat[i, hull]) / dt)
+        bp_dt.append(dt)
+        bp_leg.append(np.full(len(dt), i))
+    bp_lam = np.concatenate(bp_lam)
+    order = np.argsort(bp_lam, kind="stable")
+    bp_lam = bp_lam[order]
+    bp_leg = np.concatenate(bp_leg)[order]
+
+    max_time = sum(time_mat[i, hull[-1]] for i, hull in enumerate(hulls))  # lambda = 0
+    min_time = sum(time_mat[i, hull[0]] for i, hull in enumerate(hulls))
+    sweep_time = max_time - np.cumsum(np.concatenate(bp_dt)[order])
+
+    if min_time > eta:
+        lam = None
+        num_steps = len(bp_lam)
+    elif max_time <= eta:
+        lam = 0.0
+        num_steps = 0
+    else:
+        lam = float(bp_lam[int(np.argmax(sweep_time <= eta))])
+        num_steps = int(np.searchsorted(bp_lam, lam, side="right"))
+
+    steps = np.bincount(bp_leg[:num_steps], minlength=num_legs)
+    best_idx = np.array([hull[len(hull) - 1 - k] for hull, k in zip(hulls, steps)],
+                        dtype=int)
+    return best_idx, lam
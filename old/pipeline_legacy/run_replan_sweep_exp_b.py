@@ -10,7 +10,6 @@ Expected result: fuel plateaus between 1-6h, confirming 6h is the sweet spot
 aligned with the fastest NWP model update cycle (GFS wind).
 """
 
-import copy
 import math
 import os
 import sys
@@ -129,8 +128,8 @@ def run_sweep():
     print("=" * 80)
 
     for freq in FREQUENCIES:
-        cfg = copy.deepcopy(config)
-        cfg["dynamic_rh"]["replan_frequency_hours"] = freq
+        # Only dynamic_rh changes per frequency; share the rest of config
+        cfg = {**config, "dynamic_rh": {**config["dynamic_rh"], "replan_frequency_hours": freq}}
         approach_name = f"dynamic_rh_replan_{freq}h"
 
         print(f"\n--- Replan every {freq}h ---")
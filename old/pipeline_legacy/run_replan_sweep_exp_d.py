@@ -7,7 +7,6 @@ Runs the RH optimizer at frequencies [1, 2, 3, 6, 12, 24] hours, then:
      of decision points received a genuinely different forecast vs the previous one
 """
 
-import copy
 import math
 import os
 import sys
@@ -110,8 +109,8 @@ def run_sweep():
     print("=" * 80)
 
     for freq in FREQUENCIES:
-        cfg = copy.deepcopy(config)
-        cfg["dynamic_rh"]["replan_frequency_hours"] = freq
+        # Only dynamic_rh changes per frequency; share the rest of config
+        cfg = {**config, "dynamic_rh": {**config["dynamic_rh"], "replan_frequency_hours": freq}}
         approach_name = f"dynamic_rh_replan_{freq}h_exp_d"
 
         print(f"\n--- Replan every {freq}h ---")
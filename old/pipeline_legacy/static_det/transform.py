@@ -65,9 +65,12 @@ def _segment_weather(weather_df: pd.DataFrame, metadata: pd.DataFrame) -> pd.Dat
 # Main entry point
 # ---------------------------------------------------------------------------
 
-def transform(hdf5_path: str, config: dict) -> dict:
+def transform(hdf5_path: str, config: dict, metadata: pd.DataFrame = None) -> dict:
     """Transform HDF5 weather data into LP-ready inputs.
 
+    ``metadata`` may be passed in (read_metadata() output) to skip
+    re-reading it from the HDF5 file.
+
     Returns dict with keys:
         ETA, num_segments, num_speeds, distances, speeds, fcr,
         sog_matrix, sog_lower, sog_upper, segment_headings_deg,
@@ -82,7 +85,8 @@ def transform(hdf5_path: str, config: dict) -> dict:
     # ------------------------------------------------------------------
     # 1. Read HDF5
     # ------------------------------------------------------------------
-    metadata = read_metadata(hdf5_path)
+    if metadata is None:
+        metadata = read_metadata(hdf5_path)
     if weather_source == "predicted":
         # Use predicted weather at forecast_hour=sample_hour, from forecast
         # origin=0.  This gives the forecast's estimate of conditions at hour
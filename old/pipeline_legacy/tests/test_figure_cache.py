@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for the comparison figure manifest (_FigureCache in compare/compare.py).
+
+Usage:
+    cd pipeline
+    python3 -m pytest tests/test_figure_cache.py -v
+"""
+
+import os
+import sys
+
+pipeline_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if pipeline_dir not in sys.path:
+    sys.path.insert(0, pipeline_dir)
+
+import pytest
+
+from compare.compare import _FigureCache
+
+
+@pytest.fixture
+def comp_dir(tmp_path):
+    (tmp_path / "result_a.json").write_text("{}")
+    return tmp_path
+
+
+@pytest.fixture
+def plot(comp_dir):
+    """A plot function that writes its PNG and records its calls."""
+    calls = []
+
+    def plot_fn(name):
+        calls.append(name)
+        path = str(comp_dir / f"{name}.png")
+        with open(path, "wb") as f:
+            f.write(b"png")
+        return path
+
+    plot_fn.calls = calls
+    return plot_fn
+
+
+def test_unchanged_inputs_skip_rendering(comp_dir, plot):
+    inputs = [str(comp_dir / "result_a.json")]
+    cache = _FigureCache(str(comp_dir))
+    path = cache.figure("fuel", inputs, plot, "fuel")
+    cache.save()
+
+    reloaded = _FigureCache(str(comp_dir))
+    assert reloaded.figure("fuel", inputs, plot, "fuel") == path
+    assert plot.calls == ["fuel"]
+
+
+def test_changed_input_rerenders(comp_dir, plot):
+    src = comp_dir / "result_a.json"
+    cache = _FigureCache(str(comp_dir))
+    cache.figure("fuel", [str(src)], plot, "fuel")
+    src.write_text('{"changed": true}')
+    cache.figure("fuel", [str(src)], plot, "fuel")
+    assert plot.calls == ["fuel", "fuel"]
+
+
+def test_missing_png_rerenders(comp_dir, plot):
+    inputs = [str(comp_dir / "result_a.json")]
+    cache = _FigureCache(str(comp_dir))
+    os.remove(cache.figure("fuel", inputs, plot, "fuel"))
+    cache.figure("fuel", inputs, plot, "fuel")
+    assert plot.calls == ["fuel", "fuel"]
+
+
+def test_corrupt_manifest_starts_empty(comp_dir):
+    (comp_dir / _FigureCache.FILENAME).write_text("{not json")
+    assert _FigureCache(str(comp_dir)).entries == {}
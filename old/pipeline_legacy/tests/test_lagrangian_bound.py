@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Tests for the Lagrangian lower-bound solver (breakpoint sweep).
+
+Checks solve_lagrangian() against the lambda bisection it replaced and
+against brute force, on synthetic per-leg (time, fuel) tables.
+
+Usage:
+    cd pipeline
+    python3 -m pytest tests/test_lagrangian_bound.py -v
+"""
+
+import itertools
+import os
+import sys
+
+pipeline_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if pipeline_dir not in sys.path:
+    sys.path.insert(0, pipeline_dir)
+
+import numpy as np
+import pytest
+
+from lagrangian_bound import lower_hull, solve_lagrangian
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_tables(num_legs=12, num_sws=201, seed=0):
+    """Synthetic (time, fuel) tables: cubic FCR, SOG = SWS + a per-leg offset
+    plus a little noise, so some grid points fall off the convex hull."""
+    rng = np.random.default_rng(seed)
+    sws = np.linspace(11.0, 13.0, num_sws)
+    dist = rng.uniform(5.0, 40.0, num_legs)[:, None]
+    sog = sws + rng.uniform(-1.5, 1.0, (num_legs, 1)) + rng.normal(0, 0.01, (num_legs, num_sws))
+    time_mat = dist / sog
+    fuel_mat = 0.000706 * sws ** 3 * time_mat
+    return time_mat, fuel_mat
+
+
+def totals(time_mat, fuel_mat, idx):
+    rows = np.arange(len(idx))
+    return fuel_mat[rows, idx].sum(), time_mat[rows, idx].sum()
+
+
+def bisect(time_mat, fuel_mat, eta):
+    """The binary search on lambda that solve_lagrangian() replaced.
+
+    Returns the plan at the feasible end of the final bracket: the midpoint
+    the old script used can fall just below the breakpoint and miss eta.
+    """
+    def solve(lam):
+        return (fuel_mat + lam * time_mat).argmin(axis=1)
+
+    lo, hi = 0.0, 10.0
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        if totals(time_mat, fuel_mat, solve(mid))[1] > eta:
+            lo = mid
+        else:
+            hi = mid
+        if hi - lo < 1e-10:
+            break
+    return solve(hi), hi
+
+
+def assert_lagrangian_optimal(time_mat, fuel_mat, idx, lam):
+    """Every leg's choice minimizes fuel + lam * time."""
+    cost = fuel_mat + lam * time_mat
+    chosen = cost[np.arange(len(idx)), idx]
+    np.testing.assert_allclose(chosen, cost.min(axis=1), rtol=0, atol=1e-9)
+
+
+# ---------------------------------------------------------------------------
+# lower_hull
+# ---------------------------------------------------------------------------
+
+def test_lower_hull_drops_points_above_hull_and_slower_than_min_fuel():
+    times = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    fuels = np.array([10.0, 9.0, 5.0, 4.0, 4.5])  # (2, 9) is above the hull
+    assert lower_hull(times, fuels).tolist() == [0, 2, 3]
+
+
+def test_lower_hull_equal_times_keeps_lower_fuel():
+    times = np.array([1.0, 1.0, 2.0, 2.0])
+    fuels = np.array([5.0, 4.0, 3.0, 3.5])
+    assert lower_hull(times, fuels).tolist() == [1, 2]
+
+
+# ---------------------------------------------------------------------------
+# solve_lagrangian
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("eta_frac", [0.05, 0.3, 0.5, 0.8, 0.95])
+def test_matches_bisection(eta_frac):
+    time_mat, fuel_mat = make_tables()
+    t_fast = time_mat.min(axis=1).sum()
+    t_slow = time_mat[np.arange(len(time_mat)), fuel_mat.argmin(axis=1)].sum()
+    eta = t_fast + eta_frac * (t_slow - t_fast)
+
+    idx, lam = solve_lagrangian(time_mat, fuel_mat, eta)
+    ref_idx, ref_lam = bisect(time_mat, fuel_mat, eta)
+
+    fuel, time = totals(time_mat, fuel_mat, idx)
+    ref_fuel, _ = totals(time_mat, fuel_mat, ref_idx)
+    assert time <= eta
+    assert lam == pytest.approx(ref_lam, abs=1e-6)
+    assert fuel == pytest.approx(ref_fuel, rel=1e-12)
+    assert_lagrangian_optimal(time_mat, fuel_mat, idx, lam)
+
+
+def test_ties_duplicate_columns_and_flat_leg():
+    time_mat, fuel_mat = make_tables(num_legs=6, num_sws=41, seed=1)
+    # Every grid point twice (exact cost ties), and one leg where every SWS
+    # gives the same time and fuel
+    time_mat = np.repeat(time_mat, 2, axis=1)
+    fuel_mat = np.repeat(fuel_mat, 2, axis=1)
+    time_mat[2] = 3.0
+    fuel_mat[2] = 7.0
+    eta = time_mat.min(axis=1).sum() + 0.4 * (time_mat.max(axis=1) - time_mat.min(axis=1)).sum()
+
+    idx, lam = solve_lagrangian(time_mat, fuel_mat, eta)
+    ref_idx, ref_lam = bisect(time_mat, fuel_mat, eta)
+
+    assert totals(time_mat, fuel_mat, idx)[1] <= eta
+    assert lam == pytest.approx(ref_lam, abs=1e-6)
+    assert totals(time_mat, fuel_mat, idx)[0] == pytest.approx(
+        totals(time_mat, fuel_mat, ref_idx)[0], rel=1e-12)
+    assert_lagrangian_optimal(time_mat, fuel_mat, idx, lam)
+
+
+def test_single_speed():
+    time_mat = np.array([[2.0], [3.0], [1.5]])
+    fuel_mat = np.array([[4.0], [5.0], [2.0]])
+
+    idx, lam = solve_lagrangian(time_mat, fuel_mat, eta=10.0)
+    assert idx.tolist() == [0, 0, 0]
+    assert lam == 0.0
+
+    idx, lam = solve_lagrangian(time_mat, fuel_mat, eta=6.0)
+    assert idx.tolist() == [0, 0, 0]
+    assert lam is None  # 6.5 h needed
+
+
+def test_infeasible_eta_uses_fastest_point():
+    time_mat, fuel_mat = make_tables(num_legs=5, num_sws=21, seed=2)
+    idx, lam = solve_lagrangian(time_mat, fuel_mat, eta=time_mat.min(axis=1).sum() - 0.1)
+    assert lam is None
+    assert idx.tolist() == time_mat.argmin(axis=1).tolist()
+
+
+def test_slack_eta_uses_min_fuel_point():
+    time_mat, fuel_mat = make_tables(num_legs=5, num_sws=21, seed=3)
+    idx, lam = solve_lagrangian(time_mat, fuel_mat, eta=time_mat.max(axis=1).sum() + 1.0)
+    assert lam == 0.0
+    assert idx.tolist() == fuel_mat.argmin(axis=1).tolist()
+
+
+def test_optimal_among_plans_no_slower_than_it():
+    """x(lambda) is the minimum-fuel plan among all plans at least as fast."""
+    time_mat, fuel_mat = make_tables(num_legs=4, num_sws=5, seed=4)
+    eta = time_mat.min(axis=1).sum() + 0.5 * (time_mat.max(axis=1) - time_mat.min(axis=1)).sum()
+    idx, _ = solve_lagrangian(time_mat, fuel_mat, eta)
+    fuel, time = totals(time_mat, fuel_mat, idx)
+
+    for combo in itertools.product(range(time_mat.shape[1]), repeat=len(time_mat)):
+        f, t = totals(time_mat, fuel_mat, np.array(combo))
+        if t <= time:
+            assert f >= fuel - 1e-9
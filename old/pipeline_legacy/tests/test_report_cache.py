@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Tests for the report section cache in compare/report.py.
+
+Usage:
+    cd pipeline
+    python3 -m pytest tests/test_report_cache.py -v
+"""
+
+import os
+import sys
+
+pipeline_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if pipeline_dir not in sys.path:
+    sys.path.insert(0, pipeline_dir)
+
+import pandas as pd
+import pytest
+
+from compare import report
+
+
+@pytest.fixture
+def builds():
+    """A section builder that records its calls."""
+    calls = []
+
+    def build(text):
+        calls.append(text)
+        return f"## Section\n\n{text}"
+
+    build.calls = calls
+    return build
+
+
+def cache_entries(save_dir):
+    return sorted(os.listdir(os.path.join(save_dir, report._SECTION_CACHE_DIR)))
+
+
+# ---------------------------------------------------------------------------
+# _cached_section
+# ---------------------------------------------------------------------------
+
+def test_same_inputs_served_from_cache(tmp_path, builds):
+    save_dir = str(tmp_path)
+    first = report._cached_section(save_dir, "table", [b"a"], builds, "rows")
+    second = report._cached_section(save_dir, "table", [b"a"], builds, "rows")
+    assert first == second == "## Section\n\nrows"
+    assert builds.calls == ["rows"]
+
+
+def test_changed_inputs_rebuild_and_replace_entry(tmp_path, builds):
+    save_dir = str(tmp_path)
+    report._cached_section(save_dir, "table", [b"a"], builds, "old")
+    report._cached_section(save_dir, "figures", [b"a"], builds, "figs")
+    text = report._cached_section(save_dir, "table", [b"b"], builds, "new")
+
+    assert text.endswith("new")
+    assert builds.calls == ["old", "figs", "new"]
+    entries = cache_entries(save_dir)
+    assert len(entries) == 2
+    assert sum(e.startswith("table_") for e in entries) == 1
+
+
+def test_unwritable_cache_still_returns_text(tmp_path, builds):
+    save_dir = tmp_path / "save"
+    save_dir.mkdir()
+    (save_dir / report._SECTION_CACHE_DIR).write_text("a file, not a directory")
+    text = report._cached_section(str(save_dir), "table", [b"a"], builds, "rows")
+    assert text.endswith("rows")
+
+
+# ---------------------------------------------------------------------------
+# _frame_key
+# ---------------------------------------------------------------------------
+
+def test_frame_key_tracks_contents_and_dtypes():
+    df = pd.DataFrame({"approach": ["a", "b"], "fuel": [1.0, 2.0]})
+    assert report._frame_key(df) == report._frame_key(df.copy())
+    assert report._frame_key(df) != report._frame_key(df.assign(fuel=[1.0, 2.5]))
+    assert report._frame_key(df) != report._frame_key(df.astype({"fuel": "float32"}))
+    assert report._frame_key(None) == b"None"
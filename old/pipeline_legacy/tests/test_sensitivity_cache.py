@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for the on-disk simulation cache in compare/sensitivity.py.
+
+simulate_voyage() is replaced by a counting stub, so no HDF5 data is needed.
+
+Usage:
+    cd pipeline
+    python3 -m pytest tests/test_sensitivity_cache.py -v
+"""
+
+import os
+import sys
+
+pipeline_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if pipeline_dir not in sys.path:
+    sys.path.insert(0, pipeline_dir)
+
+import pytest
+
+# Needs the shared package (shared.hdf5_io etc.) on sys.path
+sensitivity = pytest.importorskip("compare.sensitivity")
+
+CONFIG = {"ship": {"eta_hours": 100, "speed_range_knots": [11, 13]}}
+SCHEDULE = [{"node_id": 0, "sog_knots": 12.0}, {"node_id": 1, "sog_knots": 12.5}]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replace the simulation with a stub; returns the list of its calls."""
+    calls = []
+
+    def fake_simulate(schedule, source, config, sample_hour=0, time_varying=False,
+                      metadata=None):
+        calls.append(schedule)
+        return {"total_fuel_mt": float(len(calls)), "sample_hour": sample_hour}
+
+    monkeypatch.setattr(sensitivity, "simulate_voyage", fake_simulate)
+    monkeypatch.setattr(sensitivity, "_metadata", lambda hdf5_path: None)
+    return calls
+
+
+@pytest.fixture
+def hdf5_path(tmp_path):
+    path = tmp_path / "route.h5"
+    path.write_bytes(b"weather")
+    return str(path)
+
+
+def cache_files(hdf5_path):
+    cache_dir = os.path.join(os.path.dirname(hdf5_path), sensitivity._SIM_CACHE_DIR)
+    return sorted(os.listdir(cache_dir)) if os.path.isdir(cache_dir) else []
+
+
+# ---------------------------------------------------------------------------
+# _simulate_cached
+# ---------------------------------------------------------------------------
+
+def test_repeat_call_is_served_from_cache(calls, hdf5_path):
+    first = sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    second = sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    assert len(calls) == 1
+    assert second == first
+    assert len(cache_files(hdf5_path)) == 1
+
+
+@pytest.mark.parametrize("change", [
+    lambda: (SCHEDULE[:1], CONFIG, 0),
+    lambda: (SCHEDULE, {"ship": dict(CONFIG["ship"], eta_hours=101)}, 0),
+    lambda: (SCHEDULE, CONFIG, 6),
+])
+def test_changed_inputs_miss(calls, hdf5_path, change):
+    sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    schedule, config, sample_hour = change()
+    sensitivity._simulate_cached(schedule, hdf5_path, config, sample_hour=sample_hour)
+    assert len(calls) == 2
+
+
+def test_rewritten_hdf5_file_misses(calls, hdf5_path):
+    sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    with open(hdf5_path, "ab") as f:
+        f.write(b" more")
+    sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    assert len(calls) == 2
+
+
+def test_key_covers_hdf5_io_source(calls, hdf5_path, monkeypatch, tmp_path):
+    sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    other = tmp_path / "hdf5_io.py"
+    other.write_text("# edited reader\n")
+    monkeypatch.setattr(sensitivity.hdf5_io, "__file__", str(other))
+    sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    assert len(calls) == 2
+
+
+def test_use_cache_false_neither_reads_nor_writes(calls, hdf5_path):
+    sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG, use_cache=False)
+    sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG, use_cache=False)
+    assert len(calls) == 2
+    assert cache_files(hdf5_path) == []
+
+
+def test_unreadable_entry_is_recomputed(calls, hdf5_path):
+    sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    (name,) = cache_files(hdf5_path)
+    path = os.path.join(os.path.dirname(hdf5_path), sensitivity._SIM_CACHE_DIR, name)
+    with open(path, "wb") as f:
+        f.write(b"truncated")
+    result = sensitivity._simulate_cached(SCHEDULE, hdf5_path, CONFIG)
+    assert len(calls) == 2
+    assert result["total_fuel_mt"] == 2.0
+
+
+def test_cache_is_bounded(calls, hdf5_path, monkeypatch):
+    monkeypatch.setattr(sensitivity, "_SIM_CACHE_MAX_ENTRIES", 3)
+    for sog in range(6):
+        sensitivity._simulate_cached([{"node_id": 0, "sog_knots": float(sog)}],
+                                     hdf5_path, CONFIG)
+    assert len(cache_files(hdf5_path)) == 3
+
+
+# ---------------------------------------------------------------------------
+# _prune_sim_cache
+# ---------------------------------------------------------------------------
+
+def test_prune_keeps_most_recently_used(tmp_path):
+    for i in range(5):
+        path = tmp_path / f"{i}.pkl"
+        path.write_bytes(b"")
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    (tmp_path / "other.tmp").write_bytes(b"")
+    os.utime(tmp_path / "0.pkl")  # just used
+
+    sensitivity._prune_sim_cache(str(tmp_path), max_entries=2)
+    assert sorted(os.listdir(tmp_path)) == ["0.pkl", "4.pkl", "other.tmp"]
+
+
+def test_prune_missing_directory_is_a_no_op(tmp_path):
+    sensitivity._prune_sim_cache(str(tmp_path / "absent"), max_entries=1)
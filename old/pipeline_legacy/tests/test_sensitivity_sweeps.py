@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Tests for the process fan-out of the sensitivity sweeps.
+
+The per-task workers are replaced by module-level stubs (so worker
+processes can unpickle them); no HDF5 data is needed.
+
+Usage:
+    cd pipeline
+    python3 -m pytest tests/test_sensitivity_sweeps.py -v
+"""
+
+import os
+import sys
+
+pipeline_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if pipeline_dir not in sys.path:
+    sys.path.insert(0, pipeline_dir)
+
+import pytest
+
+# Needs the shared package (shared.hdf5_io etc.) on sys.path
+sensitivity = pytest.importorskip("compare.sensitivity")
+
+# Horizons at or below this fail for both arms in fake_horizon_one()
+FAIL_AT_OR_BELOW = 48
+
+
+def fake_horizon_one(task, config, hdf5_path, output_dir, relaxed_eta,
+                     use_cache=True, per_file=True):
+    kind, horizon, approach_name, header, ratio = task
+    if horizon <= FAIL_AT_OR_BELOW:
+        return "Infeasible", [header], None
+    return "Optimal", [header], {"approach": approach_name, "pid": os.getpid()}
+
+
+def horizon_tasks(horizons):
+    return [(kind, h, f"{kind}_horizon_{h}h", f"--- {h}h {kind} ---", None)
+            for h in horizons for kind in ("dd", "rh")]
+
+
+@pytest.fixture(params=[1, 4, 16], ids=lambda n: f"{n}cpu")
+def cpus(request, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: request.param)
+    return request.param
+
+
+# ---------------------------------------------------------------------------
+# _run_horizon_tasks
+# ---------------------------------------------------------------------------
+
+def test_shorter_horizons_skipped_after_dual_failure(monkeypatch, cpus):
+    monkeypatch.setattr(sensitivity, "_horizon_sweep_one", fake_horizon_one)
+    tasks = horizon_tasks([12, 24, 48, 72, 96])
+
+    outcomes = sensitivity._run_horizon_tasks(tasks, {}, "route.h5", "out", 100, False)
+
+    ran = {task[2] for task, outcome in zip(tasks, outcomes) if outcome is not None}
+    assert ran == {f"{kind}_horizon_{h}h" for h in (48, 72, 96) for kind in ("dd", "rh")}
+    for task, outcome in zip(tasks, outcomes):
+        if outcome is not None:
+            assert (outcome[2] is None) == (task[1] <= FAIL_AT_OR_BELOW)
+
+
+def test_windows_span_horizons(monkeypatch):
+    batches = []
+
+    def recording_map(fn, items, *args):
+        batches.append([item[2] for item in items])
+        return [fn(item, *args) for item in items]
+
+    monkeypatch.setattr(sensitivity, "_horizon_sweep_one", fake_horizon_one)
+    monkeypatch.setattr(sensitivity, "_process_map", recording_map)
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    sensitivity._run_horizon_tasks(horizon_tasks([24, 48, 72, 96]), {}, "route.h5",
+                                   "out", 100, False)
+    assert batches == [
+        ["dd_horizon_96h", "rh_horizon_96h", "dd_horizon_72h", "rh_horizon_72h"],
+        ["dd_horizon_48h", "rh_horizon_48h", "dd_horizon_24h", "rh_horizon_24h"],
+    ]
+
+
+def test_single_arm_failure_does_not_skip(monkeypatch):
+    def one_arm_fails(task, *args):
+        if task[0] == "rh":
+            return "Infeasible", [task[3]], None
+        return "Optimal", [task[3]], {"approach": task[2]}
+
+    monkeypatch.setattr(sensitivity, "_horizon_sweep_one", one_arm_fails)
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)  # the stub is a closure
+    tasks = horizon_tasks([24, 72])
+
+    outcomes = sensitivity._run_horizon_tasks(tasks, {}, "route.h5", "out", 100, False)
+    assert all(outcome is not None for outcome in outcomes)
+
+
+def test_no_tasks():
+    assert sensitivity._run_horizon_tasks([], {}, "route.h5", "out", 100, False) == []
+
+
+# ---------------------------------------------------------------------------
+# _process_map
+# ---------------------------------------------------------------------------
+
+def scaled_with_pid(item, factor):
+    return item * factor, os.getpid()
+
+
+def test_process_map_single_worker_runs_in_process(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    out = sensitivity._process_map(scaled_with_pid, [1, 2, 3], 10)
+    assert [value for value, _ in out] == [10, 20, 30]
+    assert {pid for _, pid in out} == {os.getpid()}
+
+
+def test_process_map_pool_keeps_item_order(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    out = sensitivity._process_map(scaled_with_pid, list(range(8)), 3)
+    assert [value for value, _ in out] == [i * 3 for i in range(8)]
+    assert os.getpid() not in {pid for _, pid in out}
+
+
+def test_process_map_no_items():
+    assert sensitivity._process_map(scaled_with_pid, [], 1) == []
+
+
+def test_single_cpu_horizon_tasks_run_in_process(monkeypatch):
+    monkeypatch.setattr(sensitivity, "_horizon_sweep_one", fake_horizon_one)
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    outcomes = sensitivity._run_horizon_tasks(horizon_tasks([72, 96]), {}, "route.h5",
+                                              "out", 100, False)
+    assert {outcome[2]["pid"] for outcome in outcomes} == {os.getpid()}
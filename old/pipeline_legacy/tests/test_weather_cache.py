@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Tests for compare/weather_cache.py (Parquet cache of the HDF5 weather
+tables, HDF5 chunk checks and rechunking).
+
+Usage:
+    cd pipeline
+    python3 -m pytest tests/test_weather_cache.py -v
+"""
+
+import os
+import sys
+
+pipeline_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if pipeline_dir not in sys.path:
+    sys.path.insert(0, pipeline_dir)
+
+import h5py
+import numpy as np
+import pandas as pd
+import pytest
+
+# Needs the shared package (shared.hdf5_io etc.) on sys.path
+weather_cache = pytest.importorskip("compare.weather_cache")
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+skip_no_parquet = pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+
+
+def weather_frame():
+    return pd.DataFrame({
+        "node_id": np.arange(4, dtype=np.int64),
+        "sample_hour": np.zeros(4, dtype=np.int64),
+        "wind_speed_10m_kmh": [10.5, 12.0, np.nan, 8.25],
+        "wave_height_m": [1.0, 1.5, 2.0, 0.5],
+    })
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Replace read_actual with a stub; returns the list of paths it read."""
+    reads = []
+
+    def fake_read_actual(hdf5_path):
+        reads.append(hdf5_path)
+        return weather_frame()
+
+    monkeypatch.setattr(weather_cache, "read_actual", fake_read_actual)
+    return reads
+
+
+@pytest.fixture
+def hdf5_path(tmp_path):
+    path = tmp_path / "route.h5"
+    path.write_bytes(b"weather")
+    os.utime(path, ns=(10**9, 10**9))
+    return str(path)
+
+
+# ---------------------------------------------------------------------------
+# Parquet cache
+# ---------------------------------------------------------------------------
+
+@skip_no_parquet
+def test_first_read_writes_cache_and_second_uses_it(reads, hdf5_path):
+    first = weather_cache.read_actual_cached(hdf5_path)
+    assert os.path.isfile(weather_cache.cache_path(hdf5_path, "actual"))
+    second = weather_cache.read_actual_cached(hdf5_path)
+    assert reads == [hdf5_path]
+    pd.testing.assert_frame_equal(first, second)
+
+
+@skip_no_parquet
+def test_frames_use_compact_dtypes(reads, hdf5_path):
+    df = weather_cache.read_actual_cached(hdf5_path)
+    assert df["node_id"].dtype == np.int32
+    assert df["sample_hour"].dtype == np.int16
+    assert df["wind_speed_10m_kmh"].dtype == np.float32
+    assert np.isnan(df["wind_speed_10m_kmh"][2])
+
+
+@skip_no_parquet
+def test_newer_hdf5_invalidates_cache(reads, hdf5_path):
+    weather_cache.read_actual_cached(hdf5_path)
+    os.utime(weather_cache.cache_path(hdf5_path, "actual"), ns=(10**9, 10**9))
+    os.utime(hdf5_path, ns=(2 * 10**9, 2 * 10**9))  # HDF5 rewritten after caching
+    weather_cache.read_actual_cached(hdf5_path)
+    assert len(reads) == 2
+
+
+@skip_no_parquet
+def test_unreadable_cache_is_rebuilt(reads, hdf5_path):
+    with open(weather_cache.cache_path(hdf5_path, "actual"), "wb") as f:
+        f.write(b"not parquet")
+    df = weather_cache.read_actual_cached(hdf5_path)
+    assert reads == [hdf5_path]
+    assert len(df) == 4
+    assert weather_cache.read_actual_cached(hdf5_path).equals(df)
+    assert reads == [hdf5_path]
+
+
+# ---------------------------------------------------------------------------
+# HDF5 chunk layout
+# ---------------------------------------------------------------------------
+
+ROWS = 100
+
+
+@pytest.fixture
+def small_chunk_h5(tmp_path):
+    """HDF5 file whose weather tables use 4-row chunks."""
+    path = str(tmp_path / "route.h5")
+    with h5py.File(path, "w") as f:
+        f.attrs["route"] = "test"
+        f.create_dataset("metadata", data=np.arange(10))
+        for name in weather_cache.WEATHER_DATASETS:
+            ds = f.create_dataset(name, data=np.arange(ROWS, dtype=np.float64),
+                                  chunks=(4,), maxshape=(None,))
+            ds.attrs["units"] = "x"
+    os.utime(path, ns=(10**9, 10**9))
+    return path
+
+
+def test_check_chunks_reports_small_chunks(small_chunk_h5):
+    assert weather_cache.check_chunks(small_chunk_h5) == {
+        name: 4 for name in weather_cache.WEATHER_DATASETS}
+    assert weather_cache.check_chunks(small_chunk_h5, min_rows=4) == {}
+
+
+def test_rechunk_copies_data_with_new_chunks(small_chunk_h5):
+    out = weather_cache.rechunk(small_chunk_h5, 32)
+    assert out.endswith("route.rechunk32.h5")
+    with h5py.File(out, "r") as f:
+        assert f.attrs["route"] == "test"
+        assert f["metadata"][:].tolist() == list(range(10))
+        for name in weather_cache.WEATHER_DATASETS:
+            assert f[name].chunks == (32,)
+            assert f[name].attrs["units"] == "x"
+            np.testing.assert_array_equal(f[name][:], np.arange(ROWS))
+    assert weather_cache.check_chunks(out) == {}
+
+
+def test_rechunk_reuses_fresh_copy_and_rebuilds_stale_one(small_chunk_h5):
+    out = weather_cache.rechunk(small_chunk_h5, 32)
+    os.utime(out, ns=(5 * 10**9, 5 * 10**9))
+    assert weather_cache.rechunk(small_chunk_h5, 32) == out
+    assert os.stat(out).st_mtime_ns == 5 * 10**9
+
+    os.utime(small_chunk_h5, ns=(6 * 10**9, 6 * 10**9))  # source rewritten
+    weather_cache.rechunk(small_chunk_h5, 32)
+    assert os.stat(out).st_mtime_ns > 6 * 10**9
+
+
+def test_interrupted_rechunk_leaves_no_output(small_chunk_h5, monkeypatch):
+    def interrupted(src, dst, chunk_rows):
+        with open(dst, "wb") as f:
+            f.write(b"partial")
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(weather_cache, "_copy_rechunked", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        weather_cache.rechunk(small_chunk_h5, 32)
+    assert sorted(os.listdir(os.path.dirname(small_chunk_h5))) == ["route.h5"]
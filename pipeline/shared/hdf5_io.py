@@ -6,8 +6,12 @@ Schema:
     /actual_weather     — appendable: node_id, sample_hour, + 6 weather fields
     /predicted_weather  — appendable: node_id, forecast_hour, sample_hour, + 6 weather fields
     attrs               — voyage_start_time, route_name, created_at, source, etc.
+
+The read functions take either a file path or an already open h5py.File,
+so callers doing many reads can share one handle.
 """
 
+import contextlib
 import logging
 import os
 import pickle
@@ -54,6 +58,19 @@ PREDICTED_DTYPE = np.dtype([
 ] + WEATHER_FIELDS)
 
 
+# Raw chunk cache for read-only opens (h5py's default is 1 MiB), so repeated
+# slices of the weather tables are served from memory.  The slot count is
+# a prime well above the number of cached chunks.
+READ_CHUNK_CACHE_BYTES = 64 * 1024 * 1024
+READ_CHUNK_CACHE_SLOTS = 10007
+
+
+def open_read(path):
+    """Open path read-only with the enlarged chunk cache."""
+    return h5py.File(path, "r", rdcc_nbytes=READ_CHUNK_CACHE_BYTES,
+                     rdcc_nslots=READ_CHUNK_CACHE_SLOTS)
+
+
 # ---------------------------------------------------------------------------
 # Create
 # ---------------------------------------------------------------------------
@@ -159,13 +176,26 @@ def append_predicted(path, dataframe):
 # Read
 # ---------------------------------------------------------------------------
 
+@contextlib.contextmanager
+def _open_read(path):
+    """Yield path itself if it is an open h5py.File, else open it read-only."""
+    if isinstance(path, h5py.File):
+        yield path
+        return
+    with open_read(path) as f:
+        yield f
+
+
 def read_metadata(path):
     """Read /metadata table as DataFrame.
 
+    Args:
+        path: HDF5 file path or open h5py.File.
+
     Returns:
         DataFrame with decoded string columns.
     """
-    with h5py.File(path, "r") as f:
+    with _open_read(path) as f:
         arr = f["metadata"][:]
     df = pd.DataFrame(arr)
     # Decode bytes to str
@@ -179,14 +209,14 @@ def read_actual(path, sample_hour=None, node_id=None):
     """Read /actual_weather with optional filters.
 
     Args:
-        path: HDF5 file path.
+        path: HDF5 file path or open h5py.File.
         sample_hour: Filter by sample_hour (int).
         node_id: Filter by node_id (int).
 
     Returns:
         DataFrame.
     """
-    with h5py.File(path, "r") as f:
+    with _open_read(path) as f:
         arr = f["actual_weather"][:]
     if len(arr) == 0:
         return pd.DataFrame(columns=[n for n in ACTUAL_DTYPE.names])
@@ -202,7 +232,7 @@ def read_predicted(path, sample_hour=None, forecast_hour=None, node_id=None):
     """Read /predicted_weather with optional filters.
 
     Args:
-        path: HDF5 file path.
+        path: HDF5 file path or open h5py.File.
         sample_hour: Filter by sample_hour (int).
         forecast_hour: Filter by forecast_hour (int).
         node_id: Filter by node_id (int).
@@ -210,7 +240,7 @@ def read_predicted(path, sample_hour=None, forecast_hour=None, node_id=None):
     Returns:
         DataFrame.
     """
-    with h5py.File(path, "r") as f:
+    with _open_read(path) as f:
         arr = f["predicted_weather"][:]
     if len(arr) == 0:
         return pd.DataFrame(columns=[n for n in PREDICTED_DTYPE.names])
@@ -230,7 +260,7 @@ def read_predicted(path, sample_hour=None, forecast_hour=None, node_id=None):
 
 def get_attrs(path):
     """Read global attributes dict."""
-    with h5py.File(path, "r") as f:
+    with _open_read(path) as f:
         attrs = {}
         for k, v in f.attrs.items():
             if isinstance(v, bytes):
@@ -241,7 +271,7 @@ def get_attrs(path):
 
 def get_completed_runs(path):
     """Return sorted list of distinct sample_hour values in /actual_weather."""
-    with h5py.File(path, "r") as f:
+    with _open_read(path) as f:
         ds = f["actual_weather"]
         if ds.shape[0] == 0:
             return []
@@ -6,9 +6,15 @@ Implements the output contract from docs/WBS_next_phases.md Section 7.
 
 import json
 import logging
+import math
 import os
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,12 +98,46 @@ def build_result_json(
     }
 
 
+def _json_default(obj):
+    """Fallback encoder for stdlib json: NumPy scalars/arrays as numbers
+    and lists (as orjson's OPT_SERIALIZE_NUMPY writes them), else str."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def _has_non_finite(obj) -> bool:
+    """True if obj contains a NaN or infinite float, at any nesting depth."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    if hasattr(obj, "tolist"):  # NumPy scalars and arrays
+        return _has_non_finite(obj.tolist())
+    return False
+
+
 def save_result(result: dict, path: str) -> None:
     """Write result dict to JSON file.
 
-    Creates parent directories if needed.
+    Creates parent directories if needed.  Serializes with orjson when it
+    is installed.  orjson writes NaN and +/-inf as null, so results that
+    contain them go through stdlib json, which keeps the NaN / Infinity
+    tokens json.load() reads back as floats: the file contents do not
+    depend on whether orjson is installed.
     """
     os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(result, f, indent=2, default=str)
+    if orjson is not None and not _has_non_finite(result):
+        data = orjson.dumps(
+            result,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+        with open(path, "wb") as f:
+            f.write(data)
+    else:
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2, default=_json_default)
     logger.info("Saved result JSON: %s", path)
@@ -19,6 +19,7 @@ dynamic_rh).
 import logging
 import math
 
+import numpy as np
 import pandas as pd
 
 from shared.hdf5_io import read_metadata, read_actual
@@ -33,6 +34,15 @@ from shared.physics import (
 
 logger = logging.getLogger(__name__)
 
+# Columns of the per-leg time_series DataFrame, in order
+TIME_SERIES_COLUMNS = [
+    "node_id", "segment", "lat", "lon",
+    "planned_sog_knots", "actual_sog_knots", "planned_sws_knots", "actual_sws_knots",
+    "distance_nm", "time_h", "fuel_mt",
+    "cum_distance_nm", "cum_time_h", "cum_fuel_mt",
+    "beaufort", "wave_height_m", "current_knots", "heading_deg",
+]
+
 
 def simulate_voyage(
     speed_schedule: list,
@@ -40,6 +50,7 @@ def simulate_voyage(
     config: dict,
     sample_hour: int = 0,
     time_varying: bool = False,
+    metadata: pd.DataFrame = None,
 ) -> dict:
     """Simulate a voyage targeting the planned SOG at each leg.
 
@@ -56,11 +67,66 @@ def simulate_voyage(
                         closest to each leg's cumulative transit time.
                         This matches RH's use of actual weather at each
                         decision point.
+        metadata:       read_metadata() output, to skip re-reading it from
+                        the HDF5 file.  Not modified.
 
     Returns:
         Dict with: total_fuel_mt, total_time_h, arrival_deviation_h,
         speed_changes, co2_emissions_mt, sws_adjustments, sws_violations (compat), time_series (DataFrame).
     """
+    # Detect schedule type: per-leg (node_id) vs per-segment
+    if speed_schedule and "node_id" in speed_schedule[0]:
+        leg_sog = {entry["node_id"]: entry["sog_knots"] for entry in speed_schedule}
+        seg_sog = None
+    else:
+        leg_sog = None
+        seg_sog = {entry["segment"]: entry["sog_knots"] for entry in speed_schedule}
+
+    # Count SOG changes in the plan
+    speed_changes = 0
+    if len(speed_schedule) > 1:
+        for i in range(1, len(speed_schedule)):
+            if speed_schedule[i]["sog_knots"] != speed_schedule[i - 1]["sog_knots"]:
+                speed_changes += 1
+
+    return _simulate(leg_sog, seg_sog, speed_changes, hdf5_path, config,
+                     sample_hour, time_varying, metadata)
+
+
+def simulate_voyage_arrays(
+    arrays: dict,
+    hdf5_path: str,
+    config: dict,
+    sample_hour: int = 0,
+    time_varying: bool = False,
+    metadata: pd.DataFrame = None,
+) -> dict:
+    """simulate_voyage() for a schedule given as parallel arrays.
+
+    Args:
+        arrays: Dict of equal-length arrays: ``sog_knots`` plus either
+                ``node_id`` (per-leg schedule) or ``segment`` (per-segment).
+                Other keys (``sws_knots``, ``distance_nm``, ...) are ignored.
+
+    Other arguments and the return value are as for simulate_voyage().
+    """
+    sog = np.asarray(arrays["sog_knots"], dtype=float)
+    key = "node_id" if "node_id" in arrays else "segment"
+    targets = dict(zip(np.asarray(arrays[key]).tolist(), sog.tolist()))
+    speed_changes = int(np.count_nonzero(sog[1:] != sog[:-1]))
+    if key == "node_id":
+        return _simulate(targets, None, speed_changes, hdf5_path, config,
+                         sample_hour, time_varying, metadata)
+    return _simulate(None, targets, speed_changes, hdf5_path, config,
+                     sample_hour, time_varying, metadata)
+
+
+def _simulate(leg_sog, seg_sog, speed_changes, hdf5_path, config,
+              sample_hour, time_varying, metadata=None):
+    """Simulation walk shared by simulate_voyage() and simulate_voyage_arrays().
+
+    Exactly one of leg_sog {node_id: sog} / seg_sog {segment: sog} is set.
+    """
     ship_params = load_ship_parameters(config)
     eta = config["ship"]["eta_hours"]
     min_speed = config["ship"]["speed_range_knots"][0]
@@ -69,7 +135,8 @@ def simulate_voyage(
     # ------------------------------------------------------------------
     # 1. Read per-waypoint data
     # ------------------------------------------------------------------
-    metadata = read_metadata(hdf5_path)
+    if metadata is None:
+        metadata = read_metadata(hdf5_path)
 
     weather_fields = [
         "wind_speed_10m_kmh", "wind_direction_10m_deg", "beaufort_number",
@@ -100,18 +167,10 @@ def simulate_voyage(
 
     num_nodes = len(merged)
 
-    # Detect schedule type: per-leg (node_id) vs per-segment
-    if speed_schedule and "node_id" in speed_schedule[0]:
-        leg_sog = {entry["node_id"]: entry["sog_knots"] for entry in speed_schedule}
-        seg_sog = None
-    else:
-        leg_sog = None
-        seg_sog = {entry["segment"]: entry["sog_knots"] for entry in speed_schedule}
-
     # ------------------------------------------------------------------
     # 2. Walk through consecutive waypoint pairs
     # ------------------------------------------------------------------
-    rows = []
+    rows = []  # one tuple per leg, in TIME_SERIES_COLUMNS order
     cum_distance = 0.0
     cum_time = 0.0
     cum_fuel = 0.0
@@ -194,36 +253,17 @@ def simulate_voyage(
         cum_time += leg_time
         cum_fuel += leg_fuel
 
-        rows.append({
-            "node_id": int(node_a["node_id"]),
-            "segment": segment,
-            "lat": float(node_a["lat"]),
-            "lon": float(node_a["lon"]),
-            "planned_sog_knots": target_sog,
-            "actual_sog_knots": actual_sog,
-            "planned_sws_knots": required_sws,
-            "actual_sws_knots": clamped_sws,
-            "distance_nm": dist,
-            "time_h": leg_time,
-            "fuel_mt": leg_fuel,
-            "cum_distance_nm": cum_distance,
-            "cum_time_h": cum_time,
-            "cum_fuel_mt": cum_fuel,
-            "beaufort": beaufort,
-            "wave_height_m": wave_height,
-            "current_knots": current_knots,
-            "heading_deg": heading_deg,
-        })
-
-    time_series = pd.DataFrame(rows)
-    co2 = calculate_co2_emissions(cum_fuel)
+        rows.append((
+            nid_a, segment, float(node_a["lat"]), float(node_a["lon"]),
+            target_sog, actual_sog, required_sws, clamped_sws,
+            dist, leg_time, leg_fuel,
+            cum_distance, cum_time, cum_fuel,
+            beaufort, wave_height, current_knots, heading_deg,
+        ))
 
-    # Count SOG changes in the plan
-    speed_changes = 0
-    if len(speed_schedule) > 1:
-        for i in range(1, len(speed_schedule)):
-            if speed_schedule[i]["sog_knots"] != speed_schedule[i - 1]["sog_knots"]:
-                speed_changes += 1
+    # Built once from the tuples; no per-row dicts
+    time_series = pd.DataFrame.from_records(rows, columns=TIME_SERIES_COLUMNS)
+    co2 = calculate_co2_emissions(cum_fuel)
 
     result = {
         "total_fuel_mt": cum_fuel,